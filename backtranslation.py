@@ -2,56 +2,46 @@ import truststore
 truststore.inject_into_ssl()
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from pydantic import BaseModel
-import httpx
+from typing import Optional
 
-# Load DeepL API key from environment variables
+import http_client
+import telemetry
+from translation_backends import TRANSLATION_BACKEND, get_backend
+
+# Load DeepL API key from environment variables (same key name as main.py,
+# so both services can run in one process; the legacy name still works)
 load_dotenv()
-DEEPL_API_KEY = os.getenv("DeepL_Api_Key")
-if not DEEPL_API_KEY:
-    raise RuntimeError("DeepL_Api_Key not found in .env file")
+DEEPL_API_KEY = os.getenv("DEEPL_API_KEY") or os.getenv("DeepL_Api_Key")
+if not DEEPL_API_KEY and TRANSLATION_BACKEND != "marian":
+    raise RuntimeError("DEEPL_API_KEY (or DeepL_Api_Key) not found in .env file")
 
-# Initialize FastAPI app
-app = FastAPI()
+# Initialize FastAPI app (shared pooled HTTP client opened/closed via lifespan)
+app = FastAPI(lifespan=http_client.lifespan)
+telemetry.instrument_app(app)  # GET /metrics
 
 # ----- Pydantic models -----
 class TranslationRequest(BaseModel):
     """Schema for incoming Dutch text."""
     text: str
+    backend: Optional[str] = None  # "deepl", "marian" or "auto"
 
 class TranslationResponse(BaseModel):
     """Schema for returned English translation."""
     english: str
 
 # ----- Core translation function -----
-async def translate_to_english(text: str) -> str:
-    """Translate Dutch text to English using the DeepL API (no glossary)."""
-    url = "https://api.deepl.com/v2/translate"  # Endpoint for DeepL Pro accounts
-    headers = {"Authorization": f"DeepL-Auth-Key {DEEPL_API_KEY}"}
-    data = {
-        "text": text,
-        "source_lang": "NL",
-        "target_lang": "EN",
-        "tag_handling": "html",  # Preserve any HTML if present
-        "preserve_formatting": 1,
-    }
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, data=data, headers=headers)
-        if response.status_code != 200:
-            raise HTTPException(status_code=500, detail="Translation API error")
-
-        result = response.json()
-        # Extract the translated text
-        english_translation = result["translations"][0]["text"]
-
-    return english_translation
+async def translate_to_english(text: str, backend: Optional[str] = None) -> str:
+    """Translate Dutch text to English (no glossary) with the selected backend."""
+    # DeepL by default; shares the pooled client, rate limiter and circuit breaker
+    results = await get_backend(backend).translate([text], "NL", "EN")
+    return results[0]
 
 # ----- API route -----
 @app.post("/translate", response_model=TranslationResponse)
 async def translate(req: TranslationRequest):
-    english_text = await translate_to_english(req.text)
+    english_text = await translate_to_english(req.text, req.backend)
     return TranslationResponse(english=english_text)
 
 # ----- Run with Uvicorn -----
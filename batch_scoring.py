@@ -0,0 +1,432 @@
+# batch_scoring.py
+# Many (source, candidate) pairs per evaluator call, within a token budget
+
+"""
+One chat completion per translation spends most of its cost on per-call
+overhead and the repeated system prompt.  :class:`BatchScorer` packs items
+into as few calls as the token budget allows, asks for one JSON result per
+item id and validates each one separately.  Items whose result is missing or
+malformed are re-packed and retried; the others are kept.
+
+:class:`ScoreBatcher` merges concurrent single-item calls into such batches.
+
+Run as a script to score a bulk_translate.py output file through the
+provider's offline Batch API (cheaper, completes within 24 h):
+
+    python batch_scoring.py submit results.jsonl
+    python batch_scoring.py collect results.jsonl scored.jsonl --wait
+"""
+
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import telemetry
+
+logger = logging.getLogger("translation-app.batch-scoring")
+
+ALL_FIELDS = ("accuracy", "fluency", "terminology_adherence", "consistency", "glossary_support")
+MODEL_FIELDS = ("accuracy", "fluency")  # hybrid mode: glossary scores are local
+
+_CRITERIA = {
+    "accuracy": "meaning preserved exactly.",
+    "fluency": "grammatical, natural Dutch.",
+    "terminology_adherence": "correct medical/brand terms.",
+    "consistency": "repeated phrases rendered the same.",
+    "glossary_support": "uses every glossary mapping provided for the item.",
+}
+
+# Rough output size per item (JSON keys + numbers), used for the budget.
+_OUTPUT_TOKENS_PER_ITEM = 12 + 10 * len(ALL_FIELDS)
+
+
+class ScoreItem(NamedTuple):
+    source: str
+    candidate: str
+    glossary: Dict[str, str]  # relevant entries only; empty when not scored by the model
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English/Dutch)."""
+    return len(text) // 4 + 1
+
+
+def batch_system_prompt(fields: Sequence[str]) -> str:
+    """Stable system prompt for *fields*; identical across calls so it can be cached."""
+    rubric = "\n".join(f"{i}. {f} ‒ {_CRITERIA[f]}" for i, f in enumerate(fields, 1))
+    schema = ", ".join(f'"{f}": <float>' for f in fields)
+    return (
+        "You are a senior English to Dutch translation quality evaluator.\n\n"
+        "The user message is a JSON list of items, each with an \"id\", the English "
+        "\"source_en\", the Dutch \"candidate_nl\" and possibly a \"glossary\".\n"
+        f"Rate every item independently on **{len(fields)} criteria**, each from 0.0 to 1.0:\n"
+        f"{rubric}\n\n"
+        "Scoring guide:\n"
+        "• 1.0 = flawless; 0.8 = minor issue; 0.5 = acceptable but notable flaws; "
+        "0.2 = major errors; 0.0 = unusable.\n\n"
+        "Round ALL numbers to **two decimals**. Think silently; do NOT output reasoning.\n"
+        "Respond with **ONLY** this JSON (no markdown), one result per item id:\n"
+        f'{{"results": [{{"id": <int>, {schema}}}]}}'
+    )
+
+
+def item_payload(item_id: int, item: ScoreItem) -> Dict:
+    payload = {"id": item_id, "source_en": item.source, "candidate_nl": item.candidate}
+    if item.glossary:
+        payload["glossary"] = item.glossary
+    return payload
+
+
+def pack(items: Sequence[ScoreItem], max_tokens: int, max_items: int) -> List[List[int]]:
+    """Greedily pack item indices into calls of at most *max_tokens* (prompt + output).
+
+    An item larger than the budget on its own still gets a call of its own.
+    """
+    packs: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for i, item in enumerate(items):
+        cost = (
+            estimate_tokens(json.dumps(item_payload(i, item), ensure_ascii=False))
+            + _OUTPUT_TOKENS_PER_ITEM
+        )
+        if current and (len(current) >= max_items or used + cost > max_tokens):
+            packs.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_messages(ids: Sequence[int], items: Sequence[ScoreItem], fields: Sequence[str]):
+    user = json.dumps([item_payload(i, items[i]) for i in ids], ensure_ascii=False)
+    return [
+        {"role": "system", "content": batch_system_prompt(fields)},
+        {"role": "user", "content": user},
+    ]
+
+
+def parse_results(
+    content: str, ids: Sequence[int], fields: Sequence[str]
+) -> Dict[int, Dict[str, float]]:
+    """Valid per-item scores from one response; bad or missing items are left out."""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return {}
+    rows = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        return {}
+
+    wanted = set(ids)
+    valid: Dict[int, Dict[str, float]] = {}
+    for row in rows:
+        if not isinstance(row, dict) or row.get("id") not in wanted:
+            continue
+        try:
+            scores = {f: float(row[f]) for f in fields}
+        except (KeyError, TypeError, ValueError):
+            continue
+        if all(0.0 <= v <= 1.0 for v in scores.values()):
+            valid[row["id"]] = {f: round(v, 2) for f, v in scores.items()}
+    return valid
+
+
+class BatchScorer:
+    """Scores lists of items in packed calls, retrying only the items that failed."""
+
+    def __init__(
+        self,
+        complete: Callable[[List[Dict[str, str]]], Awaitable[str]],
+        max_tokens: int = 6_000,
+        max_items: int = 20,
+        max_attempts: int = 3,
+        concurrency: int = 4,
+    ):
+        self.complete = complete
+        self.max_tokens = max_tokens
+        self.max_items = max_items
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self._sem = asyncio.Semaphore(concurrency)
+        self.calls = 0
+        self.items = 0
+        self.retried_items = 0
+        self.failed_items = 0
+
+    async def score(
+        self, items: Sequence[ScoreItem], fields: Sequence[str] = ALL_FIELDS
+    ) -> List[Optional[Dict[str, float]]]:
+        """One dict of *fields* per item, or ``None`` where every attempt failed."""
+        results: List[Optional[Dict[str, float]]] = [None] * len(items)
+        pending = list(range(len(items)))
+        self.items += len(items)
+
+        async def run(ids: List[int]) -> None:
+            async with self._sem:
+                self.calls += 1
+                content = await self.complete(build_messages(ids, items, fields))
+            with telemetry.stage("json_validation"):
+                valid = parse_results(content, ids, fields)
+            for i, scores in valid.items():
+                results[i] = scores
+
+        for attempt in range(self.max_attempts):
+            subset = [items[i] for i in pending]
+            packs = [[pending[j] for j in p] for p in pack(subset, self.max_tokens, self.max_items)]
+            outcomes = await asyncio.gather(*(run(p) for p in packs), return_exceptions=True)
+            errors = [o for o in outcomes if isinstance(o, BaseException)]
+
+            pending = [i for i in pending if results[i] is None]
+            if not pending:
+                break
+            if errors and len(errors) == len(packs):
+                # Every call failed at the transport level (the upstream guard
+                # has already retried); more attempts would fail the same way.
+                logger.error("Batch scoring failed for %d item(s): %s", len(pending), errors[0])
+                break
+            if attempt + 1 < self.max_attempts:
+                self.retried_items += len(pending)
+                logger.warning(
+                    "Retrying %d malformed/missing item(s) (attempt %d/%d)",
+                    len(pending), attempt + 2, self.max_attempts,
+                )
+        self.failed_items += len(pending)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "retried_items": self.retried_items,
+            "failed_items": self.failed_items,
+        }
+
+
+class ScoreBatcher:
+    """Collects concurrent single-item ``score`` calls into :class:`BatchScorer` batches."""
+
+    def __init__(self, scorer: BatchScorer, max_wait_ms: float = 50.0):
+        self.scorer = scorer
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+
+    async def score(self, item: ScoreItem, fields: Sequence[str]) -> Optional[Dict[str, float]]:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, tuple(fields), future))
+        return await future
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, *self._flushes, return_exceptions=True)
+            self._task = None
+
+    async def _flush(self, batch) -> None:
+        by_fields: Dict[Tuple[str, ...], list] = {}
+        for entry in batch:
+            by_fields.setdefault(entry[1], []).append(entry)
+        for fields, entries in by_fields.items():
+            try:
+                scores = await self.scorer.score([e[0] for e in entries], fields)
+            except Exception as exc:  # noqa: BLE001 – handed to every waiter
+                for _, _, future in entries:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, _, future), result in zip(entries, scores):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Enough items for every concurrent call to be full.
+        limit = self.scorer.max_items * self.scorer.concurrency
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < limit:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Don't hold up collection while the calls are in flight.
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+
+# ─── Offline Batch API ──────────────────────────────────────────────────────
+def _state_path(results_path: str) -> str:
+    return results_path + ".batch.json"
+
+
+async def submit(args: argparse.Namespace) -> None:
+    """Upload one request per pack of rows and create a provider batch job."""
+    import main
+
+    client = main._evaluator_client()
+    if client is None:
+        raise SystemExit("No OpenAI/Azure OpenAI credentials configured")
+    glossary = await main._glossaries.get(args.glossary_id)
+    fields = MODEL_FIELDS if args.mode == "hybrid" else ALL_FIELDS
+
+    with open(args.results, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    items = [
+        ScoreItem(
+            r.get("english", ""),
+            r.get("dutch", ""),
+            glossary.terms_in(r.get("english", "")) if fields is ALL_FIELDS else {},
+        )
+        for r in rows
+    ]
+    scorable = [i for i, r in enumerate(rows) if "dutch" in r]
+    packs = [
+        [scorable[j] for j in p]
+        for p in pack([items[i] for i in scorable], args.max_tokens, args.max_items)
+    ]
+
+    lines = [
+        json.dumps(
+            {
+                "custom_id": f"pack-{n}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": main._evaluator_model,
+                    "temperature": 0.0,
+                    "messages": build_messages(ids, items, fields),
+                },
+            },
+            ensure_ascii=False,
+        )
+        for n, ids in enumerate(packs)
+    ]
+    upload = await client.files.create(
+        file=("scoring.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    with open(_state_path(args.results), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "batch_id": batch.id,
+                "mode": args.mode,
+                "glossary_id": args.glossary_id,
+                "packs": {f"pack-{n}": ids for n, ids in enumerate(packs)},
+            },
+            f,
+        )
+    print(
+        f"Submitted {len(scorable)} rows in {len(packs)} request(s) as batch {batch.id}",
+        file=sys.stderr,
+    )
+
+
+async def collect(args: argparse.Namespace) -> None:
+    """Fetch a finished batch, rescore failed items online and write scored rows."""
+    import main
+    from glossary_metrics import check_terminology
+
+    client = main._evaluator_client()
+    if client is None:
+        raise SystemExit("No OpenAI/Azure OpenAI credentials configured")
+    with open(_state_path(args.results), encoding="utf-8") as f:
+        state = json.load(f)
+    while True:
+        batch = await client.batches.retrieve(state["batch_id"])
+        if batch.status in ("completed", "failed", "expired", "cancelled") or not args.wait:
+            break
+        print(f"Batch {batch.id}: {batch.status}", file=sys.stderr)
+        await asyncio.sleep(args.poll_seconds)
+    if batch.status not in ("completed", "expired", "cancelled"):
+        raise SystemExit(f"Batch {batch.id} is {batch.status}")
+
+    glossary = await main._glossaries.get(state["glossary_id"])
+    fields = MODEL_FIELDS if state["mode"] == "hybrid" else ALL_FIELDS
+    with open(args.results, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    scores: Dict[int, Dict[str, float]] = {}
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            record = json.loads(line)
+            ids = state["packs"].get(record["custom_id"], [])
+            body = (record.get("response") or {}).get("body") or {}
+            try:
+                content = body["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                continue
+            scores.update(parse_results(content, ids, fields))
+
+    missing = [i for ids in state["packs"].values() for i in ids if i not in scores]
+    if missing:
+        print(f"Rescoring {len(missing)} failed item(s) online", file=sys.stderr)
+        items = [
+            ScoreItem(
+                rows[i]["english"],
+                rows[i]["dutch"],
+                glossary.terms_in(rows[i]["english"]) if fields is ALL_FIELDS else {},
+            )
+            for i in missing
+        ]
+        for i, result in zip(missing, await main._batch_scorer.score(items, fields)):
+            if result is not None:
+                scores[i] = result
+
+    with open(args.output, "w", encoding="utf-8") as out:
+        for i, row in enumerate(rows):
+            if i in scores:
+                model_scores = scores[i]
+                if fields is MODEL_FIELDS:
+                    model_scores = {
+                        **check_terminology(row["english"], row["dutch"], glossary).scores(),
+                        **model_scores,
+                    }
+                row["confidence"] = main._with_overall(model_scores).model_dump()
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    print(f"Scored {len(scores)}/{len(rows)} rows → {args.output}", file=sys.stderr)
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description="Score bulk_translate.py output via the offline Batch API")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("submit", help="create a batch job for a results JSONL file")
+    p.add_argument("results", help="bulk_translate.py output (english/dutch per row)")
+    p.add_argument("--mode", choices=("llm", "hybrid"), default="llm")
+    p.add_argument("--glossary-id", help="glossary to check (default: built-in)")
+    p.add_argument("--max-tokens", type=int, default=int(os.getenv("SCORING_BATCH_TOKENS", "6000")))
+    p.add_argument("--max-items", type=int, default=int(os.getenv("SCORING_BATCH_ITEMS", "20")))
+    p.set_defaults(func=submit)
+
+    c = sub.add_parser("collect", help="write scored rows once the batch job has finished")
+    c.add_argument("results", help="the file passed to 'submit'")
+    c.add_argument("output", help="JSONL file to write scored rows to")
+    c.add_argument("--wait", action="store_true", help="poll until the batch job finishes")
+    c.add_argument("--poll-seconds", type=float, default=60.0)
+    c.set_defaults(func=collect)
+
+    args = parser.parse_args()
+    asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,146 @@
+"""
+Evaluator calls and wall time for scoring 1 000 segments one call per
+segment vs. packed into batched calls (batch_scoring.BatchScorer).
+
+The LLM is simulated: each call costs a fixed overhead plus time per input
+and output token (scaled by --time-scale so the run takes seconds), and the
+batched responses randomly drop or corrupt a share of items so only those are
+retried.  Both modes run at the same concurrency.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_scoring --segments 1000
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+os.environ.setdefault("DEEPL_API_KEY", "bench")
+os.environ.setdefault("SIMILARITY_PRELOAD", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "8")
+os.environ.setdefault("SEGMENT_FANOUT", "8")
+
+import main  # noqa: E402
+from batch_scoring import estimate_tokens  # noqa: E402
+
+FIELDS = ("accuracy", "fluency", "terminology_adherence", "consistency", "glossary_support")
+WORDS = "patients treatment cardiac efficacy placebo symptoms trial outcome relief function".split()
+
+
+class FakeLLM:
+    """Answers single and batched scoring prompts with simulated latency."""
+
+    def __init__(self, args, rng: random.Random):
+        self.args = args
+        self.rng = rng
+        self.calls = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    async def create(self, model, temperature, messages):
+        self.calls += 1
+        tokens_in = sum(estimate_tokens(m["content"]) for m in messages)
+        if "JSON list of items" in messages[0]["content"]:
+            results = []
+            for item in json.loads(messages[1]["content"]):
+                roll = self.rng.random()
+                if roll < self.args.drop_rate:
+                    continue  # item silently missing from the answer
+                row = {"id": item["id"], **{f: 0.9 for f in FIELDS}}
+                if roll < 2 * self.args.drop_rate:
+                    row["fluency"] = "n/a"  # malformed value
+                results.append(row)
+            content = json.dumps({"results": results})
+        else:
+            content = json.dumps({**{f: 0.9 for f in FIELDS}, "overall": 0.9})
+        tokens_out = estimate_tokens(content)
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+
+        a = self.args
+        await asyncio.sleep(
+            a.time_scale * (a.call_overhead + tokens_in / a.input_tps + tokens_out / a.output_tps)
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_pairs(n: int, rng: random.Random):
+    terms = list(main.GLOSSARY)
+    pairs = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(12, 30))
+        words.insert(rng.randrange(len(words)), rng.choice(terms))
+        src = " ".join(words).capitalize() + "."
+        pairs.append((src, main._glossaries.default.apply(src)))
+    return pairs
+
+
+async def run(args) -> None:
+    rng = random.Random(0)
+    llm = FakeLLM(args, rng)
+    main._ai_client = SimpleNamespace(chat=SimpleNamespace(completions=llm))
+    main._evaluator_model = "fake"
+    glossary = main._glossaries.default
+    pairs = make_pairs(args.segments, rng)
+
+    rows = []
+
+    # One call per segment (SCORING_BATCH_WAIT_MS=0, scoring_mode="llm").
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def single(src, tgt):
+        async with sem:
+            return await main.evaluate_translation(src, tgt, glossary, "llm")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(single(s, t) for s, t in pairs))
+    rows.append(("1 call / segment", llm.calls, llm.tokens_in, llm.tokens_out, time.perf_counter() - start))
+
+    for items in args.batch_items:
+        llm.calls = llm.tokens_in = llm.tokens_out = 0
+        main._batch_scorer.max_items = items
+        main._batch_scorer.retried_items = 0
+        start = time.perf_counter()
+        scores = await main.evaluate_many(pairs, glossary, "llm")
+        elapsed = time.perf_counter() - start
+        assert all(s.overall > 0 for s in scores), "an item was never scored"
+        rows.append(
+            (f"batched ({items}/call)", llm.calls, llm.tokens_in, llm.tokens_out, elapsed,
+             main._batch_scorer.retried_items)
+        )
+
+    print(
+        f"segments: {args.segments}  concurrency: {args.concurrency}  "
+        f"simulated call: {args.call_overhead}s + tokens (time scale {args.time_scale})"
+    )
+    print(f"{'mode':>20} | {'calls':>6} | {'tokens in':>10} | {'tokens out':>10} | {'wall':>11} | {'retried':>7}")
+    print("-" * 80)
+    for label, calls, tin, tout, wall, *retried in rows:
+        print(
+            f"{label:>20} | {calls:>6} | {tin:>10,} | {tout:>10,} "
+            f"| {wall / args.time_scale:>9.1f}s | {retried[0] if retried else '-':>7}"
+        )
+    print("(wall time rescaled to real seconds)")
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-items", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--call-overhead", type=float, default=0.5, help="seconds per call")
+    parser.add_argument("--input-tps", type=float, default=5_000, help="prompt tokens/second")
+    parser.add_argument("--output-tps", type=float, default=80, help="generated tokens/second")
+    parser.add_argument("--drop-rate", type=float, default=0.01, help="share of items dropped/corrupted")
+    parser.add_argument("--time-scale", type=float, default=0.02)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,116 @@
+"""
+Count TCP connections opened by the legacy per-request client versus the
+shared pooled client (http_client.build_client) across 1 000 sequential and
+1 000 concurrent requests against a local keep-alive HTTP stand-in.
+
+Run from the repository root:
+    python -m benchmarks.bench_connections
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+import http_client
+
+_BODY = b'{"translations":[{"detected_source_language":"EN","text":"ok"}]}'
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: " + str(len(_BODY)).encode() + b"\r\n"
+    b"Connection: keep-alive\r\n\r\n" + _BODY
+)
+
+
+class CountingServer:
+    """Minimal HTTP/1.1 keep-alive server that counts accepted connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                writer.write(_RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v2/translate"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def reset(self) -> None:
+        self.connections = 0
+        self.requests = 0
+
+
+async def _legacy_post(url: str) -> None:
+    async with httpx.AsyncClient(timeout=20) as client:
+        await client.post(url, data={"text": "hello"})
+
+
+async def run(requests: int, concurrency: int) -> None:
+    server = CountingServer()
+    url = await server.start()
+    pooled = http_client.build_client()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def bounded(coro_factory):
+        async with sem:
+            await coro_factory()
+
+    scenarios = {
+        "legacy / sequential": ("seq", lambda: _legacy_post(url)),
+        "legacy / concurrent": ("conc", lambda: _legacy_post(url)),
+        "pooled / sequential": ("seq", lambda: pooled.post(url, data={"text": "hello"})),
+        "pooled / concurrent": ("conc", lambda: pooled.post(url, data={"text": "hello"})),
+    }
+
+    print(f"{'scenario':<22} | {'requests':>8} | {'connections':>11} | {'wall':>8}")
+    print("-" * 60)
+    for label, (mode, call) in scenarios.items():
+        server.reset()
+        start = time.perf_counter()
+        if mode == "seq":
+            for _ in range(requests):
+                await call()
+        else:
+            await asyncio.gather(*(bounded(call) for _ in range(requests)))
+        wall = time.perf_counter() - start
+        print(f"{label:<22} | {server.requests:>8} | {server.connections:>11} | {wall:>7.2f}s")
+
+    await pooled.aclose()
+    await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
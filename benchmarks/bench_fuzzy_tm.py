@@ -0,0 +1,105 @@
+"""
+Query latency of the fuzzy translation-memory index (fuzzy_tm.EmbeddingIndex)
+with 10 000, 100 000 and 1 000 000 stored segments on CPU.
+
+Vectors are random unit vectors of the embedding model's size (384 for
+all-MiniLM-L6-v2); queries are perturbed copies of stored rows, so the
+expected top-1 is known and checked.  The index is built by incremental
+appends in a temporary directory (~1.5 GB on disk at 1M × 384) and reopened
+from disk before querying, as after a restart.
+
+Run from the repository root:
+    python -m benchmarks.bench_fuzzy_tm
+    python -m benchmarks.bench_fuzzy_tm --sizes 10000 100000 --output fuzzy.json
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from benchmarks import harness
+from fuzzy_tm import EmbeddingIndex
+
+TAG = "deepl:bench"
+
+
+def build(directory: str, size: int, dim: int, chunk: int, rng: np.random.Generator) -> float:
+    """Append *size* random rows in chunks; return rows/s."""
+    index = EmbeddingIndex(directory, model_name="bench")
+    start = time.perf_counter()
+    for offset in range(0, size, chunk):
+        n = min(chunk, size - offset)
+        vectors = rng.standard_normal((n, dim), dtype=np.float32)
+        sources = [f"source segment {offset + i}" for i in range(n)]
+        index.add(vectors, sources, [f"brontekst {offset + i}" for i in range(n)], TAG)
+    elapsed = time.perf_counter() - start
+    index.close()
+    return size / elapsed
+
+
+def run_queries(index: EmbeddingIndex, batch: int, rounds: int, k: int, rng: np.random.Generator):
+    """Latencies per search call and the share of queries whose top-1 is the perturbed row."""
+    latencies, correct = [], 0
+    for _ in range(rounds):
+        rows = rng.integers(0, len(index), size=batch)
+        queries = np.asarray(index._vectors[rows]) + rng.normal(0, 0.02, (batch, index.dim)).astype(np.float32)
+        start = time.perf_counter()
+        results = index.search(queries, k=k, tag=TAG)
+        latencies.append(time.perf_counter() - start)
+        correct += sum(r[0][0] == row for r, row in zip(results, rows))
+    return latencies, correct / (batch * rounds)
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 32], help="queries per search call")
+    parser.add_argument("--rounds", type=int, default=30, help="search calls per case")
+    parser.add_argument("--append-chunk", type=int, default=10_000)
+    harness.add_arguments(parser)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = {}
+    print(f"dim {args.dim}, top-{args.k}")
+    print(
+        f"{'segments':>10} | {'append':>12} | {'batch':>5} | {'p50':>9} | {'p95':>9} | "
+        f"{'p99':>9} | {'queries/s':>10} | {'top-1':>6}"
+    )
+    print("-" * 90)
+    for size in args.sizes:
+        directory = tempfile.mkdtemp(prefix="fuzzy-tm-bench-")
+        try:
+            append_rate = build(directory, size, args.dim, args.append_chunk, rng)
+            index = EmbeddingIndex(directory, model_name="bench")
+            run_queries(index, 1, 3, args.k, rng)  # warm the page cache
+            for batch in args.batch:
+                latencies, recall = run_queries(index, batch, args.rounds, args.k, rng)
+                pct = harness.percentiles(latencies, scale=1e3)
+                qps = batch * len(latencies) / sum(latencies)
+                results[f"{size}/batch{batch}"] = {
+                    "append_rows_per_s": append_rate,
+                    "queries_per_s": qps,
+                    "p50_ms": pct["p50"],
+                    "p95_ms": pct["p95"],
+                    "p99_ms": pct["p99"],
+                    "top1_recall": recall,
+                }
+                print(
+                    f"{size:>10,} | {append_rate:>8,.0f} r/s | {batch:>5} | {pct['p50']:>7.2f}ms | "
+                    f"{pct['p95']:>7.2f}ms | {pct['p99']:>7.2f}ms | {qps:>10,.0f} | {recall:>6.1%}"
+                )
+            index.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    harness.finish(args, "fuzzy_tm", results, vars(args) | {"output": None, "baseline": None})
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,92 @@
+"""
+Benchmark the compiled glossary matcher against the legacy sort-and-replace
+loop for glossaries of 50, 5 000 and 50 000 terms.
+
+Run from the repository root:
+    python -m benchmarks.bench_glossary
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import Dict
+
+from glossary import GLOSSARY
+from glossary_matcher import CompiledGlossary
+
+SIZES = (50, 5_000, 50_000)
+
+
+def legacy_apply_glossary(text: str, glossary: Dict[str, str]) -> str:
+    """The original per-request implementation from main.py."""
+    for en, nl in sorted(glossary.items(), key=lambda x: -len(x[0])):
+        text = text.replace(en, nl)
+    return text
+
+
+def synthetic_glossary(size: int, rng: random.Random) -> Dict[str, str]:
+    """Real glossary entries padded with random multi-word terms."""
+    glossary = dict(GLOSSARY)
+    while len(glossary) < size:
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        term = " ".join(words).capitalize()
+        glossary[term] = term.upper()
+    return dict(list(glossary.items())[:size])
+
+
+def sample_text(glossary: Dict[str, str], rng: random.Random, words: int) -> str:
+    """Filler prose with glossary terms sprinkled in (~1 term per 10 words)."""
+    terms = list(glossary)
+    out = []
+    for i in range(words):
+        if i % 10 == 0:
+            out.append(rng.choice(terms))
+        else:
+            out.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8))))
+    return " ".join(out)
+
+
+def timeit(fn, repeat: int) -> float:
+    """Best-of-three mean seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=300, help="words per sample text")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'terms':>7} | {'compile':>10} | {'legacy/call':>12} | {'compiled/call':>13} | speed-up")
+    print("-" * 66)
+    for size in SIZES:
+        glossary = synthetic_glossary(size, rng)
+        text = sample_text(glossary, rng, args.words)
+
+        start = time.perf_counter()
+        compiled = CompiledGlossary(glossary)
+        compile_s = time.perf_counter() - start
+
+        repeat = max(1, 20_000 // size)
+        legacy_s = timeit(lambda: legacy_apply_glossary(text, glossary), repeat)
+        compiled_s = timeit(lambda: compiled.apply(text), repeat * 10)
+
+        print(
+            f"{size:>7} | {compile_s * 1e3:>8.1f}ms | {legacy_s * 1e3:>10.3f}ms "
+            f"| {compiled_s * 1e3:>11.3f}ms | {legacy_s / compiled_s:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
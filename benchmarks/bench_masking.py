@@ -0,0 +1,144 @@
+"""
+Billed DeepL characters and throughput with glossary terms masked as
+placeholder tags (GLOSSARY_MASKING=1) vs substituted before and after
+translation (GLOSSARY_MASKING=0, the double apply_glossary flow).
+
+* ``cpu``: mask + unmask vs apply + apply per text, no I/O.
+* ``batch``: translate_batch_to_dutch against mock_deepl.py on a local port;
+  characters billed (counted by the mock), per text and per second.  The mock
+  charges MOCK_DEEPL_PER_CHAR_US of latency per character, like a real
+  engine, and echoes its input, so placeholders always come back.
+
+Run from the repository root:
+    python -m benchmarks.bench_masking --texts 2000
+    MOCK_DEEPL_PER_CHAR_US=20 python -m benchmarks.bench_masking --output masking.json
+"""
+
+import os
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List
+
+from benchmarks import harness
+from benchmarks.bench_throughput import start_mock_deepl
+
+FILLER = (
+    "patients treated with reported an improvement in compared to placebo the study "
+    "showed results were consistent across all subgroups and adverse events"
+).split()
+
+
+def sample_texts(terms: List[str], count: int, rng: random.Random) -> List[str]:
+    """Marketing-style sentences of 15-40 words with 1-3 glossary terms each."""
+    texts = []
+    for i in range(count):
+        words = rng.choices(FILLER, k=rng.randint(15, 40))
+        for term in rng.sample(terms, rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words)), term)
+        sentence = " ".join(words)
+        texts.append(sentence[0].upper() + sentence[1:] + f". ({i})")
+    return texts
+
+
+def bench_cpu(main, texts: List[str], rounds: int) -> Dict[str, Dict[str, float]]:
+    from glossary_matcher import unmask
+
+    glossary = main._glossaries.default
+
+    def legacy(text: str) -> str:
+        return main.apply_glossary(main.apply_glossary(text, glossary), glossary)
+
+    def masked(text: str) -> str:
+        sent, targets = glossary.mask(text)
+        return unmask(sent, targets)
+
+    results = {}
+    for case, fn in (("cpu/apply+apply", legacy), ("cpu/mask+unmask", masked)):
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for text in texts:
+                fn(text)
+            samples.append((time.perf_counter() - start) / len(texts))
+        results[case] = {"p50_us": harness.percentiles(samples, scale=1e6)["p50"]}
+    return results
+
+
+async def bench_batch(
+    main, texts: List[str], concurrency: int, rounds: int
+) -> Dict[str, Dict[str, float]]:
+    import mock_deepl
+
+    await main.translate_batch_to_dutch(texts[:100], concurrency=concurrency)  # warm-up
+    elapsed = {False: [], True: []}
+    billed = {}
+    for _ in range(rounds):
+        for masking in (False, True):
+            main.GLOSSARY_MASKING = masking
+            before = mock_deepl.app.state.characters
+            start = time.perf_counter()
+            await main.translate_batch_to_dutch(texts, concurrency=concurrency)
+            elapsed[masking].append(time.perf_counter() - start)
+            billed[masking] = mock_deepl.app.state.characters - before
+    return {
+        f"batch/{'masked' if masking else 'apply+apply'}": {
+            "billed_chars": billed[masking],
+            "chars_per_text": billed[masking] / len(texts),
+            "texts_per_s": len(texts) / harness.percentiles(elapsed[masking])["p50"],
+        }
+        for masking in (False, True)
+    }
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel DeepL requests")
+    parser.add_argument("--rounds", type=int, default=5, help="CPU rounds")
+    parser.add_argument("--batch-rounds", type=int, default=3, help="batch rounds per mode (alternating)")
+    parser.add_argument("--seed", type=int, default=0)
+    harness.add_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ["DEEPL_API_URL"] = start_mock_deepl()
+    os.environ.setdefault("DEEPL_API_KEY", "mock")
+    os.environ.setdefault("DEEPL_RATE_LIMIT", "0")
+    os.environ.setdefault("TM_ENABLED", "0")
+    os.environ.setdefault("SIMILARITY_PRELOAD", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import main
+
+    rng = random.Random(args.seed)
+    texts = sample_texts(list(main._glossaries.default.mapping), args.texts, rng)
+
+    results = bench_cpu(main, texts, args.rounds)
+    results.update(asyncio.run(bench_batch(main, texts, args.concurrency, args.batch_rounds)))
+
+    legacy, masked = results["cpu/apply+apply"], results["cpu/mask+unmask"]
+    print(f"{'cpu/apply+apply':>20}: {legacy['p50_us']:7.1f} us/text")
+    print(f"{'cpu/mask+unmask':>20}: {masked['p50_us']:7.1f} us/text")
+    for case in ("batch/apply+apply", "batch/masked"):
+        r = results[case]
+        print(
+            f"{case:>20}: {r['billed_chars']:>9,} chars billed | {r['chars_per_text']:6.1f} chars/text "
+            f"| {r['texts_per_s']:8.1f} texts/s"
+        )
+    legacy, masked = results["batch/apply+apply"], results["batch/masked"]
+    print(
+        f"\nmasking: {1 - masked['billed_chars'] / legacy['billed_chars']:.1%} fewer billed characters, "
+        f"{masked['texts_per_s'] / legacy['texts_per_s']:.2f}x throughput"
+    )
+
+    config = {
+        "texts": args.texts,
+        "concurrency": args.concurrency,
+        "per_char_us": os.getenv("MOCK_DEEPL_PER_CHAR_US", "5"),
+        "glossary_terms": len(main._glossaries.default.mapping),
+    }
+    harness.finish(args, "masking", results, config)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,127 @@
+"""
+Micro-benchmarks for the hot in-process steps of /translate: glossary
+application, request/response schema validation and similarity encoding.
+
+Each case is timed call by call and reported as calls/s plus p50/p95/p99 in
+microseconds.  Similarity encoding needs the SIMILARITY_MODEL weights (cached
+locally or downloadable); it is skipped with a note otherwise.
+
+Run from the repository root:
+    python -m benchmarks.bench_micro --output micro.json
+    python -m benchmarks.bench_micro --baseline micro.json
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+from typing import Callable, Dict
+
+os.environ.setdefault("DEEPL_API_KEY", "bench")
+os.environ.setdefault("SIMILARITY_PRELOAD", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import main  # noqa: E402
+from benchmarks import harness  # noqa: E402
+from benchmarks.bench_glossary import sample_text  # noqa: E402
+
+
+def measure(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    """Time *fn* call by call after a short warm-up."""
+    for _ in range(min(100, iterations)):
+        fn()
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(iterations):
+        t0 = clock()
+        fn()
+        samples.append(clock() - t0)
+    elapsed = clock() - start
+    pct = harness.percentiles(samples, scale=1e6)
+    return {
+        "calls_per_s": iterations / elapsed,
+        "p50_us": pct["p50"],
+        "p95_us": pct["p95"],
+        "p99_us": pct["p99"],
+    }
+
+
+def glossary_cases(rng: random.Random) -> Dict[str, Callable[[], object]]:
+    glossary = main._glossaries.default
+    short = "CAMZYOS® demonstrated superiority over placebo in the Clinical trial."
+    page = sample_text(glossary.mapping, rng, words=1_500)  # ~10 KB
+    return {
+        "apply_glossary/sentence": lambda: main.apply_glossary(short, glossary),
+        "apply_glossary/10kb": lambda: main.apply_glossary(page, glossary),
+    }
+
+
+def schema_cases() -> Dict[str, Callable[[], object]]:
+    request_body = json.dumps(
+        {"text": "Patient-reported outcomes improved across Primary and secondary endpoints.",
+         "scoring_mode": "hybrid"}
+    )
+    evaluator_json = json.dumps(
+        {"accuracy": 0.91, "fluency": 0.88, "terminology_adherence": 0.95,
+         "consistency": 1.0, "glossary_support": 0.9, "overall": 0.93}
+    )
+    response = main.TranslationResponse(
+        dutch="Door patiënten gerapporteerde uitkomsten verbeterden.",
+        confidence=main.ConfidenceBreakdown.model_validate_json(evaluator_json),
+        glossary_version="0" * 16,
+    )
+    return {
+        "schema/request": lambda: main.TranslationRequest.model_validate_json(request_body),
+        "schema/evaluator": lambda: main.ConfidenceBreakdown(**json.loads(evaluator_json)),
+        "schema/response": lambda: response.model_dump_json(),
+    }
+
+
+def similarity_cases(rng: random.Random) -> Dict[str, Callable[[], object]]:
+    scorer = main._similarity.scorer
+    try:
+        scorer.load()
+    except Exception as exc:  # weights not cached and no network, etc.
+        print(f"similarity encoding skipped: cannot load {scorer.model_name} ({type(exc).__name__})")
+        return {}
+    words = "patients treatment cardiac efficacy placebo symptoms trial outcome relief function".split()
+    pairs = [
+        (" ".join(rng.choices(words, k=15)), " ".join(rng.choices(words, k=15))) for _ in range(32)
+    ]
+    return {
+        "similarity/1 pair": lambda: scorer.score_pairs(pairs[:1]),
+        "similarity/32 pairs": lambda: scorer.score_pairs(pairs),
+    }
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000, help="calls per fast case")
+    parser.add_argument("--model-iterations", type=int, default=50, help="calls per similarity case")
+    parser.add_argument("--skip-similarity", action="store_true")
+    harness.add_arguments(parser)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cases = {**glossary_cases(rng), **schema_cases()}
+    slow = {} if args.skip_similarity else similarity_cases(rng)
+
+    results = {}
+    print(f"{'case':>24} | {'calls/s':>11} | {'p50':>9} | {'p95':>9} | {'p99':>9}")
+    print("-" * 74)
+    for name, fn in {**cases, **slow}.items():
+        r = measure(fn, args.model_iterations if name in slow else args.iterations)
+        results[name] = r
+        print(
+            f"{name:>24} | {r['calls_per_s']:>11,.0f} | {r['p50_us']:>7.1f}µs "
+            f"| {r['p95_us']:>7.1f}µs | {r['p99_us']:>7.1f}µs"
+        )
+
+    config = {"iterations": args.iterations, "model_iterations": args.model_iterations}
+    harness.finish(args, "micro", results, config)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,103 @@
+"""
+Measure the evaluator prompt size with the whole glossary vs. only the
+glossary entries found in the source text.
+
+Short texts (one or two sentences, like most /translate traffic) are scored
+through main.evaluate_translation against a fake LLM client that records the
+messages it receives, for the built-in glossary and synthetic 5 000 / 50 000
+term glossaries.  Tokens are estimated as characters / 4.
+
+Run from the repository root:
+    python -m benchmarks.bench_prompt
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+os.environ.setdefault("DEEPL_API_KEY", "bench")
+os.environ.setdefault("SIMILARITY_PRELOAD", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+
+import main  # noqa: E402
+from benchmarks.bench_glossary import synthetic_glossary  # noqa: E402
+from glossary_matcher import CompiledGlossary  # noqa: E402
+
+SIZES = (len(main.GLOSSARY), 5_000, 50_000)
+FILLER = "the patients in this study reported that daily activities became easier over time".split()
+SCORES = json.dumps(
+    {"accuracy": 0.9, "fluency": 0.9, "terminology_adherence": 0.9,
+     "consistency": 0.9, "glossary_support": 0.9, "overall": 0.9}
+)
+
+
+class FakeCompletions:
+    """Records prompt sizes instead of calling a model."""
+
+    def __init__(self):
+        self.prompt_chars = []
+
+    async def create(self, model, temperature, messages):
+        self.prompt_chars.append(sum(len(m["content"]) for m in messages))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=SCORES))])
+
+
+def short_text(terms, rng: random.Random) -> str:
+    words = rng.choices(FILLER, k=rng.randint(8, 14))
+    for _ in range(rng.randint(0, 2)):
+        words.insert(rng.randrange(len(words)), rng.choice(terms))
+    return " ".join(words).capitalize() + "."
+
+
+async def run(args) -> None:
+    rng = random.Random(0)
+    completions = FakeCompletions()
+    main._ai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    main._evaluator_model = "fake"
+
+    print(
+        f"{'terms':>7} | {'full prompt':>12} | {'filtered':>9} | {'est. tokens':>17} "
+        f"| {'reduction':>9} | {'lookup':>8}"
+    )
+    print("-" * 80)
+    for size in SIZES:
+        glossary = CompiledGlossary(synthetic_glossary(size, rng))
+        terms = list(glossary.mapping)
+        texts = [short_text(terms, rng) for _ in range(args.texts)]
+        full_system = len(main._EVALUATOR_SYSTEM_PROMPT)
+
+        completions.prompt_chars.clear()
+        for text in texts:
+            await main.evaluate_translation(text, text, glossary)
+        filtered = sum(completions.prompt_chars) / len(texts)
+        # Old behaviour: the whole glossary in every user message.
+        full = full_system + sum(
+            len(json.dumps({"source_en": t, "candidate_nl": t, "glossary": glossary.mapping},
+                           ensure_ascii=False))
+            for t in texts[:20]
+        ) / min(20, len(texts))
+
+        start = time.perf_counter()
+        for text in texts:
+            glossary.terms_in(text)
+        lookup_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+        print(
+            f"{size:>7} | {full:>12,.0f} | {filtered:>9,.0f} | {full / 4:>8,.0f} → {filtered / 4:>6,.0f} "
+            f"| {100 * (1 - filtered / full):>8.1f}% | {lookup_us:>6.1f}µs"
+        )
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=500, help="short texts per glossary size")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    cli()
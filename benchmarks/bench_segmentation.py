@@ -0,0 +1,119 @@
+"""
+Benchmark segmented translation of long documents (10 KB, 100 KB, 1 MB)
+against the single-call path.
+
+DeepL and the LLM evaluator are replaced by latency models (fixed overhead
+plus a per-character cost), so the numbers show the effect of fan-out and
+packing rather than real upstream speed.
+
+Run from the repository root:
+    python -m benchmarks.bench_segmentation
+"""
+
+import os
+import time
+import random
+import asyncio
+import argparse
+from urllib.parse import parse_qs
+
+os.environ.setdefault("DEEPL_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+import http_client  # noqa: E402
+import main  # noqa: E402
+from segmentation import reassemble, segment_document  # noqa: E402
+
+SIZES = {"10 KB": 10_000, "100 KB": 100_000, "1 MB": 1_000_000}
+WORDS = "patients treatment cardiac efficacy placebo symptoms trial outcome relief function".split()
+
+
+def make_document(size: int, rng: random.Random) -> str:
+    """HTML leaflet of roughly *size* characters with glossary terms mixed in."""
+    terms = list(main.GLOSSARY)
+    parts = ["<html><body>"]
+    length = 0
+    while length < size:
+        sentences = []
+        for _ in range(rng.randint(2, 5)):
+            words = rng.choices(WORDS, k=rng.randint(8, 20))
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+            if rng.random() < 0.3:
+                words[1] = f"<b>{words[1]}</b>"
+            sentences.append(" ".join(words).capitalize() + ".")
+        para = "<p>" + " ".join(sentences) + "</p>\n"
+        parts.append(para)
+        length += len(para)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def install_fake_deepl(overhead: float, per_char: float) -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        texts = parse_qs(request.content.decode(), keep_blank_values=True)["text"]
+        await asyncio.sleep(overhead + per_char * sum(map(len, texts)))
+        return httpx.Response(200, json={"translations": [{"text": t} for t in texts]})
+
+    http_client.set_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def install_fake_evaluator(overhead: float, per_char: float) -> None:
+    async def evaluate(src_en, tgt_nl, glossary):
+        await asyncio.sleep(overhead + per_char * (len(src_en) + len(tgt_nl)))
+        return main.ConfidenceBreakdown(
+            accuracy=0.9, fluency=0.9, terminology_adherence=0.9,
+            consistency=0.9, glossary_support=0.9, overall=0.9,
+        )
+
+    main.evaluate_translation = evaluate
+
+
+async def run(args) -> None:
+    rng = random.Random(0)
+    install_fake_deepl(args.deepl_overhead, args.deepl_per_char)
+    install_fake_evaluator(args.llm_overhead, args.llm_per_char)
+
+    print(
+        f"{'size':>7} | {'segments':>8} | {'split+join':>10} | {'translate 1x':>12} | {'translate seg':>13} "
+        f"| {'score 1x':>8} | {'score seg':>9} | {'total speed-up':>14}"
+    )
+    print("-" * 104)
+    for label, size in SIZES.items():
+        doc = make_document(size, rng)
+
+        start = time.perf_counter()
+        pieces = segment_document(doc, max_chars=main.SEGMENT_MAX_CHARS)
+        sources = [p.text for p in pieces if p.translatable]
+        assert reassemble(pieces, sources.__getitem__) == doc
+        split_s = time.perf_counter() - start
+
+        t0 = time.perf_counter()
+        dutch = await main.translate_to_dutch(doc)
+        t1 = time.perf_counter()
+        await main.evaluate_translation(doc, dutch, main._glossaries.default)
+        t2 = time.perf_counter()
+        dutch, pairs = await main.translate_document(doc)
+        t3 = time.perf_counter()
+        await main.evaluate_document(pairs, main._glossaries.default)
+        t4 = time.perf_counter()
+
+        print(
+            f"{label:>7} | {len(sources):>8} | {split_s * 1e3:>8.1f}ms | {t1 - t0:>11.2f}s "
+            f"| {t3 - t2:>12.2f}s | {t2 - t1:>7.2f}s | {t4 - t3:>8.2f}s | {(t2 - t0) / (t4 - t2):>13.1f}x"
+        )
+    await http_client.close_client()
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deepl-overhead", type=float, default=0.05, help="seconds per DeepL call")
+    parser.add_argument("--deepl-per-char", type=float, default=2e-5, help="seconds per character")
+    parser.add_argument("--llm-overhead", type=float, default=0.5, help="seconds per evaluator call")
+    parser.add_argument("--llm-per-char", type=float, default=1e-5, help="seconds per character")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,197 @@
+"""
+Cold-start time and memory per worker of the EN→NL service.
+
+* ``import``: ``python -c "import main"`` in a fresh interpreter, and the same
+  followed by ``main.warm_up()`` (sentence_transformers/torch, evaluator SDK,
+  similarity model).
+* ``gunicorn/preload`` vs ``gunicorn/no-preload``: the production entry point
+  (gunicorn.conf.py) with N workers.  Reports the time until ``/metrics``
+  answers, the time until every worker is warm, and RSS / PSS / USS per worker
+  from /proc/<pid>/smaps_rollup.  PSS splits shared pages between the
+  processes sharing them; USS is what a worker alone costs.  ``total_pss_mb``
+  (master + workers) is the real footprint.
+
+The similarity model is preloaded (SIMILARITY_PRELOAD=1, as in production),
+so its weights count towards the shared memory.  If it cannot be loaded (not
+cached, no network), the run says so and the figures exclude it.
+
+Linux only for the memory figures.  DeepL/OpenAI are never called.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --workers 4 --output startup.json
+    SIMILARITY_PRELOAD=0 python -m benchmarks.bench_startup --workers 4
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+import httpx
+
+from benchmarks import harness
+
+WARM_DONE = "Warm-up done"
+MODEL_MISSING = "Similarity model not preloaded"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _env(**extra: str) -> Dict[str, str]:
+    env = {
+        "DEEPL_API_KEY": "bench",
+        "OPENAI_API_KEY": "bench",  # so warm_up imports the SDK; nothing is sent
+        "TM_ENABLED": "0",
+        "SIMILARITY_PRELOAD": os.getenv("SIMILARITY_PRELOAD", "1"),
+        "LOG_LEVEL": "INFO",
+        **extra,
+    }
+    return {**os.environ, **env}
+
+
+def time_import(code: str, rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=_env(LOG_LEVEL="WARNING"), check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    """Rss / Pss / Uss (private clean + dirty) of *pid* in MiB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "uss": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def children(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as fh:
+        return [int(p) for p in fh.read().split()]
+
+
+def run_gunicorn(workers: int, preload: bool, timeout: float) -> Dict[str, float]:
+    port = _free_port()
+    log = tempfile.NamedTemporaryFile("w+", prefix="gunicorn-", suffix=".log", delete=False)
+    env = _env(
+        WEB_CONCURRENCY=str(workers),
+        PRELOAD_APP="1" if preload else "0",
+        BIND=f"127.0.0.1:{port}",
+        PROMETHEUS_MULTIPROC_DIR=tempfile.mkdtemp(prefix="prometheus-bench-"),
+    )
+    expected = 1 if preload else workers  # warm-up runs in the master, or in every worker
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"], env=env, stdout=log, stderr=log
+    )
+    try:
+        ready = None
+        deadline = time.monotonic() + timeout
+        while True:
+            if proc.poll() is not None:
+                log.seek(0)
+                raise RuntimeError(f"gunicorn exited with {proc.returncode}:\n{log.read()[-2000:]}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"gunicorn not ready after {timeout:.0f}s")
+            if ready is None:
+                try:
+                    if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1.0).status_code == 200:
+                        ready = time.perf_counter() - start
+                except httpx.HTTPError:
+                    pass
+            with open(log.name) as fh:
+                output = fh.read()
+            warm = output.count(WARM_DONE)
+            if ready is not None and warm >= expected and len(children(proc.pid)) == workers:
+                all_ready = time.perf_counter() - start
+                break
+            time.sleep(0.1)
+
+        time.sleep(2)  # let the workers settle
+        pids = children(proc.pid)
+        per_worker = [memory_mb(pid) for pid in pids]
+        master = memory_mb(proc.pid)
+        avg = {k: sum(m[k] for m in per_worker) / len(per_worker) for k in ("rss", "pss", "uss")}
+        return {
+            "ready_ms": ready * 1e3,
+            "all_workers_ready_ms": all_ready * 1e3,
+            "worker_rss_mb": avg["rss"],
+            "worker_pss_mb": avg["pss"],
+            "worker_uss_mb": avg["uss"],
+            "master_rss_mb": master["rss"],
+            "total_pss_mb": master["pss"] + sum(m["pss"] for m in per_worker),
+            "model_loaded": float(env["SIMILARITY_PRELOAD"] == "1" and MODEL_MISSING not in output),
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+        os.unlink(log.name)
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--import-rounds", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for start-up")
+    parser.add_argument("--skip-gunicorn", action="store_true")
+    harness.add_arguments(parser)
+    args = parser.parse_args()
+
+    results = {}
+    for case, code in (
+        ("import", "import main"),
+        ("import+warm_up", "import main; main.warm_up()"),
+    ):
+        pct = harness.percentiles(time_import(code, args.import_rounds), scale=1e3)
+        results[case] = {"p50_ms": pct["p50"]}
+        print(f"{case:>20}: {pct['p50'] / 1e3:6.2f} s (p50 of {args.import_rounds})")
+
+    if not args.skip_gunicorn:
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            sys.exit("memory figures need Linux /proc; rerun with --skip-gunicorn")
+        print(
+            f"\n{'gunicorn':>20} | {'ready':>8} | {'all warm':>8} | {'RSS/wkr':>8} | "
+            f"{'PSS/wkr':>8} | {'USS/wkr':>8} | {'total PSS':>9}"
+        )
+        print("-" * 86)
+        for preload in (True, False):
+            case = f"gunicorn/{'preload' if preload else 'no-preload'}"
+            r = results[case] = run_gunicorn(args.workers, preload, args.timeout)
+            if not r["model_loaded"]:
+                print(f"{'':>20}   (similarity model not loaded: figures exclude it)")
+            print(
+                f"{case:>20} | {r['ready_ms'] / 1e3:>6.1f} s | {r['all_workers_ready_ms'] / 1e3:>6.1f} s | "
+                f"{r['worker_rss_mb']:>5.0f} MB | {r['worker_pss_mb']:>5.0f} MB | "
+                f"{r['worker_uss_mb']:>5.0f} MB | {r['total_pss_mb']:>6.0f} MB"
+            )
+
+    config = {
+        "workers": args.workers,
+        "similarity_preload": _env()["SIMILARITY_PRELOAD"],
+        "cpus": os.cpu_count(),
+    }
+    harness.finish(args, "startup", results, config)
+
+
+if __name__ == "__main__":
+    cli()
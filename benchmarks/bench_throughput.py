@@ -0,0 +1,100 @@
+"""
+Offline throughput benchmark for the translation backends.
+
+Starts mock_deepl.py on a local port (no DeepL quota is used), points the
+DeepL backend at it and drives translate_to_dutch / translate_batch_to_dutch
+at a fixed concurrency.  Use ``--backend marian`` to measure the local CPU
+engine instead (requires ``transformers`` and the opus-mt models).
+
+Run from the repository root:
+    python -m benchmarks.bench_throughput --requests 2000 --concurrency 32
+"""
+
+import os
+import time
+import socket
+import asyncio
+import argparse
+import threading
+
+import uvicorn
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_deepl() -> str:
+    """Run mock_deepl.app in a background thread; return its translate URL."""
+    port = _free_port()
+    config = uvicorn.Config("mock_deepl:app", host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v2/translate"
+
+
+async def drive(args) -> None:
+    import http_client
+    import main
+
+    texts = [
+        f"{sentence} ({i})"
+        for i, sentence in enumerate(
+            [
+                "CAMZYOS® demonstrated superiority over placebo in the Clinical trial.",
+                "Patient-reported outcomes improved across Primary and secondary endpoints.",
+                "Feel free to reach out about the Favorable safety profile.",
+            ]
+            * (args.requests // 3 + 1)
+        )
+    ][: args.requests]
+
+    sem = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def single(text: str) -> None:
+        async with sem:
+            start = time.perf_counter()
+            await main.translate_to_dutch(text, args.backend)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(single(t) for t in texts))
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await main.translate_batch_to_dutch(texts, concurrency=args.concurrency, backend=args.backend)
+    batch_s = time.perf_counter() - start
+    await http_client.close_client()
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3  # noqa: E731
+    print(f"backend: {args.backend}  requests: {len(texts)}  concurrency: {args.concurrency}")
+    print(f"single-text calls : {len(texts) / single_s:8.1f} texts/s  (p50 {pct(0.5):.1f}ms, p99 {pct(0.99):.1f}ms)")
+    print(f"batched calls     : {len(texts) / batch_s:8.1f} texts/s")
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--backend", default="deepl", choices=("deepl", "marian", "auto"))
+    args = parser.parse_args()
+
+    if args.backend != "marian":
+        os.environ["DEEPL_API_URL"] = start_mock_deepl()
+    os.environ.setdefault("DEEPL_API_KEY", "mock")
+    os.environ.setdefault("DEEPL_RATE_LIMIT", "0")  # measure the pipeline, not the limiter
+    os.environ.setdefault("DEEPL_MAX_CONCURRENCY", str(args.concurrency))
+    os.environ.setdefault("TRANSLATION_BACKEND", args.backend)
+    os.environ.setdefault("SIMILARITY_PRELOAD", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    asyncio.run(drive(args))
+
+
+if __name__ == "__main__":
+    cli()
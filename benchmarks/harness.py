@@ -0,0 +1,138 @@
+"""
+Shared helpers for the benchmark suite: latency percentiles, JSON result
+files and comparison against a saved baseline.
+
+A result file looks like::
+
+    {"suite": "loadtest", "created": "...", "revision": "<git sha>",
+     "config": {...}, "results": {"<case>": {"p50_ms": 12.3, ...}}}
+
+Metric names encode their direction: ``*_per_s`` is better when higher,
+``*_ms`` / ``*_us`` / ``*_mb`` and ``error_rate`` are better when lower; other numbers
+(request counts, sizes) are informational and never flagged.
+"""
+
+import sys
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Results = Dict[str, Dict[str, float]]
+
+
+def percentiles(samples: Sequence[float], scale: float = 1.0) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 and mean of *samples*, multiplied by *scale*."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale
+
+    return {
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "mean": sum(ordered) / len(ordered) * scale,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path: str, suite: str, results: Results, config: Dict) -> None:
+    document = {
+        "suite": suite,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": config,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(document, fh, indent=2)
+        fh.write("\n")
+    print(f"results written to {path}")
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not compared."""
+    if metric.endswith("_per_s"):
+        return 1
+    if metric.endswith(("_ms", "_us", "_mb")) or metric == "error_rate":
+        return -1
+    return 0
+
+
+def compare(
+    current: Results, baseline: Results, tolerance: float
+) -> List[Tuple[str, str, float, float, float, bool]]:
+    """Rows of (case, metric, baseline, current, change, regressed).
+
+    *change* is the relative difference; a metric regresses when it moved in
+    the bad direction by more than *tolerance* (e.g. 0.10 = 10 %).  Error
+    rates are compared in absolute terms.
+    """
+    rows = []
+    for case, metrics in current.items():
+        for metric, value in metrics.items():
+            direction = _direction(metric)
+            before = baseline.get(case, {}).get(metric)
+            if direction == 0 or before is None:
+                continue
+            if metric == "error_rate":
+                change = value - before
+            else:
+                change = (value - before) / before if before else 0.0
+            rows.append((case, metric, before, value, change, -direction * change > tolerance))
+    return rows
+
+
+def report(current: Results, baseline_path: str, tolerance: float) -> bool:
+    """Print the comparison against *baseline_path*; True if nothing regressed."""
+    baseline = load(baseline_path)
+    rows = compare(current, baseline["results"], tolerance)
+    print(
+        f"\ncompared with {baseline_path} (revision {baseline.get('revision')}, "
+        f"{baseline.get('created')}), tolerance {tolerance:.0%}"
+    )
+    print(f"{'case':>28} | {'metric':>14} | {'baseline':>10} | {'current':>10} | {'change':>8}")
+    print("-" * 84)
+    for case, metric, before, value, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{case:>28} | {metric:>14} | {before:>10.2f} | {value:>10.2f} | {change:>+7.1%}{flag}")
+    regressions = sum(r[-1] for r in rows)
+    if regressions:
+        print(f"{regressions} metric(s) regressed beyond {tolerance:.0%}", file=sys.stderr)
+    return not regressions
+
+
+def add_arguments(parser) -> None:
+    """--output / --baseline / --tolerance, shared by the suites."""
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a previously saved results file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10,
+        help="relative change treated as a regression (default 0.10)",
+    )
+
+
+def finish(args, suite: str, results: Results, config: Dict) -> None:
+    """Save and/or compare as requested; exit 1 on regression."""
+    if args.output:
+        save(args.output, suite, results, config)
+    if args.baseline and not report(results, args.baseline, args.tolerance):
+        sys.exit(1)
@@ -0,0 +1,247 @@
+"""
+End-to-end load test of both services against local fake upstreams.
+
+Starts mock_deepl.py and mock_openai.py (configurable latency and error
+rates), the EN→NL service (main.py) and the NL→EN service
+(backtranslation.py) as separate uvicorn processes, then drives their
+/translate routes with a closed loop of N concurrent clients.  Reports
+throughput and p50/p95/p99 latency per scenario and concurrency level.
+
+Scenarios:
+    en-nl           POST main /translate, confidence scored inline
+    en-nl-deferred  POST main /translate with async_confidence (score in the background)
+    nl-en           POST backtranslation /translate
+
+The translation memory is disabled so every request reaches the upstreams,
+and each case starts once background work from the previous one has drained
+(upstream in-flight gauges on /metrics back at zero).
+
+Run from the repository root:
+    python -m benchmarks.loadtest --concurrency 8 32 --requests 500 --output baseline.json
+    python -m benchmarks.loadtest --concurrency 8 32 --requests 500 --baseline baseline.json
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import itertools
+import subprocess
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from benchmarks import harness
+
+SCENARIOS = ("en-nl", "en-nl-deferred", "nl-en")
+SENTENCES_EN = (
+    "CAMZYOS® demonstrated superiority over placebo in the Clinical trial.",
+    "Patient-reported outcomes improved across Primary and secondary endpoints.",
+    "Feel free to reach out about the Favorable safety profile.",
+    "Most patients reported relief of symptoms within weeks of starting treatment.",
+)
+SENTENCES_NL = (
+    "CAMZYOS® toonde superioriteit ten opzichte van placebo in de klinische studie.",
+    "Door patiënten gerapporteerde uitkomsten verbeterden op primaire en secundaire eindpunten.",
+    "Neem gerust contact op over het gunstige veiligheidsprofiel.",
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{' '.join(proc.args)} exited with {proc.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+
+@contextmanager
+def services(args) -> Iterator[Dict[str, str]]:
+    """Start the fakes and both apps; yield their base URLs; stop them on exit."""
+    ports = {name: _free_port() for name in ("deepl", "openai", "main", "back")}
+    base_env = {**os.environ, "LOG_LEVEL": "WARNING"}
+    env = {
+        "deepl": {
+            "MOCK_DEEPL_LATENCY_MS": str(args.deepl_latency_ms),
+            "MOCK_DEEPL_ERROR_RATE": str(args.deepl_error_rate),
+        },
+        "openai": {
+            "MOCK_OPENAI_LATENCY_MS": str(args.llm_latency_ms),
+            "MOCK_OPENAI_ERROR_RATE": str(args.llm_error_rate),
+        },
+    }
+    app_env = {
+        "DEEPL_API_URL": f"http://127.0.0.1:{ports['deepl']}/v2/translate",
+        "DEEPL_API_KEY": "mock",
+        "OPENAI_API_KEY": "mock",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{ports['openai']}/v1",
+        # Measure the pipeline, not the rate limiters or the cache.
+        "DEEPL_RATE_LIMIT": "0",
+        "LLM_RATE_LIMIT": "0",
+        "DEEPL_MAX_CONCURRENCY": "256",
+        "LLM_MAX_CONCURRENCY": "256",
+        "TRANSLATION_BACKEND": "deepl",
+        "TM_ENABLED": "0",
+        "SIMILARITY_PRELOAD": "0",
+        "SCORING_MODE": args.scoring_mode,
+    }
+    env["main"] = env["back"] = app_env
+    modules = {"deepl": "mock_deepl:app", "openai": "mock_openai:app",
+               "main": "main:app", "back": "backtranslation:app"}
+    ready = {"deepl": "/v2/usage", "openai": "/v1/usage", "main": "/metrics", "back": "/metrics"}
+
+    procs: List[subprocess.Popen] = []
+    try:
+        for name, module in modules.items():
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", module, "--host", "127.0.0.1",
+                 "--port", str(ports[name]), "--log-level", "warning", "--no-access-log"],
+                env={**base_env, **env[name]},
+            )
+            procs.append(proc)
+        urls = {name: f"http://127.0.0.1:{port}" for name, port in ports.items()}
+        for proc, name in zip(procs, modules):
+            _wait_ready(urls[name] + ready[name], proc, args.startup_timeout)
+        yield urls
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def _request(scenario: str, i: int):
+    """(service, JSON body) for the i-th request; texts are unique per request."""
+    if scenario == "nl-en":
+        return "back", {"text": f"{SENTENCES_NL[i % len(SENTENCES_NL)]} ({i})"}
+    body = {"text": f"{SENTENCES_EN[i % len(SENTENCES_EN)]} ({i})"}
+    if scenario == "en-nl-deferred":
+        body["async_confidence"] = True
+    return "main", body
+
+
+async def run_scenario(
+    urls: Dict[str, str], scenario: str, concurrency: int, requests: int, duration: Optional[float]
+) -> Dict[str, float]:
+    """Closed loop: *concurrency* clients, each sending its next request when the last returns."""
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=120.0) as client:
+        deadline = time.perf_counter() + duration if duration else None
+
+        async def worker() -> None:
+            nonlocal errors
+            while True:
+                i = next(counter)
+                if (deadline is None and i >= requests) or (deadline and time.perf_counter() > deadline):
+                    return
+                service, body = _request(scenario, i)
+                start = time.perf_counter()
+                try:
+                    response = await client.post(urls[service] + "/translate", json=body)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    pct = harness.percentiles(latencies, scale=1e3)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": errors / len(latencies) if latencies else 0.0,
+        "requests_per_s": len(latencies) / elapsed,
+        "p50_ms": pct["p50"],
+        "p95_ms": pct["p95"],
+        "p99_ms": pct["p99"],
+        "mean_ms": pct["mean"],
+    }
+
+
+async def wait_idle(urls: Dict[str, str], timeout: float = 120.0) -> None:
+    """Let background scoring from the previous case finish (upstream in-flight gauges at 0)."""
+    deadline = time.monotonic() + timeout
+    idle_reads = 0
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        while time.monotonic() < deadline and idle_reads < 2:
+            busy = 0.0
+            for service in ("main", "back"):
+                text = (await client.get(urls[service] + "/metrics")).text
+                busy += sum(
+                    float(line.rsplit(" ", 1)[1])
+                    for line in text.splitlines()
+                    if line.startswith("translation_upstream_in_flight{")
+                )
+            idle_reads = idle_reads + 1 if busy == 0 else 0
+            await asyncio.sleep(0.25)
+
+
+async def drive(args, urls: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    print(f"{'case':>24} | {'requests':>8} | {'errors':>6} | {'req/s':>8} | {'p50':>8} | {'p95':>8} | {'p99':>8}")
+    print("-" * 86)
+    for scenario in args.scenario:
+        # Warm-up: connection pools, lazy imports, first glossary compile.
+        await wait_idle(urls)
+        await run_scenario(urls, scenario, min(4, args.concurrency[0]), args.warmup, None)
+        for concurrency in args.concurrency:
+            await wait_idle(urls)
+            r = await run_scenario(urls, scenario, concurrency, args.requests, args.duration)
+            case = f"{scenario}@c{concurrency}"
+            results[case] = r
+            print(
+                f"{case:>24} | {r['requests']:>8} | {r['errors']:>6} | {r['requests_per_s']:>8.1f} "
+                f"| {r['p50_ms']:>6.1f}ms | {r['p95_ms']:>6.1f}ms | {r['p99_ms']:>6.1f}ms"
+            )
+    return results
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="requests per case")
+    parser.add_argument("--duration", type=float, help="seconds per case (overrides --requests)")
+    parser.add_argument("--warmup", type=int, default=20, help="warm-up requests per scenario")
+    parser.add_argument("--deepl-latency-ms", type=float, default=50)
+    parser.add_argument("--deepl-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--scoring-mode", default="llm", choices=("llm", "hybrid", "local"))
+    parser.add_argument("--startup-timeout", type=float, default=120, help="seconds to wait for each service")
+    harness.add_arguments(parser)
+    args = parser.parse_args()
+
+    with services(args) as urls:
+        results = asyncio.run(drive(args, urls))
+
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "tolerance")}
+    harness.finish(args, "loadtest", results, config)
+
+
+if __name__ == "__main__":
+    cli()
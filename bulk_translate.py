@@ -0,0 +1,248 @@
+"""
+Stream a JSONL or CSV corpus of English segments through the translation
+pipeline (glossary + DeepL + optional confidence scoring) and write one JSONL
+result per input row.
+
+Memory stays constant: rows are read lazily, at most ``--concurrency``
+requests are in flight, and results are written (in input order) as soon as
+they are ready.  Progress is checkpointed next to the output file, so an
+interrupted run continues where it stopped with ``--resume``.
+
+Example:
+    python bulk_translate.py segments.csv out.jsonl --text-field source --concurrency 16
+    python bulk_translate.py segments.csv out.jsonl --text-field source --resume
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import asyncio
+import argparse
+import logging
+from collections import deque
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from fastapi import HTTPException
+
+import http_client
+import main
+from glossary_matcher import CompiledGlossary
+
+logger = logging.getLogger("translation-app.bulk")
+
+
+# ─── Input ──────────────────────────────────────────────────────────────────
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".tsv"):
+        return ext[1:]
+    return "jsonl"
+
+
+def read_rows(path: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield input records one at a time."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt in ("csv", "tsv"):
+            yield from csv.DictReader(f, delimiter="\t" if fmt == "tsv" else ",")
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def count_rows(path: str, fmt: str) -> int:
+    """Cheap streaming pass used for the ETA."""
+    return sum(1 for _ in read_rows(path, fmt))
+
+
+# ─── Checkpoint ─────────────────────────────────────────────────────────────
+def load_checkpoint(path: str) -> Tuple[int, int]:
+    """Return (rows_done, output_offset) from *path*, or zeros."""
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    return state["rows_done"], state["output_offset"]
+
+
+def save_checkpoint(path: str, input_path: str, rows_done: int, offset: int) -> None:
+    """Atomically replace the checkpoint file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {"input": input_path, "rows_done": rows_done, "output_offset": offset}, f
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def commit_output(out, path: str, input_path: str, rows_done: int) -> None:
+    """Make the output durable, then checkpoint it.
+
+    The checkpoint never points past data that is on disk, so a crash at any
+    moment resumes without skipping or truncating written rows.
+    """
+    out.flush()
+    os.fsync(out.fileno())
+    save_checkpoint(path, input_path, rows_done, out.tell())
+
+
+# ─── Processing ─────────────────────────────────────────────────────────────
+async def translate_row(
+    row: Dict[str, Any],
+    text_field: str,
+    id_field: Optional[str],
+    score: bool,
+    glossary: CompiledGlossary,
+    scoring_mode: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Translate (and optionally score) one record; errors are kept per row."""
+    text = row.get(text_field) or ""
+    result: Dict[str, Any] = {"english": text}
+    if id_field:
+        result["id"] = row.get(id_field)
+    try:
+        if len(text) > main.SEGMENT_THRESHOLD_CHARS:
+            dutch, segments = await main.translate_document(text, glossary=glossary)
+        else:
+            dutch, segments = await main.translate_to_dutch(text, glossary=glossary), None
+        result["dutch"] = dutch
+        if score:
+            if segments is not None:
+                confidence = await main.evaluate_document(segments, glossary, scoring_mode)
+            else:
+                confidence = await main.evaluate_translation(text, dutch, glossary, scoring_mode)
+            result["confidence"] = confidence.model_dump()
+    except HTTPException as exc:
+        result["error"] = exc.detail
+    except Exception as exc:  # noqa: BLE001 – one bad row must not stop the run
+        logger.exception("Row failed")
+        result["error"] = str(exc) or exc.__class__.__name__
+    return result
+
+
+class Progress:
+    """Throughput / ETA reporter on stderr."""
+
+    def __init__(self, total: int, already_done: int, every: float):
+        self.total = total
+        self.start_done = already_done
+        self.every = every
+        self.started = time.monotonic()
+        self.last = 0.0
+
+    def update(self, done: int, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.last < self.every:
+            return
+        self.last = now
+        elapsed = now - self.started
+        rate = (done - self.start_done) / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - done, 0)
+        eta = remaining / rate if rate > 0 else float("inf")
+        eta_txt = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta != float("inf") else "--:--:--"
+        print(
+            f"\r{done}/{self.total} rows | {rate:.1f} rows/s | ETA {eta_txt}",
+            end="\n" if force else "",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    fmt = _detect_format(args.input, args.format)
+    checkpoint = args.checkpoint or args.output + ".ckpt"
+
+    resuming = args.resume and os.path.exists(checkpoint)
+    rows_done, offset = load_checkpoint(checkpoint) if resuming else (0, 0)
+    if resuming and not os.path.exists(args.output):
+        print(f"{args.output} is missing; starting from the first row", file=sys.stderr)
+        resuming, rows_done, offset = False, 0, 0
+    if resuming and os.path.getsize(args.output) < offset:
+        raise SystemExit(f"{args.output} is shorter than its checkpoint; rerun with --overwrite")
+    if not resuming and os.path.exists(args.output) and not args.overwrite:
+        if args.resume:
+            raise SystemExit(f"{checkpoint} not found; rerun with --overwrite to replace {args.output}")
+        raise SystemExit(f"{args.output} exists; use --resume or --overwrite")
+
+    glossary = await main._glossaries.get(args.glossary_id)
+    total = count_rows(args.input, fmt)
+    progress = Progress(total, rows_done, args.progress_every)
+    if rows_done:
+        print(f"Resuming after row {rows_done}", file=sys.stderr)
+
+    sem = asyncio.Semaphore(args.concurrency)
+    window = args.concurrency * 4  # completed-but-unwritten results stay bounded
+
+    async def process(row: Dict[str, Any]) -> Dict[str, Any]:
+        async with sem:
+            return await translate_row(
+                row, args.text_field, args.id_field, not args.no_score, glossary, args.scoring_mode
+            )
+
+    mode = "r+b" if resuming else "wb"  # only a fresh run may truncate the output
+    with open(args.output, mode) as out:
+        out.truncate(offset)  # drop anything written after the last checkpoint
+        out.seek(offset)
+
+        rows = read_rows(args.input, fmt)
+        for _ in range(rows_done):
+            next(rows, None)
+
+        pending: "deque[asyncio.Task]" = deque()
+        exhausted = False
+        done = rows_done
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    row = next(rows, None)
+                    if row is None:
+                        exhausted = True
+                        break
+                    pending.append(asyncio.create_task(process(row)))
+                if not pending:
+                    break
+
+                result = await pending.popleft()
+                out.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+                done += 1
+                if done % args.checkpoint_every == 0:
+                    commit_output(out, checkpoint, args.input, done)
+                progress.update(done)
+        finally:
+            for task in pending:
+                task.cancel()
+            commit_output(out, checkpoint, args.input, done)
+            progress.update(done, force=True)
+            await http_client.close_client()
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="JSONL, CSV or TSV file of English segments")
+    parser.add_argument("output", help="JSONL file to write results to")
+    parser.add_argument("--format", choices=("jsonl", "csv", "tsv"), help="input format (default: by extension)")
+    parser.add_argument("--text-field", default="text", help="column/key holding the English text")
+    parser.add_argument("--id-field", help="column/key copied to the output as 'id'")
+    parser.add_argument("--concurrency", type=int, default=8, help="max requests in flight")
+    parser.add_argument("--no-score", action="store_true", help="skip confidence scoring")
+    parser.add_argument(
+        "--scoring-mode", choices=("llm", "hybrid", "local"), help="default: SCORING_MODE"
+    )
+    parser.add_argument("--glossary-id", help="glossary to enforce (default: built-in)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.ckpt)")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="rows between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    parser.add_argument("--overwrite", action="store_true", help="start over, replacing the output")
+    parser.add_argument("--progress-every", type=float, default=2.0, help="seconds between progress lines")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    cli()
@@ -29,33 +29,182 @@ Compute semantic similarity between two English sentences with
 (1) a lightweight model:  all-MiniLM-L6-v2
 (2) a higher-accuracy model: all-mpnet-base-v2
 
+Importable as a scorer: ``SimilarityScorer`` loads a model once and scores
+many pairs per ``model.encode`` call; ``SimilarityBatcher`` coalesces
+concurrent async requests into micro-batches for the translation service.
+Run as a script to compare STATEMENT_A and STATEMENT_B with both models.
+
+``sentence_transformers`` (and torch, ~9 s to import) is only imported when a
+model is first loaded, so importing this module is cheap.
 """
 
-from sentence_transformers import SentenceTransformer, util
+import asyncio
+import threading
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 # ── 1.  Put sentences here (empty -> will prompt) ───────────────────────
 STATEMENT_A = 'CAMZYOS® is a first-in-class cardiac myosin inhibitor that provides sustained relief from symptoms in patients with symptomatic obstructive hypertrophic cardiomyopathy, as demonstrated in the EXPLORER-HCM clinical trial'
 STATEMENT_B = 'CAMZYOS® is a first-in-class cardiac myosin inhibitor that provides long-term symptomatic relief in patients with symptomatic obstructive hypertrophic cardiomyopathy, as demonstrated in the EXPLORER-HCM clinical trial.'
 # ------------------------------------------------------------------------
 
-if not (STATEMENT_A and STATEMENT_B):
-    STATEMENT_A = input("Enter first sentence: ").strip()
-    STATEMENT_B = input("Enter second sentence: ").strip()
-
 MODELS = {
     "MiniLM (all-MiniLM-L6-v2)": "all-MiniLM-L6-v2",          #  384-dim
     "MPNet (all-mpnet-base-v2)": "all-mpnet-base-v2",         #  768-dim
 }
 
-embeddings = {}
-for label, name in MODELS.items():
-    print(f"Loading {label} …")
-    model = SentenceTransformer(name)
-    embeddings[label] = model.encode([STATEMENT_A, STATEMENT_B], convert_to_tensor=True)
-
-print("\nSimilarity scores")
-print("------------------")
-for label, (emb1, emb2) in embeddings.items():
-    score = util.cos_sim(emb1, emb2).item()
-    score = (score + 1) / 2        # map from (-1,1) to (0,1)
-    print(f"{label:<30}: {score:.4f}")
+
+# ── 2.  Importable scorer ───────────────────────────────────────────────
+class ModelUnavailable(RuntimeError):
+    """The embedding model could not be loaded (not installed, not cached, offline)."""
+
+
+class SimilarityScorer:
+    """Loads one SentenceTransformer once and scores sentence pairs in bulk."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model: Optional["SentenceTransformer"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> "SentenceTransformer":
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+
+                        self._model = SentenceTransformer(self.model_name)
+                    except (ImportError, OSError, ValueError) as exc:
+                        # Not cached: a later call tries again.
+                        raise ModelUnavailable(f"Cannot load {self.model_name}: {exc}") from exc
+        return self._model
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> None:
+        """Load the model now (warm-up) instead of on the first request.
+
+        Raises :class:`ModelUnavailable` if it cannot be loaded.
+        """
+        self.model  # noqa: B018
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Unit-length float32 embeddings, one row per text (fuzzy TM index)."""
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32, copy=False)
+
+    def score_pairs(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Cosine similarity per pair, mapped from (-1, 1) to (0, 1)."""
+        if not pairs:
+            return []
+        model = self.model
+        from sentence_transformers import util
+
+        # Encode every distinct sentence once, in a single encode call.
+        index = {}
+        for a, b in pairs:
+            index.setdefault(a, len(index))
+            index.setdefault(b, len(index))
+        emb = model.encode(
+            list(index), batch_size=self.batch_size, convert_to_tensor=True
+        )
+        left = emb[[index[a] for a, _ in pairs]]
+        right = emb[[index[b] for _, b in pairs]]
+        cos = util.pairwise_cos_sim(left, right)
+        return [(c + 1) / 2 for c in cos.tolist()]
+
+
+class SimilarityBatcher:
+    """Collects concurrent ``score`` calls and runs them as one encode batch."""
+
+    def __init__(
+        self,
+        scorer: SimilarityScorer,
+        max_batch_pairs: int = 256,
+        max_wait_ms: float = 5.0,
+    ):
+        self.scorer = scorer
+        self.max_batch_pairs = max_batch_pairs
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def score(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(pairs), future))
+        return await future
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_pairs:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            flat = [pair for pairs, _ in batch for pair in pairs]
+            try:
+                scores = await asyncio.to_thread(self.scorer.score_pairs, flat)
+            except Exception as exc:  # noqa: BLE001 – handed to every waiter
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            start = 0
+            for pairs, future in batch:
+                if not future.done():
+                    future.set_result(scores[start:start + len(pairs)])
+                start += len(pairs)
+
+
+# ── 3.  Script entry point ──────────────────────────────────────────────
+def main() -> None:
+    statement_a, statement_b = STATEMENT_A, STATEMENT_B
+    if not (statement_a and statement_b):
+        statement_a = input("Enter first sentence: ").strip()
+        statement_b = input("Enter second sentence: ").strip()
+
+    scores = {}
+    for label, name in MODELS.items():
+        print(f"Loading {label} …")
+        scores[label] = SimilarityScorer(name).score_pairs([(statement_a, statement_b)])[0]
+
+    print("\nSimilarity scores")
+    print("------------------")
+    for label, score in scores.items():
+        print(f"{label:<30}: {score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
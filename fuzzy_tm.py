@@ -0,0 +1,256 @@
+# fuzzy_tm.py
+# Fuzzy translation memory: memory-mapped embedding matrix with batched top-k cosine search
+
+"""
+Unit-length embeddings of translated English segments are kept in a float32
+matrix memory-mapped from disk, so the index can be much larger than RAM and
+survives restarts.  Similarity is a dot product computed block by block
+(bounded memory at any size) with a running top-k per query; many queries
+are answered by one matrix product per block.
+
+Each row carries a *tag* (engine + glossary version) and queries only match
+rows with the same tag, so a translation made under another glossary is
+never reused.
+
+Index directory::
+
+    meta.json       embedding dim, model name, tag names
+    vectors.f32     capacity × dim float32 (grown by doubling)
+    tags.i32        capacity int32, tag id per row
+    entries.jsonl   {"source", "dutch"} per row; its complete lines are the rows
+
+Appends write the vectors first and the entry line last, so a crash never
+leaves a row without its vector.
+"""
+
+import os
+import json
+import logging
+import threading
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("translation-app.fuzzy-tm")
+
+
+class FuzzyMatch(NamedTuple):
+    row: int
+    similarity: float
+    source: str
+    dutch: str
+
+
+class EmbeddingIndex:
+    """Append-only, persistent embedding index with tag-filtered top-k search."""
+
+    def __init__(
+        self,
+        directory: str,
+        model_name: str = "",
+        block_rows: int = 65_536,
+        initial_capacity: int = 1_024,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.block_rows = block_rows
+        self.initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            if model_name and meta["model"] and meta["model"] != model_name:
+                raise ValueError(
+                    f"Fuzzy TM at {directory} was built with {meta['model']}, not {model_name}"
+                )
+        else:
+            meta = {"dim": None, "model": model_name, "tags": []}
+        self.dim: Optional[int] = meta["dim"]
+        self.model_name: str = meta["model"] or model_name
+        self._tags: List[str] = list(meta["tags"])
+        self._tag_ids: Dict[str, int] = {t: i for i, t in enumerate(self._tags)}
+
+        self._entries = open(os.path.join(directory, "entries.jsonl"), "a+b")
+        self._offsets = array("q")  # byte offset of each row's entry line
+        self._end = 0
+        self._scan_entries()
+
+        self.capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._row_tags: Optional[np.memmap] = None
+        if self.dim is not None:
+            size = os.path.getsize(self._path("vectors.f32")) if os.path.exists(self._path("vectors.f32")) else 0
+            self._map(max(len(self._offsets), size // (4 * self.dim), 1))
+        logger.info("Fuzzy TM %s: %d segment(s)", directory, len(self))
+
+    # ── storage ────────────────────────────────────────────────────────────
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _scan_entries(self) -> None:
+        """Index line offsets; drop a torn last line left by a crash."""
+        self._entries.seek(0)
+        pos = 0
+        for line in self._entries:
+            if not line.endswith(b"\n"):
+                logger.warning("Fuzzy TM: discarding incomplete entry at byte %d", pos)
+                self._entries.truncate(pos)
+                break
+            self._offsets.append(pos)
+            pos += len(line)
+        self._end = pos
+
+    def _save_meta(self) -> None:
+        tmp = self._path("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"dim": self.dim, "model": self.model_name, "tags": self._tags}, fh)
+        os.replace(tmp, self._path("meta.json"))
+
+    def _map(self, capacity: int) -> None:
+        """(Re)map the matrices with room for *capacity* rows."""
+        for name, row_bytes in (("vectors.f32", 4 * self.dim), ("tags.i32", 4)):
+            with open(self._path(name), "a+b") as fh:
+                if os.fstat(fh.fileno()).st_size < capacity * row_bytes:
+                    fh.truncate(capacity * row_bytes)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._row_tags.flush()
+        self._vectors = np.memmap(self._path("vectors.f32"), np.float32, "r+", shape=(capacity, self.dim))
+        self._row_tags = np.memmap(self._path("tags.i32"), np.int32, "r+", shape=(capacity,))
+        self.capacity = capacity
+
+    def _tag_id(self, tag: str) -> int:
+        if tag not in self._tag_ids:
+            self._tag_ids[tag] = len(self._tags)
+            self._tags.append(tag)
+            self._save_meta()
+        return self._tag_ids[tag]
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    # ── writes ─────────────────────────────────────────────────────────────
+    def add(
+        self, embeddings: np.ndarray, sources: Sequence[str], translations: Sequence[str], tag: str
+    ) -> List[int]:
+        """Append one row per (embedding, source, translation); returns the row ids."""
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(sources), -1)
+        if not len(sources):
+            return []
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        lines = [
+            json.dumps({"source": s, "dutch": d}, ensure_ascii=False).encode("utf-8") + b"\n"
+            for s, d in zip(sources, translations)
+        ]
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._save_meta()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {vectors.shape[1]} != index dim {self.dim}")
+            tag_id = self._tag_id(tag)
+            start = len(self._offsets)
+            stop = start + len(lines)
+            if stop > self.capacity:
+                self._map(max(stop, 2 * self.capacity, self.initial_capacity))
+            self._vectors[start:stop] = vectors
+            self._row_tags[start:stop] = tag_id
+
+            self._entries.seek(0, os.SEEK_END)
+            self._entries.write(b"".join(lines))
+            self._entries.flush()
+            for line in lines:
+                self._offsets.append(self._end)
+                self._end += len(line)
+        return list(range(start, stop))
+
+    # ── reads ──────────────────────────────────────────────────────────────
+    def search(
+        self, queries: np.ndarray, k: int = 1, tag: Optional[str] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Top-*k* ``(row, cosine)`` per query row, best first."""
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        with self._lock:
+            count = len(self._offsets)
+            vectors, row_tags = self._vectors, self._row_tags
+            tag_id = self._tag_ids.get(tag, -1) if tag is not None else None
+        if count == 0 or tag_id == -1:
+            return [[] for _ in range(len(queries))]
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        k = min(k, count)
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        for start in range(0, count, self.block_rows):
+            stop = min(count, start + self.block_rows)
+            scores = queries @ vectors[start:stop].T
+            if tag_id is not None:
+                scores[:, row_tags[start:stop] != tag_id] = -np.inf
+            if stop - start > k:
+                cand = np.argpartition(scores, -k, axis=1)[:, -k:]
+            else:
+                cand = np.broadcast_to(np.arange(stop - start), scores.shape)
+            merged_scores = np.concatenate([best_scores, np.take_along_axis(scores, cand, axis=1)], axis=1)
+            merged_rows = np.concatenate([best_rows, cand + start], axis=1)
+            top = np.argpartition(merged_scores, -k, axis=1)[:, -k:]
+            best_scores = np.take_along_axis(merged_scores, top, axis=1)
+            best_rows = np.take_along_axis(merged_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [(int(r), float(s)) for r, s in zip(rows, scores) if r >= 0 and s > -np.inf]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def entry(self, row: int) -> Dict[str, str]:
+        """Stored ``{"source", "dutch"}`` of *row*."""
+        with self._lock:
+            start = self._offsets[row]
+            stop = self._offsets[row + 1] if row + 1 < len(self._offsets) else self._end
+        return json.loads(os.pread(self._entries.fileno(), stop - start, start))
+
+    def lookup_many(
+        self, queries: np.ndarray, tag: str, threshold: float
+    ) -> List[Optional[FuzzyMatch]]:
+        """Best stored translation per query if its similarity reaches *threshold*."""
+        matches: List[Optional[FuzzyMatch]] = []
+        for best in self.search(queries, k=1, tag=tag):
+            if best and best[0][1] >= threshold:
+                row, similarity = best[0]
+                stored = self.entry(row)
+                matches.append(FuzzyMatch(row, round(similarity, 4), stored["source"], stored["dutch"]))
+            else:
+                matches.append(None)
+        self.lookups += len(matches)
+        self.hits += sum(m is not None for m in matches)
+        return matches
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "segments": len(self),
+            "capacity": self.capacity,
+            "dim": self.dim,
+            "model": self.model_name,
+            "tags": len(self._tags),
+            "lookups": self.lookups,
+            "hits": self.hits,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._row_tags.flush()
+            self._entries.close()
+        logger.info("Closed fuzzy TM %s", self.directory)
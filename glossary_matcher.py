@@ -0,0 +1,160 @@
+# glossary_matcher.py
+# Compiled, single-pass glossary substitution
+
+"""
+A glossary is compiled once into a trie-shaped regular expression.  At every
+position the regex engine walks the trie and (thanks to greedy optional groups)
+returns the *longest* term starting there, so one ``re.sub`` scan gives the same
+longest-match-first behaviour as the old sort-and-replace loop without
+re-matching text that has already been substituted.
+
+:meth:`CompiledGlossary.mask` replaces terms with numbered empty tags
+(``<g0/>``) instead, for engines that keep markup in place (DeepL with
+``tag_handling=html``); :func:`unmask` puts the Dutch targets back.
+"""
+
+import re
+import sys
+import json
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Placeholder for the i-th masked term; an engine may echo it as <g0></g0>.
+PLACEHOLDER = "<g{}/>"
+_PLACEHOLDER_RE = re.compile(r"<g(\d+)\s*/?>(?:</g\1>)?")
+_ANY_PLACEHOLDER_TAG_RE = re.compile(r"</?g\d+\s*/?>")
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex source string matching any of *terms*, longest first."""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True  # end-of-term marker
+
+    def render(node: dict) -> str:
+        terminal = "" in node
+        branches = [
+            re.escape(ch) + render(child)
+            for ch, child in sorted(node.items())
+            if ch != ""
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: try the longer continuation before stopping here.
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+class CompiledGlossary:
+    """Glossary mapping compiled into a one-pass longest-match matcher."""
+
+    def __init__(self, glossary: Dict[str, str]):
+        self.mapping: Dict[str, str] = {k: v for k, v in glossary.items() if k}
+        self._pattern: Optional[Pattern[str]] = (
+            re.compile(_trie_pattern(self.mapping)) if self.mapping else None
+        )
+        self._finder: Optional[Pattern[str]] = None  # overlapping lookup, built on first use
+        # Content hash; changes whenever any term or translation changes.
+        self.fingerprint = hashlib.sha256(
+            json.dumps(sorted(self.mapping.items()), ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+        # Rough resident size (strings + dict + compiled regex ≈ 10× its source).
+        self.nbytes = sys.getsizeof(self.mapping) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in self.mapping.items()
+        ) + (10 * len(self._pattern.pattern) if self._pattern is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def apply(self, text: str) -> str:
+        """Replace every glossary term in *text* in one left-to-right scan."""
+        if self._pattern is None:
+            return text
+        mapping = self.mapping
+        return self._pattern.sub(lambda m: mapping[m.group(0)], text)
+
+    def mask(self, text: str) -> Tuple[str, List[str]]:
+        """Replace every term :meth:`apply` would replace with a placeholder tag.
+
+        Returns the masked text and the target for each placeholder number.
+        Terms inside markup (attribute values) are substituted as by
+        :meth:`apply`, since a tag cannot go there.
+        """
+        if self._pattern is None:
+            return text, []
+        mapping = self.mapping
+        targets: List[str] = []
+        tag_starts: List[int] = []
+        tag_ends: List[int] = []
+        if "<" in text:
+            for m in _TAG_RE.finditer(text):
+                tag_starts.append(m.start())
+                tag_ends.append(m.end())
+
+        def sub(m: "re.Match[str]") -> str:
+            target = mapping[m.group(0)]
+            i = bisect.bisect_right(tag_starts, m.start()) - 1
+            if i >= 0 and m.start() < tag_ends[i]:
+                return target
+            targets.append(target)
+            return PLACEHOLDER.format(len(targets) - 1)
+
+        return self._pattern.sub(sub, text), targets
+
+    def find(self, text: str) -> List[Tuple[str, Tuple[int, int]]]:
+        """(term, span) of every match :meth:`apply` would replace, in order."""
+        if self._pattern is None:
+            return []
+        return [(m.group(0), m.span()) for m in self._pattern.finditer(text)]
+
+    def terms_in(self, text: str) -> Dict[str, str]:
+        """Entries whose term occurs in *text*, in order of first occurrence.
+
+        Unlike :meth:`apply` this also reports terms nested inside a longer
+        match (the longest term starting at every position).
+        """
+        if self._pattern is None:
+            return {}
+        if self._finder is None:
+            self._finder = re.compile("(?=(" + self._pattern.pattern + "))")
+        mapping = self.mapping
+        return {m.group(1): mapping[m.group(1)] for m in self._finder.finditer(text)}
+
+
+def has_placeholders(text: str) -> bool:
+    """True if *text* already contains something :func:`unmask` would treat as ours."""
+    return _ANY_PLACEHOLDER_TAG_RE.search(text) is not None
+
+
+def unmask(text: str, targets: List[str]) -> Optional[str]:
+    """Replace the placeholders in *text* with *targets*.
+
+    Returns ``None`` unless every placeholder comes back exactly once (the
+    engine dropped or duplicated one) and no placeholder tag is left over
+    (e.g. it wrapped words in ``<g0>…</g0>``); the caller then falls back to
+    translating the unmasked text.
+    """
+    if not targets:
+        return text
+    seen: List[int] = []
+
+    def sub(m: "re.Match[str]") -> str:
+        i = int(m.group(1))
+        if i >= len(targets):
+            return m.group(0)
+        seen.append(i)
+        return targets[i]
+
+    restored = _PLACEHOLDER_RE.sub(sub, text)
+    if sorted(seen) != list(range(len(targets))) or _ANY_PLACEHOLDER_TAG_RE.search(restored):
+        return None
+    return restored
@@ -0,0 +1,125 @@
+# glossary_metrics.py
+# Deterministic glossary adherence / support / consistency scores (no LLM call)
+
+"""
+Computes the glossary-related fields of the confidence breakdown locally:
+
+* ``terminology_adherence`` – share of glossary-term occurrences in the source
+  whose Dutch target occurs (as often) in the translation
+* ``glossary_support`` – share of distinct glossary entries used in the source
+  whose target appears in the translation at all
+* ``consistency`` – share of repeated source units rendered the same way: a
+  glossary term used several times must get its target every time, and
+  identical source segments must get identical translations
+
+Source terms are found exactly as :meth:`CompiledGlossary.apply` sees them
+(longest match, non-overlapping).  Targets are searched case-insensitively and
+paired with source occurrences left to right, so each target occurrence is
+credited once.
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from glossary_matcher import CompiledGlossary
+
+
+class TermMatch(NamedTuple):
+    term: str
+    target: str
+    source_span: Tuple[int, int]
+    target_span: Optional[Tuple[int, int]]  # None when the target is missing
+
+
+class TerminologyCheck:
+    """Result of :func:`check_terminology`."""
+
+    def __init__(
+        self,
+        matched: List[TermMatch],
+        missed: List[TermMatch],
+        terminology_adherence: float,
+        glossary_support: float,
+        consistency: float,
+    ):
+        self.matched = matched
+        self.missed = missed
+        self.terminology_adherence = terminology_adherence
+        self.glossary_support = glossary_support
+        self.consistency = consistency
+
+    def scores(self) -> Dict[str, float]:
+        return {
+            "terminology_adherence": self.terminology_adherence,
+            "glossary_support": self.glossary_support,
+            "consistency": self.consistency,
+        }
+
+
+def check_terminology(
+    src_en: str,
+    tgt_nl: str,
+    glossary: CompiledGlossary,
+    segments: Optional[Sequence[Tuple[str, str]]] = None,
+) -> TerminologyCheck:
+    """Match glossary terms in *src_en* against *tgt_nl*.
+
+    *segments* are the (source, target) pairs of a segmented document; they
+    add repeated-segment consistency.  Spans index into *src_en* / *tgt_nl*.
+    """
+    occurrences = [
+        (term, glossary.mapping[term], span)
+        for term, span in glossary.find(src_en)
+        if glossary.mapping[term]
+    ]
+
+    # Target occurrences per distinct target, consumed in order.
+    target_spans: Dict[str, List[Tuple[int, int]]] = {}
+    for target in {t for _, t, _ in occurrences}:
+        target_spans[target] = [
+            m.span() for m in re.finditer(re.escape(target), tgt_nl, re.IGNORECASE)
+        ]
+    used: Counter = Counter()
+
+    matched: List[TermMatch] = []
+    missed: List[TermMatch] = []
+    for term, target, span in occurrences:
+        spans = target_spans[target]
+        if used[target] < len(spans):
+            matched.append(TermMatch(term, target, span, spans[used[target]]))
+            used[target] += 1
+        else:
+            missed.append(TermMatch(term, target, span, None))
+
+    per_term: Dict[str, List[bool]] = defaultdict(list)
+    for m in matched:
+        per_term[m.term].append(True)
+    for m in missed:
+        per_term[m.term].append(False)
+
+    total = len(occurrences)
+    adherence = len(matched) / total if total else 1.0
+    support = (
+        sum(any(hits) for hits in per_term.values()) / len(per_term) if per_term else 1.0
+    )
+
+    # Repeated units: glossary terms used more than once, identical segments.
+    units = [all(hits) for hits in per_term.values() if len(hits) > 1]
+    if segments:
+        renderings: Dict[str, set] = defaultdict(set)
+        counts: Counter = Counter()
+        for src, tgt in segments:
+            key = " ".join(src.split())
+            counts[key] += 1
+            renderings[key].add(" ".join(tgt.split()))
+        units += [len(renderings[k]) == 1 for k, n in counts.items() if n > 1]
+    consistency = sum(units) / len(units) if units else 1.0
+
+    return TerminologyCheck(
+        matched,
+        missed,
+        round(adherence, 2),
+        round(support, 2),
+        round(consistency, 2),
+    )
@@ -0,0 +1,366 @@
+# glossary_store.py
+# Versioned, hot-reloadable glossaries selected per request by id
+
+"""
+Glossaries are addressed by a ``glossary_id`` and loaded from (first match wins):
+
+* ``GLOSSARY_DB`` – SQLite table ``glossary_terms(glossary_id, source, target)``
+* ``GLOSSARY_DIR/<id>.csv``, ``.tsv`` or ``.json`` – one file per glossary
+* the built-in ``glossary.GLOSSARY`` for the id ``default``
+
+Each load is compiled into a :class:`CompiledGlossary`; its content fingerprint
+is the glossary's version id.  Sources are re-checked at most every
+``reload_seconds`` (0 = only on an explicit :meth:`GlossaryStore.reload`).
+A changed source is recompiled in a worker thread and swapped in with a
+single assignment, so requests that already hold the previous version
+finish with it.  Compiled glossaries live in an LRU bounded
+by an approximate memory budget; the default glossary is never evicted.
+"""
+
+import os
+import re
+import csv
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from glossary_matcher import CompiledGlossary
+
+logger = logging.getLogger("translation-app.glossary")
+
+DEFAULT_GLOSSARY_ID = "default"
+_VALID_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+_FILE_EXTENSIONS = (".csv", ".tsv", ".json")
+_HEADER_ROWS = {("source", "target"), ("en", "nl"), ("english", "dutch"), ("term", "translation")}
+
+
+# ─── Loaders ────────────────────────────────────────────────────────────────
+def read_glossary_file(path: str) -> Dict[str, str]:
+    """Read a CSV/TSV (source, target columns) or JSON glossary file.
+
+    JSON may be an object ``{"source": "target"}`` or a list of
+    ``{"source": ..., "target": ...}`` records.  A CSV/TSV header row and
+    lines starting with ``#`` are skipped.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if ext == ".json":
+            data = json.load(f)
+            if isinstance(data, dict):
+                return {str(k): str(v) for k, v in data.items()}
+            return {str(row["source"]): str(row["target"]) for row in data}
+
+        mapping: Dict[str, str] = {}
+        for i, row in enumerate(csv.reader(f, delimiter="\t" if ext == ".tsv" else ",")):
+            if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                continue
+            if len(row) < 2:
+                raise ValueError(f"{path}:{i + 1}: expected source and target columns")
+            if i == 0 and (row[0].strip().lower(), row[1].strip().lower()) in _HEADER_ROWS:
+                continue
+            mapping[row[0].strip()] = row[1].strip()
+        return mapping
+
+
+class _SQLiteSource:
+    """Read-only view of the ``glossary_terms`` table; calls run in a worker thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reopen()
+        # A connection must not be used across fork() (preloaded gunicorn workers).
+        os.register_at_fork(after_in_child=self._reopen)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS glossary_terms ("
+            " glossary_id TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,"
+            " PRIMARY KEY (glossary_id, source))"
+        )
+        self._conn.commit()
+
+    def _reopen(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT glossary_id FROM glossary_terms").fetchall()
+        return [r[0] for r in rows]
+
+    def has(self, glossary_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM glossary_terms WHERE glossary_id = ? LIMIT 1", (glossary_id,)
+            ).fetchone() is not None
+
+    def load(self, glossary_id: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, target FROM glossary_terms WHERE glossary_id = ?", (glossary_id,)
+            ).fetchall()
+        return dict(rows) if rows else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ─── Store ──────────────────────────────────────────────────────────────────
+class _Entry:
+    def __init__(self, glossary: CompiledGlossary, source: str, signature: Any):
+        self.glossary = glossary
+        self.source = source
+        self.signature = signature
+        self.loaded_at = time.time()
+        self.checked = time.monotonic()
+
+
+class GlossaryStore:
+    """Per-id compiled glossaries with hot reload and a memory-bounded cache."""
+
+    def __init__(
+        self,
+        builtin: Optional[Dict[str, str]] = None,
+        directory: Optional[str] = None,
+        sqlite_path: Optional[str] = None,
+        memory_budget_bytes: int = 256 << 20,
+        reload_seconds: float = 5.0,
+    ):
+        self.builtin = builtin
+        self.directory = directory
+        self.memory_budget_bytes = memory_budget_bytes
+        self.reload_seconds = reload_seconds
+        self._db = _SQLiteSource(sqlite_path) if sqlite_path else None
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._loading: Dict[str, "asyncio.Task[CompiledGlossary]"] = {}
+        self._refreshing: Dict[str, "asyncio.Task[None]"] = {}
+        self.bytes_used = 0
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+        # The default glossary is compiled eagerly so the first request is warm.
+        default = self._load_sync(DEFAULT_GLOSSARY_ID)
+        if default is not None:
+            self._install(DEFAULT_GLOSSARY_ID, *default)
+
+    # ── source resolution (worker thread) ──
+    def _file_for(self, glossary_id: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        for ext in _FILE_EXTENSIONS:
+            path = os.path.join(self.directory, glossary_id + ext)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def _signature(self, glossary_id: str) -> Tuple[str, Any]:
+        """(source description, change marker) of where *glossary_id* lives now."""
+        if self._db is not None:
+            version = self._db.data_version()
+            cached = self._entries.get(glossary_id)
+            if cached is not None and cached.source == "sqlite" and cached.signature == version:
+                return "sqlite", version
+            if self._db.has(glossary_id):
+                return "sqlite", version
+        path = self._file_for(glossary_id)
+        if path is not None:
+            st = os.stat(path)
+            return path, (st.st_mtime_ns, st.st_size)
+        if glossary_id == DEFAULT_GLOSSARY_ID and self.builtin is not None:
+            return "builtin", None
+        return "", None
+
+    def _load_sync(self, glossary_id: str) -> Optional[Tuple[CompiledGlossary, str, Any]]:
+        source, signature = self._signature(glossary_id)
+        if source == "sqlite":
+            mapping = self._db.load(glossary_id)  # type: ignore[union-attr]
+        elif source == "builtin":
+            mapping = self.builtin
+        elif source:
+            mapping = read_glossary_file(source)
+        else:
+            return None
+        started = time.perf_counter()
+        compiled = CompiledGlossary(mapping or {})
+        logger.info(
+            "Compiled glossary '%s' from %s: %d terms, version %s, ~%d KiB in %.0f ms",
+            glossary_id, source, len(compiled), compiled.fingerprint,
+            compiled.nbytes >> 10, (time.perf_counter() - started) * 1e3,
+        )
+        return compiled, source, signature
+
+    # ── cache ──
+    def _install(self, glossary_id: str, glossary: CompiledGlossary, source: str, signature: Any) -> None:
+        old = self._entries.get(glossary_id)
+        if old is not None:
+            self.bytes_used -= old.glossary.nbytes
+        self._entries[glossary_id] = _Entry(glossary, source, signature)  # atomic swap
+        self._entries.move_to_end(glossary_id)
+        self.bytes_used += glossary.nbytes
+        self.loads += 1
+
+        for victim in list(self._entries):
+            if self.bytes_used <= self.memory_budget_bytes:
+                break
+            if victim in (glossary_id, DEFAULT_GLOSSARY_ID):
+                continue
+            self.bytes_used -= self._entries.pop(victim).glossary.nbytes
+            self.evictions += 1
+            logger.info("Evicted glossary '%s' (memory budget)", victim)
+
+    async def _compile(self, glossary_id: str) -> CompiledGlossary:
+        try:
+            loaded = await asyncio.to_thread(self._load_sync, glossary_id)
+        except (OSError, ValueError, KeyError, TypeError, csv.Error, sqlite3.Error) as exc:
+            logger.error("Cannot load glossary '%s': %s", glossary_id, exc)
+            raise HTTPException(
+                status_code=500, detail=f"Glossary '{glossary_id}' could not be loaded"
+            ) from exc
+        if loaded is None:
+            raise HTTPException(status_code=404, detail=f"Unknown glossary '{glossary_id}'")
+
+        glossary, source, signature = loaded
+        current = self._entries.get(glossary_id)
+        if current is not None and current.glossary.fingerprint == glossary.fingerprint:
+            # Source touched but content unchanged: keep the instance in use.
+            current.source, current.signature = source, signature
+            return current.glossary
+        self._install(glossary_id, glossary, source, signature)
+        return glossary
+
+    async def _load(self, glossary_id: str) -> CompiledGlossary:
+        """Load and install *glossary_id*; concurrent callers share one compile."""
+        task = self._loading.get(glossary_id)
+        if task is None:
+            task = asyncio.ensure_future(self._compile(glossary_id))
+            self._loading[glossary_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(glossary_id, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, glossary_id: str, entry: _Entry) -> None:
+        """Recompile *glossary_id* if its source changed; keep serving the old one on error."""
+        try:
+            source, signature = await asyncio.to_thread(self._signature, glossary_id)
+            if (source, signature) == (entry.source, entry.signature):
+                return
+            previous = entry.glossary.fingerprint
+            glossary = await self._load(glossary_id)
+            if glossary.fingerprint != previous:
+                self.reloads += 1
+                logger.info(
+                    "Glossary '%s' reloaded: version %s → %s",
+                    glossary_id, previous, glossary.fingerprint,
+                )
+        except HTTPException as exc:
+            logger.warning(
+                "Glossary '%s' reload failed (%s); keeping version %s",
+                glossary_id, exc.detail, entry.glossary.fingerprint,
+            )
+
+    # ── public API ──
+    @property
+    def default(self) -> CompiledGlossary:
+        entry = self._entries.get(DEFAULT_GLOSSARY_ID)
+        return entry.glossary if entry is not None else CompiledGlossary({})
+
+    async def get(self, glossary_id: Optional[str] = None) -> CompiledGlossary:
+        """Return the current compiled version of *glossary_id* (default glossary if None)."""
+        glossary_id = glossary_id or DEFAULT_GLOSSARY_ID
+        if not _VALID_ID.match(glossary_id):
+            raise HTTPException(status_code=400, detail="Invalid glossary id")
+
+        entry = self._entries.get(glossary_id)
+        if entry is None:
+            return await self._load(glossary_id)
+
+        self._entries.move_to_end(glossary_id)
+        now = time.monotonic()
+        if self.reload_seconds > 0 and now - entry.checked >= self.reload_seconds:
+            entry.checked = now
+            # Serve the current version; a changed source is swapped in when compiled.
+            task = asyncio.get_running_loop().create_task(self._refresh(glossary_id, entry))
+            self._refreshing[glossary_id] = task
+            task.add_done_callback(lambda t: self._refresh_done(glossary_id, t))
+        return entry.glossary
+
+    def _refresh_done(self, glossary_id: str, task: "asyncio.Task[None]") -> None:
+        if self._refreshing.get(glossary_id) is task:
+            del self._refreshing[glossary_id]
+
+    async def reload(self, glossary_id: Optional[str] = None) -> CompiledGlossary:
+        """Re-read *glossary_id* from its source now and swap it in if it changed."""
+        glossary_id = glossary_id or DEFAULT_GLOSSARY_ID
+        if not _VALID_ID.match(glossary_id):
+            raise HTTPException(status_code=400, detail="Invalid glossary id")
+        entry = self._entries.get(glossary_id)
+        glossary = await self._load(glossary_id)
+        if entry is None or glossary.fingerprint == entry.glossary.fingerprint:
+            return glossary  # first load, or same content: the instance in use is kept
+        self.reloads += 1
+        logger.info(
+            "Glossary '%s' reloaded: version %s → %s",
+            glossary_id, entry.glossary.fingerprint, glossary.fingerprint,
+        )
+        return glossary
+
+    def available(self) -> List[str]:
+        """Ids that can be requested (loaded or not)."""
+        ids = set(self._entries)
+        if self.builtin is not None:
+            ids.add(DEFAULT_GLOSSARY_ID)
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in _FILE_EXTENSIONS and _VALID_ID.match(stem):
+                    ids.add(stem)
+        if self._db is not None:
+            ids.update(self._db.ids())
+        return sorted(ids)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Version and size of every loaded glossary, most recently used last."""
+        return [
+            {
+                "glossary_id": gid,
+                "version": e.glossary.fingerprint,
+                "terms": len(e.glossary),
+                "source": e.source,
+                "loaded_at": e.loaded_at,
+                "approx_bytes": e.glossary.nbytes,
+            }
+            for gid, e in self._entries.items()
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+        }
+
+    async def stop(self) -> None:
+        """Cancel background refreshes (shutdown)."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
@@ -0,0 +1,73 @@
+# gunicorn.conf.py
+# Production entry point: several uvicorn workers forked from one preloaded master
+
+"""
+    gunicorn -c gunicorn.conf.py                                  # main:app
+    APP_MODULE=backtranslation:app BIND=0.0.0.0:8001 gunicorn -c gunicorn.conf.py
+
+The app is imported and warmed up (``main.warm_up``: sentence_transformers /
+torch, the evaluator SDK, the similarity model with SIMILARITY_PRELOAD) once
+in the master, then the workers are forked.  Model weights, imported modules
+and the compiled default glossary are shared copy-on-write instead of being
+loaded once per worker; see ``python -m benchmarks.bench_startup``.
+
+Per-process state stays per worker: the pooled HTTP client, the scoring
+queue, the in-process translation-memory tier and in-flight coalescing.
+SQLite connections are reopened in each worker after the fork.
+
+``python main.py`` remains the single-process development server (reload).
+"""
+
+import os
+import sys
+import glob
+import tempfile
+
+wsgi_app = os.getenv("APP_MODULE", "main:app")
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+worker_class = "uvicorn_worker.UvicornWorker"
+# PRELOAD_APP=0 imports and warms up the app in every worker instead (for comparison).
+preload_app = os.getenv("PRELOAD_APP", "1").lower() not in ("0", "false", "no")
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))  # first model load can be slow
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+# /metrics must add up all workers; the directory has to be set before
+# prometheus_client is imported and emptied on every start.
+if workers > 1 and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+    for stale in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        os.remove(stale)
+
+# The fuzzy TM index is single-writer: workers appending to it would corrupt it.
+if workers > 1 and os.getenv("FUZZY_TM_DIR"):
+    raise RuntimeError("FUZZY_TM_DIR needs a single worker (WEB_CONCURRENCY=1)")
+
+
+def _warm_up(log) -> None:
+    module = sys.modules.get(wsgi_app.split(":")[0])
+    if module is not None and hasattr(module, "warm_up"):
+        log.info("Warming up %s in pid %d", module.__name__, os.getpid())
+        module.warm_up()
+
+
+def on_starting(server):
+    if server.cfg.preload_app:  # the app was imported in the master just before this hook
+        _warm_up(server.log)
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _warm_up(worker.log)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
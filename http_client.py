@@ -0,0 +1,93 @@
+# http_client.py
+# One long-lived, pooled httpx client per process for upstream calls (DeepL)
+
+import os
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+from dotenv import load_dotenv
+
+logger = logging.getLogger("translation-app.http")
+
+load_dotenv()  # settings below are read at import time
+
+# ─── Pool configuration (environment overridable) ───────────────────────────
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1").lower() not in ("0", "false", "no")
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  (optional: pip install "httpx[http2]")
+    except ImportError:
+        return False
+    return True
+
+
+def build_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Create a pooled client from the configured limits and timeouts."""
+    http2 = HTTP2_ENABLED and transport is None and _http2_available()
+    if HTTP2_ENABLED and not http2 and transport is None:
+        logger.warning("HTTP/2 requested but 'h2' is not installed – using HTTP/1.1")
+    logger.info(
+        "Opening pooled HTTP client (max_connections=%d, keepalive=%d, http2=%s)",
+        HTTP_MAX_CONNECTIONS,
+        HTTP_MAX_KEEPALIVE,
+        http2,
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            HTTP_READ_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            pool=HTTP_POOL_TIMEOUT,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_client()
+    return _client
+
+
+def set_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Install an externally built client (e.g. one with a mock transport)."""
+    global _client
+    _client = client
+
+
+async def close_client() -> None:
+    """Close the process-wide client, if one is open."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Closed pooled HTTP client")
+    _client = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """FastAPI lifespan: open the pooled client at start-up, close on shutdown."""
+    get_client()
+    try:
+        yield
+    finally:
+        await close_client()
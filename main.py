@@ -109,20 +109,37 @@
 
 # ─── Imports ────────────────────────────────────────────────────────────────
 import os
+import re
 import json
+import time
+import asyncio
 import logging
-from typing import Dict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Union
+from urllib.parse import urlencode
 
-import httpx
 import truststore
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-# OpenAI SDK v1 (sync & async variants)
-from openai import AsyncOpenAI, AsyncAzureOpenAI
-
+import http_client
+import telemetry
+from batch_scoring import ALL_FIELDS, MODEL_FIELDS, BatchScorer, ScoreBatcher, ScoreItem
+from backtranslation import translate_to_english
+from cosineSimilarity import ModelUnavailable, SimilarityBatcher, SimilarityScorer
+from fuzzy_tm import EmbeddingIndex, FuzzyMatch
 from glossary import GLOSSARY
+from glossary_matcher import PLACEHOLDER, CompiledGlossary, has_placeholders, unmask
+from glossary_metrics import check_terminology
+from glossary_store import GlossaryStore
+from resilience import RetryableError, UpstreamUnavailable, get_guard, parse_retry_after
+from scoring_jobs import InvalidCallback, QueueFull, ScoringQueue, check_callback_url
+from segmentation import Piece, reassemble, segment_document
+from singleflight import SingleFlight
+from translation_backends import TRANSLATION_BACKEND, TranslationBackend, get_backend
+from translation_memory import TranslationMemory, make_key, normalize_text
 
 truststore.inject_into_ssl()
 
@@ -139,7 +156,7 @@ logger.info("Starting translation service …")
 load_dotenv()
 
 DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")
-if not DEEPL_API_KEY:
+if not DEEPL_API_KEY and TRANSLATION_BACKEND != "marian":
     logger.critical("DEEPL_API_KEY not set; aborting start‑up")
     raise RuntimeError("DEEPL_API_KEY not set")
 
@@ -154,225 +171,1320 @@ AZURE_OPENAI_API_VERSION = os.getenv(
     "AZURE_OPENAI_CHAT_DEPLOYMENT_VERSION", "2024-05-01-preview"
 )
 
-# Instantiate async client
+# Evaluator backend; the async client is built on first use (see _evaluator_client)
+_ai_client = None
 if OPENAI_API_KEY:
-    _ai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
     _evaluator_model = "gpt-4o-mini"  # change if desired
     logger.info("Using OpenAI backend for confidence scoring")
 elif AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_DEPLOYMENT:
-    _ai_client = AsyncAzureOpenAI(
-        api_key=AZURE_OPENAI_API_KEY,
-        azure_endpoint=AZURE_OPENAI_ENDPOINT,
-        api_version=AZURE_OPENAI_API_VERSION,
-    )
     _evaluator_model = AZURE_OPENAI_DEPLOYMENT
     logger.info(
         "Using Azure OpenAI backend for confidence scoring (deployment: %s)",
         _evaluator_model,
     )
 else:
-    _ai_client = None
     _evaluator_model = None
     logger.warning(
         "No OpenAI or Azure OpenAI credentials found – confidence scoring will be disabled"
     )
 
-DEEPL_ENDPOINT = "https://api.deepl.com/v2/translate"
+
+def _evaluator_client():
+    """The async OpenAI / Azure OpenAI client, or ``None`` without credentials.
+
+    The SDK takes ~0.6 s to import, so it is imported here on first use (or
+    by :func:`warm_up`) rather than when the module is loaded.
+    """
+    global _ai_client
+    if _ai_client is None and _evaluator_model is not None:
+        from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+        # Retries are handled by the resilience layer (see _llm_guard), not the SDK.
+        if OPENAI_API_KEY:
+            _ai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+        else:
+            _ai_client = AsyncAzureOpenAI(
+                api_key=AZURE_OPENAI_API_KEY,
+                azure_endpoint=AZURE_OPENAI_ENDPOINT,
+                api_version=AZURE_OPENAI_API_VERSION,
+                max_retries=0,
+            )
+    return _ai_client
+
+# Parallel upstream calls per batch (DeepL endpoint/limits: translation_backends.py)
+DEEPL_BATCH_CONCURRENCY = int(os.getenv("DEEPL_BATCH_CONCURRENCY", "4"))
+
+# Rate limit / retry / circuit breaker for the evaluator (LLM_* env vars)
+_llm_guard = get_guard("llm")
+
+# Translation memory (exact match); set TM_SQLITE_PATH to persist across restarts
+TM_ENABLED = os.getenv("TM_ENABLED", "1").lower() not in ("0", "false", "no")
+TM_MAX_ENTRIES = int(os.getenv("TM_MAX_ENTRIES", "10000"))
+TM_TTL_SECONDS = float(os.getenv("TM_TTL_SECONDS", "86400"))
+TM_SQLITE_PATH = os.getenv("TM_SQLITE_PATH")
+
+# Fuzzy translation memory (embedding index on disk); off unless FUZZY_TM_DIR is set.
+# "suggest" still translates and only reports the match (pre-fill).  "return"
+# serves a stored translation above the threshold instead of calling DeepL;
+# opt-in only: near-identical embeddings can differ in meaning ("is recommended"
+# vs. "is not recommended") and only numbers are checked before reuse.
+FUZZY_TM_DIR = os.getenv("FUZZY_TM_DIR")
+FUZZY_TM_THRESHOLD = float(os.getenv("FUZZY_TM_THRESHOLD", "0.92"))
+FUZZY_TM_MODE = os.getenv("FUZZY_TM_MODE", "suggest").lower()
+if FUZZY_TM_MODE not in ("return", "suggest"):
+    raise RuntimeError(f"FUZZY_TM_MODE must be return or suggest, not {FUZZY_TM_MODE!r}")
+
+# Background confidence scoring: workers = max LLM scoring calls in flight
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "4"))
+SCORING_QUEUE_SIZE = int(os.getenv("SCORING_QUEUE_SIZE", "1000"))
+SCORING_MAX_JOBS = int(os.getenv("SCORING_MAX_JOBS", "10000"))
+# Hosts callback_url may point to (comma-separated).  Empty: any public host,
+# never loopback or private addresses.
+CALLBACK_ALLOWED_HOSTS = [
+    h.strip() for h in os.getenv("CALLBACK_ALLOWED_HOSTS", "").split(",") if h.strip()
+]
+
+# What the evaluator is asked for: "llm" (all scores), "hybrid" (accuracy and
+# fluency only; glossary scores computed locally) or "local" (no LLM call).
+SCORING_MODE = os.getenv("SCORING_MODE", "llm").lower()
+if SCORING_MODE not in ("llm", "hybrid", "local"):
+    raise RuntimeError(f"SCORING_MODE must be llm, hybrid or local, not {SCORING_MODE!r}")
+
+# Batched evaluator calls (documents, /translate/batch): pairs and estimated
+# tokens per call.  SCORING_BATCH_WAIT_MS > 0 also merges concurrent
+# single-translation scoring calls (bulk runs, deferred jobs) into batches.
+SCORING_BATCH_ITEMS = int(os.getenv("SCORING_BATCH_ITEMS", "20"))
+SCORING_BATCH_TOKENS = int(os.getenv("SCORING_BATCH_TOKENS", "6000"))
+SCORING_BATCH_WAIT_MS = float(os.getenv("SCORING_BATCH_WAIT_MS", "0"))
+
+# Long documents are segmented, fanned out and reassembled in order
+SEGMENT_THRESHOLD_CHARS = int(os.getenv("SEGMENT_THRESHOLD_CHARS", "5000"))
+SEGMENT_MAX_CHARS = int(os.getenv("SEGMENT_MAX_CHARS", "2000"))
+SEGMENT_FANOUT = int(os.getenv("SEGMENT_FANOUT", "8"))
+SEGMENT_SCORE_CHARS = int(os.getenv("SEGMENT_SCORE_CHARS", "6000"))
+
+# Embedding similarity (kept warm; concurrent requests are micro-batched)
+SIMILARITY_MODEL = os.getenv("SIMILARITY_MODEL", "all-MiniLM-L6-v2")
+SIMILARITY_PRELOAD = os.getenv("SIMILARITY_PRELOAD", "1").lower() not in ("0", "false", "no")
+SIMILARITY_MAX_BATCH_PAIRS = int(os.getenv("SIMILARITY_MAX_BATCH_PAIRS", "256"))
+SIMILARITY_MAX_WAIT_MS = float(os.getenv("SIMILARITY_MAX_WAIT_MS", "5"))
+
+# Round-trip QA pipeline: documents processed concurrently
+ROUNDTRIP_CONCURRENCY = int(os.getenv("ROUNDTRIP_CONCURRENCY", "8"))
+
+# External glossaries (per-request glossary_id); see glossary_store.py
+GLOSSARY_DIR = os.getenv("GLOSSARY_DIR")
+GLOSSARY_DB = os.getenv("GLOSSARY_DB")
+GLOSSARY_CACHE_MB = float(os.getenv("GLOSSARY_CACHE_MB", "256"))
+GLOSSARY_RELOAD_SECONDS = float(os.getenv("GLOSSARY_RELOAD_SECONDS", "5"))
+# Send glossary terms to DeepL as placeholder tags instead of substituted text
+GLOSSARY_MASKING = os.getenv("GLOSSARY_MASKING", "1").lower() not in ("0", "false", "no")
 
 # ─── Helpers ────────────────────────────────────────────────────────────────
 
-def apply_glossary(text: str, glossary: Dict[str, str]) -> str:
-    """Replace glossary terms (longest first) inside *text*."""
-    for en, nl in sorted(glossary.items(), key=lambda x: -len(x[0])):
-        text = text.replace(en, nl)
-    return text
+# Compiled glossaries by id; the built-in GLOSSARY is the "default" one.
+_glossaries = GlossaryStore(
+    GLOSSARY,
+    directory=GLOSSARY_DIR,
+    sqlite_path=GLOSSARY_DB,
+    memory_budget_bytes=int(GLOSSARY_CACHE_MB * (1 << 20)),
+    reload_seconds=GLOSSARY_RELOAD_SECONDS,
+)
+
+
+@telemetry.instrument("apply_glossary")
+def apply_glossary(text: str, glossary: CompiledGlossary) -> str:
+    """Replace glossary terms (longest match first) in a single pass."""
+    return glossary.apply(text)
+
+
+_translation_memory = TranslationMemory(
+    max_entries=TM_MAX_ENTRIES,
+    ttl_seconds=TM_TTL_SECONDS,
+    sqlite_path=TM_SQLITE_PATH,
+)
+
+# Identical requests in flight at the same time share one upstream call.
+_translation_flight = SingleFlight("translate")
+_evaluation_flight = SingleFlight("evaluate")
+
+
+def _scoring_mode(requested: Optional[str] = None) -> str:
+    """Effective scoring mode; without evaluator credentials only "local" works."""
+    if _ai_client is None and _evaluator_model is None:
+        return "local"
+    return requested or SCORING_MODE
+
+
+def _glossary_handling(engine: TranslationBackend) -> str:
+    """How the glossary reaches *engine* (see _protect); part of every cache key."""
+    return "masked" if GLOSSARY_MASKING and engine.keeps_markup else "substituted"
+
+
+def _tm_key(text: str, backend: Optional[str], glossary: CompiledGlossary, mode: str) -> str:
+    """Cache key: source text, language pair, engine, glossary version and handling, evaluator."""
+    engine = get_backend(backend)
+    return make_key(
+        normalize_text(text),
+        "EN-NL",
+        engine.name,
+        glossary.fingerprint,
+        _glossary_handling(engine),
+        _evaluator_model or "none",
+        mode,
+    )
+
+
+_scoring_queue = ScoringQueue(
+    workers=SCORING_WORKERS,
+    max_queued=SCORING_QUEUE_SIZE,
+    max_jobs=SCORING_MAX_JOBS,
+    callback_hosts=CALLBACK_ALLOWED_HOSTS,
+)
+
+
+_similarity = SimilarityBatcher(
+    SimilarityScorer(SIMILARITY_MODEL),
+    max_batch_pairs=SIMILARITY_MAX_BATCH_PAIRS,
+    max_wait_ms=SIMILARITY_MAX_WAIT_MS,
+)
+
+# Embeddings come from the similarity model, so the index is tied to it.
+_fuzzy_tm = EmbeddingIndex(FUZZY_TM_DIR, model_name=SIMILARITY_MODEL) if FUZZY_TM_DIR else None
+
+
+def _fuzzy_tag(backend: Optional[str], glossary: CompiledGlossary) -> str:
+    """Stored translations are only reused for the same engine and glossary version."""
+    engine = get_backend(backend)
+    return f"{engine.name}:{glossary.fingerprint}:{_glossary_handling(engine)}"
+
+
+async def _fuzzy_lookup(texts: List[str], tag: str):
+    """Embeddings of *texts* and the best stored match per text (or ``None``).
+
+    Returns ``(None, [None, …])`` when the index is off or the embedding model
+    cannot be loaded; the fuzzy TM never fails a translation.
+    """
+    if _fuzzy_tm is None or not texts:
+        return None, [None] * len(texts)
+    try:
+        with telemetry.stage("fuzzy_tm"):
+            embeddings = await asyncio.to_thread(_similarity.scorer.encode, texts)
+            matches = await asyncio.to_thread(
+                _fuzzy_tm.lookup_many, embeddings, tag, FUZZY_TM_THRESHOLD
+            )
+    except (OSError, ImportError, ModelUnavailable) as exc:
+        logger.warning("Fuzzy TM lookup skipped: %s", exc)
+        return None, [None] * len(texts)
+    return embeddings, matches
+
+
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _fuzzy_reusable(match: FuzzyMatch, text: str) -> bool:
+    """Serve a stored translation only if every number (dose, count, date) matches.
+
+    "10 mg" and "20 mg" embed almost identically; those matches stay suggestions.
+    """
+    return FUZZY_TM_MODE == "return" and _NUMBER_RE.findall(match.source) == _NUMBER_RE.findall(text)
+
+
+async def _fuzzy_remember(embeddings, texts: List[str], translations: List[str], tag: str) -> None:
+    if _fuzzy_tm is not None and embeddings is not None and texts:
+        await asyncio.to_thread(_fuzzy_tm.add, embeddings, texts, translations, tag)
+
+
+def warm_up() -> None:
+    """Do the slow start-up work now instead of on the first request.
+
+    Imports sentence_transformers/torch and the evaluator SDK and, with
+    SIMILARITY_PRELOAD, loads the similarity model.  gunicorn.conf.py calls
+    this in the master before forking, so every worker shares these pages
+    (and the compiled default glossary) copy-on-write.  A model that cannot
+    be loaded is left to load lazily; it never stops the service starting.
+    """
+    started = time.perf_counter()
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError as exc:
+        logger.warning("sentence_transformers not importable: %s", exc)
+
+    if _evaluator_model is not None:
+        import openai  # noqa: F401
+    if SIMILARITY_PRELOAD:
+        _preload_similarity()
+    logger.info("Warm-up done in %.1f s", time.perf_counter() - started)
+
+
+def _preload_similarity() -> None:
+    logger.info("Loading similarity model %s …", SIMILARITY_MODEL)
+    try:
+        _similarity.scorer.load()
+    except ModelUnavailable as exc:
+        logger.warning("Similarity model not preloaded, will retry on first use: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Already done in preloaded gunicorn workers (warm_up).
+    if SIMILARITY_PRELOAD and not _similarity.scorer.loaded:
+        await asyncio.to_thread(_preload_similarity)
+    async with http_client.lifespan(app):
+        await _scoring_queue.start()
+        try:
+            yield
+        finally:
+            await _scoring_queue.stop()
+            await _glossaries.stop()
+            await _similarity.close()
+            if _score_batcher is not None:
+                await _score_batcher.close()
+    _translation_memory.close()
+    if _fuzzy_tm is not None:
+        _fuzzy_tm.close()
+    _glossaries.close()
 
 
 # ─── FastAPI schemas ────────────────────────────────────────────────────────
-app = FastAPI(title="English → Dutch Translation Service")
+app = FastAPI(title="English → Dutch Translation Service", lifespan=lifespan)
+telemetry.instrument_app(app)  # GET /metrics, per-route request metrics
 
 
 class TranslationRequest(BaseModel):
     text: str
+    # Translation engine ("deepl", "marian", "auto"); defaults to TRANSLATION_BACKEND.
+    backend: Optional[str] = None
+    # Glossary to enforce (see GET /glossaries); defaults to the built-in one.
+    glossary_id: Optional[str] = None
+    # Return the translation immediately and score in the background.
+    async_confidence: bool = False
+    # Optional URL that receives the finished score (implies async_confidence).
+    callback_url: Optional[str] = None
+    # Overrides SCORING_MODE for this request.
+    scoring_mode: Optional[Literal["llm", "hybrid", "local"]] = None
 
 
 class ConfidenceBreakdown(BaseModel):
-    accuracy: float = Field(..., ge=0.0, le=1.0)
-    fluency: float = Field(..., ge=0.0, le=1.0)
+    # Not scored in "local" mode (no evaluator call).
+    accuracy: Optional[float] = Field(None, ge=0.0, le=1.0)
+    fluency: Optional[float] = Field(None, ge=0.0, le=1.0)
     terminology_adherence: float = Field(..., ge=0.0, le=1.0)
     consistency: float = Field(..., ge=0.0, le=1.0)
     glossary_support: float = Field(..., ge=0.0, le=1.0)
     overall: float = Field(..., ge=0.0, le=1.0)
 
 
+class GlossaryTermMatch(BaseModel):
+    term: str
+    target: str
+    source_span: Tuple[int, int]
+    target_span: Optional[Tuple[int, int]] = None
+
+
+class TerminologyReport(BaseModel):
+    matched: List[GlossaryTermMatch]
+    missed: List[GlossaryTermMatch]
+
+
+class FuzzyTMMatch(BaseModel):
+    source: str  # previously translated English segment
+    dutch: str  # its stored translation
+    similarity: float
+    applied: bool  # True if "dutch" above is this stored translation (no DeepL call)
+
+
 class TranslationResponse(BaseModel):
     dutch: str
-    confidence: ConfidenceBreakdown
+    confidence: Optional[ConfidenceBreakdown] = None
+    confidence_job_id: Optional[str] = None
+    cached: bool = False
+    glossary_version: Optional[str] = None
+    terminology: Optional[TerminologyReport] = None
+    tm_match: Optional[FuzzyTMMatch] = None
+
+
+class ConfidenceJobResponse(BaseModel):
+    job_id: str
+    status: str
+    confidence: Optional[ConfidenceBreakdown] = None
+    error: Optional[str] = None
+
+
+class SimilarityPair(BaseModel):
+    text_a: str
+    text_b: str
+
+
+class SimilarityRequest(BaseModel):
+    pairs: List[SimilarityPair] = Field(..., min_length=1)
+
+
+class SimilarityResponse(BaseModel):
+    model: str
+    scores: List[float]
+
+
+class RoundTripRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1)
+    backend: Optional[str] = None
+    glossary_id: Optional[str] = None
+
+
+class RoundTripItem(BaseModel):
+    index: int
+    english: str
+    dutch: Optional[str] = None
+    back_translation: Optional[str] = None
+    similarity: Optional[float] = None
+    error: Optional[str] = None
+
+
+class RoundTripResponse(BaseModel):
+    model: str
+    results: List[RoundTripItem]
+
+
+class BatchTranslationRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1)
+    backend: Optional[str] = None
+    glossary_id: Optional[str] = None
+    # Score every translation; evaluator calls are packed SCORING_BATCH_ITEMS at a time.
+    score: bool = False
+    scoring_mode: Optional[Literal["llm", "hybrid", "local"]] = None
+
+
+class BatchTranslationItem(BaseModel):
+    index: int
+    dutch: Optional[str] = None
+    confidence: Optional[ConfidenceBreakdown] = None
+    error: Optional[str] = None
+    tm_match: Optional[FuzzyTMMatch] = None
+
+
+class BatchTranslationResponse(BaseModel):
+    results: List[BatchTranslationItem]
+
+
+# ─── Machine translation ────────────────────────────────────────────────────
+def _protect(
+    texts: List[str], glossary: CompiledGlossary, engine: TranslationBackend
+) -> Tuple[List[str], List[Optional[List[str]]]]:
+    """Text to send upstream for each of *texts*, plus its masked glossary targets.
+
+    With GLOSSARY_MASKING and an engine that keeps markup, glossary terms go
+    out as placeholder tags: fewer billed characters, and the engine cannot
+    rewrite them.  Otherwise (targets ``None``) the glossary is applied
+    before and after translation.
+    """
+    if _glossary_handling(engine) == "substituted":
+        return [apply_glossary(t, glossary) for t in texts], [None] * len(texts)
+    sent: List[str] = []
+    targets: List[Optional[List[str]]] = []
+    with telemetry.stage("glossary_mask"):
+        for text in texts:
+            if has_placeholders(text):  # would be confused with our own tags
+                sent.append(apply_glossary(text, glossary))
+                targets.append(None)
+            else:
+                masked, found = glossary.mask(text)
+                sent.append(masked)
+                targets.append(found)
+    return sent, targets
+
+
+async def _translate_protected(
+    engine: TranslationBackend,
+    texts: List[str],
+    sent: List[str],
+    targets: List[Optional[List[str]]],
+    glossary: CompiledGlossary,
+) -> List[str]:
+    """Translate *sent* (from :func:`_protect`) in one call and restore the glossary terms.
+
+    A text whose placeholders did not all come back is translated again with
+    the glossary substituted as text.
+    """
+    terms = sum(len(t) for t in targets if t)
+    if terms:
+        # Compared with sending the substituted glossary targets as text.
+        saved = sum(
+            len(target) - len(PLACEHOLDER.format(i))
+            for t in targets if t
+            for i, target in enumerate(t)
+        )
+        telemetry.count_masked(terms, saved)
+        logger.info(
+            "Glossary masking: %d term(s) sent as placeholders, %d characters instead of %d",
+            terms, sum(map(len, sent)), sum(map(len, sent)) + saved,
+        )
+    dutch = await engine.translate(sent, "EN", "NL")
+    with telemetry.stage("glossary_mask"):
+        restored = [
+            apply_glossary(nl, glossary) if found is None else unmask(nl, found)
+            for nl, found in zip(dutch, targets)
+        ]
+    lost = [i for i, r in enumerate(restored) if r is None]
+    if lost:
+        logger.warning("%d text(s) lost glossary placeholders; translating them unmasked", len(lost))
+        telemetry.count_mask_fallbacks(len(lost))
+        retry = await engine.translate([apply_glossary(texts[i], glossary) for i in lost], "EN", "NL")
+        for i, nl in zip(lost, retry):
+            restored[i] = apply_glossary(nl, glossary)
+    return restored  # type: ignore[return-value]
 
 
-# ─── DeepL call ─────────────────────────────────────────────────────────────
-async def translate_to_dutch(text: str) -> str:
-    """Translate English to Dutch, applying glossary before/after."""
+@telemetry.instrument("translate_to_dutch")
+async def translate_to_dutch(
+    text: str,
+    backend: Optional[str] = None,
+    glossary: Optional[CompiledGlossary] = None,
+) -> str:
+    """Translate English to Dutch with the glossary enforced (see _protect)."""
+    if glossary is None:
+        glossary = _glossaries.default
+    engine = get_backend(backend)
     logger.debug("Pre‑processing with glossary …")
-    preprocessed = apply_glossary(text, GLOSSARY)
-
-    headers = {"Authorization": f"DeepL-Auth-Key {DEEPL_API_KEY}"}
-    data = {
-        "text": preprocessed,
-        "source_lang": "EN",
-        "target_lang": "NL",
-        "tag_handling": "html",
-        "preserve_formatting": 1,
+    (sent,), (targets,) = _protect([text], glossary, engine)
+    (dutch,) = await _translation_flight.do(
+        (engine.name, glossary.fingerprint, text),
+        lambda: _translate_protected(engine, [text], [sent], [targets], glossary),
+        characters=len(sent),
+    )
+    return dutch
+
+
+def _pack_batches(
+    texts: List[str], max_texts: int, max_bytes: int
+) -> Tuple[List[List[int]], Dict[int, str]]:
+    """Greedily pack text indices into backend-sized requests.
+
+    Returns the packed index groups plus per-index errors for texts that can
+    never fit into a single request on their own.
+    """
+    batches: List[List[int]] = []
+    errors: Dict[int, str] = {}
+    current: List[int] = []
+    current_bytes = 0
+    for i, text in enumerate(texts):
+        size = len(urlencode({"text": text}).encode()) + 1  # "&" separator
+        if size > max_bytes:
+            errors[i] = "Text exceeds the translation request size limit"
+            continue
+        if current and (len(current) >= max_texts or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(i)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches, errors
+
+
+async def iter_translate_batch_to_dutch(
+    texts: List[str],
+    concurrency: int = DEEPL_BATCH_CONCURRENCY,
+    backend: Optional[str] = None,
+    glossary: Optional[CompiledGlossary] = None,
+) -> AsyncIterator[Tuple[int, Union[str, HTTPException]]]:
+    """Translate many texts in as few upstream calls as possible.
+
+    Yields ``(index, Dutch text or error)`` in input order.  All upstream
+    requests run concurrently; a result is released as soon as it and every
+    result before it are done, so the first texts do not wait for the last.
+    Repeated texts (a disclaimer on every page) are sent once and their
+    translation is yielded for every occurrence.
+    """
+    if glossary is None:
+        glossary = _glossaries.default
+    engine = get_backend(backend)
+    slots: Dict[str, int] = {}
+    slot_of = [slots.setdefault(t, len(slots)) for t in texts]
+    unique = list(slots)
+    sent, targets = _protect(unique, glossary, engine)
+    telemetry.count_deduplicated(
+        "translate", len(texts) - len(unique), sum(len(sent[s]) for s in slot_of) - sum(map(len, sent))
+    )
+    batches, size_errors = _pack_batches(
+        sent, engine.max_texts_per_request, engine.max_request_bytes
+    )
+    ready: Dict[int, Union[str, HTTPException]] = {
+        i: HTTPException(status_code=413, detail=detail) for i, detail in size_errors.items()
     }
 
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run(indices: List[int]) -> List[Union[str, HTTPException]]:
+        async with sem:
+            try:
+                return await _translate_protected(
+                    engine,
+                    [unique[i] for i in indices],
+                    [sent[i] for i in indices],
+                    [targets[i] for i in indices],
+                    glossary,
+                )
+            except HTTPException as exc:
+                return [exc] * len(indices)
+
+    logger.info(
+        "Batch of %d texts (%d distinct) packed into %d %s request(s)",
+        len(texts), len(unique), len(batches), engine.name,
+    )
+    # Packing keeps first-occurrence order and a repeat's slot is never later
+    # than its first occurrence, so awaiting the requests in order releases
+    # results in input order.
+    tasks = [asyncio.ensure_future(run(b)) for b in batches]
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            response = await client.post(DEEPL_ENDPOINT, data=data, headers=headers)
-    except httpx.HTTPError as exc:
-        logger.error("DeepL network error: %s", exc)
-        raise HTTPException(
-            status_code=502, detail="Upstream translation service unavailable"
-        ) from exc
+        next_index = 0
+        for indices, task in zip(batches, tasks):
+            ready.update(zip(indices, await task))
+            while next_index < len(texts) and slot_of[next_index] in ready:
+                yield next_index, ready[slot_of[next_index]]
+                next_index += 1
+        while next_index < len(texts) and slot_of[next_index] in ready:  # oversized texts
+            yield next_index, ready[slot_of[next_index]]
+            next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()  # consumer gave up (e.g. a streaming client disconnected)
 
-    if response.status_code != 200:
-        logger.error("DeepL API error (%s): %s", response.status_code, response.text)
-        raise HTTPException(status_code=500, detail="Translation API error")
 
-    dutch = response.json()["translations"][0]["text"]
-    return apply_glossary(dutch, GLOSSARY)
+@telemetry.instrument("translate_batch_to_dutch")
+async def translate_batch_to_dutch(
+    texts: List[str],
+    concurrency: int = DEEPL_BATCH_CONCURRENCY,
+    backend: Optional[str] = None,
+    glossary: Optional[CompiledGlossary] = None,
+) -> List[Union[str, HTTPException]]:
+    """Translate many texts in as few upstream calls as possible.
+
+    Each slot of the result holds either the Dutch text or the error that
+    prevented it, in the same order as *texts*.
+    """
+    results: List[Union[str, HTTPException]] = [None] * len(texts)  # type: ignore[list-item]
+    async for i, result in iter_translate_batch_to_dutch(texts, concurrency, backend, glossary):
+        results[i] = result
+    return results
+
+
+async def translate_document(
+    text: str,
+    backend: Optional[str] = None,
+    glossary: Optional[CompiledGlossary] = None,
+) -> Tuple[str, List[Tuple[str, str]]]:
+    """Translate a long document segment by segment.
+
+    Returns the reassembled Dutch document plus the (source, target) pairs of
+    the translated segments for scoring.
+    """
+    with telemetry.stage("segmentation"):
+        pieces = segment_document(text, max_chars=SEGMENT_MAX_CHARS)
+    sources = [p.text for p in pieces if p.translatable]
+    logger.info("Document split into %d segment(s)", len(sources))
+
+    results = await translate_batch_to_dutch(
+        sources, concurrency=SEGMENT_FANOUT, backend=backend, glossary=glossary
+    )
+    for r in results:
+        if isinstance(r, HTTPException):
+            raise r
+    with telemetry.stage("segmentation"):
+        dutch = reassemble(pieces, results.__getitem__)
+    return dutch, list(zip(sources, results))
+
+
+# ─── Round-trip QA ──────────────────────────────────────────────────────────
+async def round_trip(
+    text: str,
+    backend: Optional[str] = None,
+    glossary: Optional[CompiledGlossary] = None,
+) -> Tuple[str, str, Optional[float]]:
+    """EN → NL → EN, then embedding similarity of the two English texts.
+
+    The similarity is ``None`` when the embedding model cannot be loaded.
+    """
+    if len(text) > SEGMENT_THRESHOLD_CHARS:
+        dutch, _ = await translate_document(text, backend, glossary)
+    else:
+        dutch = await translate_to_dutch(text, backend, glossary)
+    english = await translate_to_english(dutch, backend)
+    try:
+        with telemetry.stage("similarity"):
+            (similarity,) = await _similarity.score([(text, english)])
+    except ModelUnavailable as exc:
+        logger.warning("Round-trip similarity skipped: %s", exc)
+        similarity = None
+    return dutch, english, similarity
 
 
 # ─── Confidence scorer ──────────────────────────────────────────────────────
-async def evaluate_translation(
-    src_en: str, tgt_nl: str, glossary: Dict[str, str]
-) -> ConfidenceBreakdown:
-    """Score the translation using the chosen LLM backend."""
-    if _ai_client is None:
-        zero = {
-            k: 0.0
-            for k in (
-                "accuracy",
-                "fluency",
-                "terminology_adherence",
-                "consistency",
-                "glossary_support",
+def _zero_confidence() -> ConfidenceBreakdown:
+    return ConfidenceBreakdown(
+        **{k: 0.0 for k in ConfidenceBreakdown.model_fields}
+    )
+
+
+# Prompt design overview (Better Scoring Strategy)
+# ------------------------------------------------
+# 1. Role / instruction prompting
+#    'You are a senior English→Dutch translation evaluator'
+#    – sets a professional-rater perspective.
+#
+# 2. Rubric prompting
+#    One-line definition for each metric (accuracy, fluency, etc.).
+#    – ensures the model knows exactly what to grade.
+#
+# 3. Anchor / penalty prompting
+#    'Start at 1.00, subtract 0.05 per minor issue, 0.15 per major issue.'
+#    – anchors the 0-1 scale and discourages inflated perfect scores.
+#
+# 4. Few-shot calibration (one-shot)
+#    Includes one deliberately bad translation with sub-1.0 scores.
+#    – provides a reference point below perfection.
+#
+# 5. Chain-of-thought suppression
+#    'Think silently; output JSON only.'
+#    – keeps internal reasoning out of the API response.
+#
+# 6. Structured-output / schema prompting
+#    Strict JSON schema with no extra commentary or Markdown.
+#    – guarantees machine-parsable output.
+#
+# The system prompt is a constant so every call shares an identical prefix that
+# the provider can cache; everything request-specific goes in the user message.
+_EVALUATOR_SYSTEM_PROMPT = """\
+You are a senior English to Dutch translation quality evaluator.
+
+Rate the candidate Dutch translation on **five criteria**, each from 0.0 to 1.0:
+1. accuracy ‒ meaning preserved exactly.
+2. fluency ‒ grammatical, natural Dutch.
+3. terminology_adherence ‒ correct medical/brand terms.
+4. consistency ‒ repeated phrases rendered the same.
+5. glossary_support ‒ uses every glossary mapping provided.
+
+Scoring guide:
+• 1.0 = flawless; 0.8 = minor issue; 0.5 = acceptable but notable flaws; 0.2 = major errors; 0.0 = unusable.
+
+After scoring, compute **overall = arithmetic mean** of the five values and round ALL numbers to **two decimals**.
+
+️ Think through each criterion **silently**; do NOT output reasoning.
+️ Respond with **ONLY** the following JSON schema (no markdown, no keys added/omitted):
+
+{
+  "accuracy": <float>,
+  "fluency": <float>,
+  "terminology_adherence": <float>,
+  "consistency": <float>,
+  "glossary_support": <float>,
+  "overall": <float>
+}
+"""
+
+# Serialized size of each full glossary (by version), for the prompt-size log.
+_glossary_json_sizes: Dict[str, int] = {}
+
+
+def _glossary_json_chars(glossary: CompiledGlossary) -> int:
+    size = _glossary_json_sizes.get(glossary.fingerprint)
+    if size is None:
+        size = len(json.dumps(glossary.mapping, ensure_ascii=False))
+        _glossary_json_sizes[glossary.fingerprint] = size
+    return size
+
+
+async def _llm_complete(messages: List[Dict[str, str]]):
+    """One evaluator chat completion through the LLM rate limiter / breaker."""
+    import openai
+
+    client = _evaluator_client()
+
+    async def attempt():
+        try:
+            completion = await client.chat.completions.create(
+                model=_evaluator_model,
+                temperature=0.0,
+                messages=messages,
             )
-        }
-        zero["overall"] = 0.0
-        return ConfidenceBreakdown(**zero)
+        except openai.RateLimitError as exc:
+            telemetry.record_upstream(_llm_guard.name, 429)
+            raise RetryableError(
+                "rate limited",
+                status=429,
+                retry_after=parse_retry_after(exc.response.headers.get("retry-after")),
+            ) from exc
+        except openai.APIStatusError as exc:
+            telemetry.record_upstream(_llm_guard.name, exc.status_code)
+            if exc.status_code >= 500:
+                raise RetryableError(f"HTTP {exc.status_code}", status=exc.status_code) from exc
+            raise
+        except (openai.APIConnectionError, openai.APITimeoutError) as exc:
+            telemetry.record_upstream(_llm_guard.name, "network_error")
+            raise RetryableError(f"network error: {exc}") from exc
+        telemetry.record_upstream(_llm_guard.name, 200)
+        telemetry.count_llm_usage(getattr(completion, "usage", None))
+        return completion
 
-    # system_prompt = (
-    #     "You are a professional English→Dutch translation QA rater. "
-    #     "Score the candidate translation from 0 (very poor) to 1 (excellent) for each criterion, "
-    #     "then compute the mean as the overall score.\n\n"
-    #     "Return ONLY strict JSON like: \n"
-    #     "{\"accuracy\":0.9,\"fluency\":0.85,\"terminology_adherence\":0.8,"
-    #     "\"consistency\":0.9,\"glossary_support\":0.95,\"overall\":0.88}"
-    # )
+    with telemetry.stage("llm_evaluator"):
+        return await _llm_guard.call(attempt)
 
+
+async def _llm_text(messages: List[Dict[str, str]]) -> str:
+    completion = await _llm_complete(messages)
+    return completion.choices[0].message.content
+
+
+_batch_scorer = BatchScorer(
+    _llm_text,
+    max_tokens=SCORING_BATCH_TOKENS,
+    max_items=SCORING_BATCH_ITEMS,
+    concurrency=SEGMENT_FANOUT,
+)
+_score_batcher = (
+    ScoreBatcher(_batch_scorer, max_wait_ms=SCORING_BATCH_WAIT_MS)
+    if SCORING_BATCH_WAIT_MS > 0
+    else None
+)
+
+
+async def _score_with_model(
+    pairs: List[Tuple[str, str]], glossary: CompiledGlossary, mode: str
+) -> List[Dict[str, float]]:
+    """Evaluator scores per (source, candidate), packed into as few calls as fit.
+
+    "llm" mode asks for all criteria (with each item's relevant glossary
+    entries), "hybrid" only for accuracy and fluency.  Items that could not be
+    scored get zeros.
     """
-    Prompt design overview (Better Scoring Strategy)
-    ------------------------------------------------
-    1. Role / instruction prompting
-       'You are a senior English→Dutch translation evaluator'
-       – sets a professional-rater perspective.
-
-    2. Rubric prompting
-       One-line definition for each metric (accuracy, fluency, etc.).
-       – ensures the model knows exactly what to grade.
-
-    3. Anchor / penalty prompting
-       'Start at 1.00, subtract 0.05 per minor issue, 0.15 per major issue.'
-       – anchors the 0-1 scale and discourages inflated perfect scores.
-
-    4. Few-shot calibration (one-shot)
-       Includes one deliberately bad translation with sub-1.0 scores.
-       – provides a reference point below perfection.
-
-    5. Chain-of-thought suppression
-       'Think silently; output JSON only.'
-       – keeps internal reasoning out of the API response.
-
-    6. Structured-output / schema prompting
-       Strict JSON schema with no extra commentary or Markdown.
-       – guarantees machine-parsable output.
-    """
+    fields = ALL_FIELDS if mode == "llm" else MODEL_FIELDS
+    # Repeated pairs are scored once.
+    slots: Dict[Tuple[str, str], int] = {}
+    slot_of = [slots.setdefault(pair, len(slots)) for pair in pairs]
+    telemetry.count_deduplicated(
+        "evaluate",
+        len(pairs) - len(slots),
+        sum(len(s) + len(t) for s, t in pairs) - sum(len(s) + len(t) for s, t in slots),
+    )
+    items = [
+        ScoreItem(src, tgt, glossary.terms_in(src) if mode == "llm" else {})
+        for src, tgt in slots
+    ]
+    if _score_batcher is not None and len(items) == 1:
+        results = [await _score_batcher.score(items[0], fields)]
+    else:
+        results = await _batch_scorer.score(items, fields)
+    results = [r if r is not None else dict.fromkeys(fields, 0.0) for r in results]
+    return [results[s] for s in slot_of]
 
-    system_prompt = """
-    You are a senior English to Dutch translation quality evaluator.
 
-    Rate the candidate Dutch translation on **five criteria**, each from 0.0 to 1.0:
-    1. accuracy ‒ meaning preserved exactly.
-    2. fluency ‒ grammatical, natural Dutch.
-    3. terminology_adherence ‒ correct medical/brand terms.
-    4. consistency ‒ repeated phrases rendered the same.
-    5. glossary_support ‒ uses every glossary mapping provided.
+@telemetry.instrument("evaluate_many")
+async def evaluate_many(
+    pairs: List[Tuple[str, str]], glossary: CompiledGlossary, mode: Optional[str] = None
+) -> List[ConfidenceBreakdown]:
+    """Score independent translations with batched evaluator calls."""
+    mode = _scoring_mode(mode)
+    scores = [
+        {} if mode == "llm" else check_terminology(src, tgt, glossary).scores()
+        for src, tgt in pairs
+    ]
+    if mode != "local":
+        for item, model_scores in zip(scores, await _score_with_model(pairs, glossary, mode)):
+            item.update(model_scores)
+    return [_with_overall(item) for item in scores]
 
-    Scoring guide:
-    • 1.0 = flawless; 0.8 = minor issue; 0.5 = acceptable but notable flaws; 0.2 = major errors; 0.0 = unusable.
 
-    After scoring, compute **overall = arithmetic mean** of the five values and round ALL numbers to **two decimals**.
+def _with_overall(scores: Dict[str, Optional[float]]) -> ConfidenceBreakdown:
+    """Breakdown whose overall is the mean of the scores that were computed."""
+    present = [v for v in scores.values() if v is not None]
+    return ConfidenceBreakdown(**scores, overall=round(sum(present) / len(present), 2))
 
-    ️ Think through each criterion **silently**; do NOT output reasoning.
-    ️ Respond with **ONLY** the following JSON schema (no markdown, no keys added/omitted):
 
-    {
-      "accuracy": <float>,
-      "fluency": <float>,
-      "terminology_adherence": <float>,
-      "consistency": <float>,
-      "glossary_support": <float>,
-      "overall": <float>
-    }
+@telemetry.instrument("evaluate_translation")
+async def evaluate_translation(
+    src_en: str, tgt_nl: str, glossary: CompiledGlossary, mode: Optional[str] = None
+) -> ConfidenceBreakdown:
+    """Score the translation using the chosen LLM backend.
+
+    Concurrent calls for the same pair share one evaluation.
     """
+    mode = _scoring_mode(mode)
+    if mode == "local":
+        return (await evaluate_many([(src_en, tgt_nl)], glossary, mode))[0]
+    return await _evaluation_flight.do(
+        (src_en, tgt_nl, glossary.fingerprint, mode),
+        lambda: _evaluate_translation(src_en, tgt_nl, glossary, mode),
+        characters=len(src_en) + len(tgt_nl),
+    )
 
+
+async def _evaluate_translation(
+    src_en: str, tgt_nl: str, glossary: CompiledGlossary, mode: str
+) -> ConfidenceBreakdown:
+    if mode != "llm" or _score_batcher is not None:
+        return (await evaluate_many([(src_en, tgt_nl)], glossary, mode))[0]
+
+    # system_prompt = (
+    #     "You are a professional English→Dutch translation QA rater. "
+    #     "Score the candidate translation from 0 (very poor) to 1 (excellent) for each criterion, "
+    #     "then compute the mean as the overall score.\n\n"
+    #     "Return ONLY strict JSON like: \n"
+    #     "{\"accuracy\":0.9,\"fluency\":0.85,\"terminology_adherence\":0.8,"
+    #     "\"consistency\":0.9,\"glossary_support\":0.95,\"overall\":0.88}"
+    # )
+
+    # Only the entries whose term occurs in the source are relevant.
+    relevant = glossary.terms_in(src_en)
     user_payload = json.dumps(
         {
             "source_en": src_en,
             "candidate_nl": tgt_nl,
-            "glossary": glossary,
+            "glossary": relevant,
         },
         ensure_ascii=False,
     )
-
-    completion = await _ai_client.chat.completions.create(
-        model=_evaluator_model,
-        temperature=0.0,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_payload},
-        ],
+    sent = len(_EVALUATOR_SYSTEM_PROMPT) + len(user_payload)
+    unfiltered = sent + _glossary_json_chars(glossary) - len(json.dumps(relevant, ensure_ascii=False))
+    logger.info(
+        "Evaluator prompt: %d/%d glossary entries, %d chars instead of %d (-%.0f%%)",
+        len(relevant), len(glossary), sent, unfiltered, 100 * (1 - sent / unfiltered),
     )
 
+    import openai
+
+    try:
+        completion = await _llm_complete(
+            [
+                {"role": "system", "content": _EVALUATOR_SYSTEM_PROMPT},
+                {"role": "user", "content": user_payload},
+            ]
+        )
+    except (UpstreamUnavailable, openai.OpenAIError) as exc:
+        logger.error("Evaluator call failed: %s", exc)
+        return _zero_confidence()
+
     try:
-        scores = json.loads(completion.choices[0].message.content)
-        return ConfidenceBreakdown(**scores)
+        with telemetry.stage("json_validation"):
+            scores = json.loads(completion.choices[0].message.content)
+            return ConfidenceBreakdown(**scores)
     except (ValueError, KeyError) as exc:
         logger.error("Malformed JSON from evaluator: %s", exc)
-        zero = {
-            k: 0.0
-            for k in (
-                "accuracy",
-                "fluency",
-                "terminology_adherence",
-                "consistency",
-                "glossary_support",
+        return _zero_confidence()
+
+
+@telemetry.instrument("evaluate_document")
+async def evaluate_document(
+    pairs: List[Tuple[str, str]], glossary: CompiledGlossary, mode: Optional[str] = None
+) -> ConfidenceBreakdown:
+    """Score segments concurrently; aggregate weighted by source length.
+
+    Consecutive segments are grouped up to SEGMENT_SCORE_CHARS of source text
+    so each evaluator call sees some context without hitting token limits.
+    Locally computed glossary scores cover the whole document at once.
+    """
+    mode = _scoring_mode(mode)
+    if mode == "local":
+        return _with_overall(_document_terminology(pairs, glossary).scores())
+    if not pairs:  # markup only: nothing for the evaluator to score
+        if mode == "hybrid":
+            return _with_overall(_document_terminology(pairs, glossary).scores())
+        return _zero_confidence()
+
+    groups: List[List[Tuple[str, str]]] = []
+    size = 0
+    for src, tgt in pairs:
+        if not groups or size + len(src) > SEGMENT_SCORE_CHARS:
+            groups.append([])
+            size = 0
+        groups[-1].append((src, tgt))
+        size += len(src)
+
+    # Groups are packed several per evaluator call (SCORING_BATCH_ITEMS/TOKENS).
+    scores = await _score_with_model(
+        [("\n".join(s for s, _ in g), "\n".join(t for _, t in g)) for g in groups],
+        glossary,
+        mode,
+    )
+    weights = [sum(len(s) for s, _ in g) for g in groups]
+    total = sum(weights) or 1
+    weighted = {
+        field: round(sum(sc[field] * w for sc, w in zip(scores, weights)) / total, 2)
+        for field in scores[0]
+    }
+    if mode == "hybrid":
+        weighted = {**_document_terminology(pairs, glossary).scores(), **weighted}
+    return _with_overall(weighted)
+
+
+def _document_terminology(pairs: List[Tuple[str, str]], glossary: CompiledGlossary):
+    return check_terminology(
+        "\n".join(s for s, _ in pairs), "\n".join(t for _, t in pairs), glossary, segments=pairs
+    )
+
+
+def _terminology_report(
+    text: str, dutch: str, glossary: CompiledGlossary, segments: Optional[List[Tuple[str, str]]]
+) -> TerminologyReport:
+    check = check_terminology(text, dutch, glossary, segments)
+    return TerminologyReport(
+        matched=[GlossaryTermMatch(**m._asdict()) for m in check.matched],
+        missed=[GlossaryTermMatch(**m._asdict()) for m in check.missed],
+    )
+
+
+def _scoring_job(
+    text: str,
+    dutch: str,
+    segments: Optional[List[Tuple[str, str]]],
+    glossary: CompiledGlossary,
+    mode: str,
+    tm_key: Optional[str],
+    terminology: TerminologyReport,
+) -> Callable[[], Awaitable[Dict[str, float]]]:
+    """Coroutine function that scores one translation and stores it in the TM."""
+
+    async def score() -> Dict[str, float]:
+        if segments is not None:
+            confidence = await evaluate_document(segments, glossary, mode)
+        else:
+            confidence = await evaluate_translation(text, dutch, glossary, mode)
+        scores = confidence.model_dump()
+        if tm_key is not None:
+            await _translation_memory.put(
+                tm_key,
+                {"dutch": dutch, "confidence": scores, "terminology": terminology.model_dump()},
             )
-        }
-        zero["overall"] = 0.0
-        return ConfidenceBreakdown(**zero)
+        return scores
+
+    return score
+
+
+def _tm_match(match: Optional[FuzzyMatch], applied: bool) -> Optional[FuzzyTMMatch]:
+    if match is None:
+        return None
+    return FuzzyTMMatch(
+        source=match.source, dutch=match.dutch, similarity=match.similarity, applied=applied
+    )
+
+
+def _scoring_queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Confidence scoring queue is full",
+        headers={"Retry-After": "5"},
+    )
+
+
+def _check_callback(url: Optional[str]) -> None:
+    """422 for a callback_url the server must not call (see scoring_jobs)."""
+    if url:
+        try:
+            check_callback_url(url, _scoring_queue.callback_hosts)
+        except InvalidCallback as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
 # ─── API route ──────────────────────────────────────────────────────────────
 @app.post("/translate", response_model=TranslationResponse)
 async def translate(req: TranslationRequest):
     logger.info("/translate called (payload len=%d)", len(req.text))
+    _check_callback(req.callback_url)
+    # Resolved once: the whole request uses this version even if a reload lands.
+    glossary = await _glossaries.get(req.glossary_id)
+    mode = _scoring_mode(req.scoring_mode)
+
+    key = _tm_key(req.text, req.backend, glossary, mode) if TM_ENABLED else None
+    if key is not None:
+        hit = await _translation_memory.get(key)
+        if hit is not None:
+            logger.info("Translation memory hit")
+            return TranslationResponse(**hit, cached=True, glossary_version=glossary.fingerprint)
 
-    dutch_text = await translate_to_dutch(req.text)
+    deferred = req.async_confidence or bool(req.callback_url)
+    if deferred and _scoring_queue.full():
+        # Shed load before paying for the DeepL call.
+        raise _scoring_queue_full()
+
+    match, applied = None, False
+    if len(req.text) > SEGMENT_THRESHOLD_CHARS:
+        dutch_text, segments = await translate_document(req.text, req.backend, glossary)
+    else:
+        segments = None
+        tag = _fuzzy_tag(req.backend, glossary)
+        embeddings, (match,) = await _fuzzy_lookup([req.text], tag)
+        applied = match is not None and _fuzzy_reusable(match, req.text)
+        if applied:
+            logger.info("Fuzzy TM hit (similarity %.3f)", match.similarity)
+            dutch_text = match.dutch
+        else:
+            dutch_text = await translate_to_dutch(req.text, req.backend, glossary)
+            if match is None or match.source != req.text:
+                await _fuzzy_remember(embeddings, [req.text], [dutch_text], tag)
     logger.info("Translation completed (output len=%d)", len(dutch_text))
 
-    confidence = await evaluate_translation(req.text, dutch_text, GLOSSARY)
-    return TranslationResponse(dutch=dutch_text, confidence=confidence)
+    terminology = _terminology_report(req.text, dutch_text, glossary, segments)
+    score = _scoring_job(req.text, dutch_text, segments, glossary, mode, key, terminology)
+
+    if deferred:
+        try:
+            job = _scoring_queue.submit(score, callback_url=req.callback_url)
+        except QueueFull as exc:
+            raise _scoring_queue_full() from exc
+        return TranslationResponse(
+            dutch=dutch_text,
+            confidence_job_id=job.id,
+            glossary_version=glossary.fingerprint,
+            terminology=terminology,
+            tm_match=_tm_match(match, applied),
+        )
+
+    return TranslationResponse(
+        dutch=dutch_text,
+        confidence=await score(),
+        glossary_version=glossary.fingerprint,
+        terminology=terminology,
+        tm_match=_tm_match(match, applied),
+    )
+
+
+def _ndjson(event: str, **data) -> str:
+    return json.dumps({"event": event, **data}, ensure_ascii=False) + "\n"
+
+
+async def _translation_events(
+    req: TranslationRequest,
+    glossary: CompiledGlossary,
+    mode: str,
+    key: Optional[str],
+    deferred: bool,
+) -> AsyncIterator[str]:
+    """NDJSON events for /translate/stream (see the route for the format)."""
+    if key is not None:
+        hit = await _translation_memory.get(key)
+        if hit is not None:
+            logger.info("Translation memory hit")
+            yield _ndjson("start", segments=1, cached=True, glossary_version=glossary.fingerprint)
+            yield _ndjson("segment", index=0, dutch=hit["dutch"])
+            yield _ndjson(
+                "confidence",
+                confidence=hit["confidence"],
+                confidence_job_id=None,
+                terminology=hit.get("terminology"),
+            )
+            return
+
+    long_input = len(req.text) > SEGMENT_THRESHOLD_CHARS
+    if long_input:
+        with telemetry.stage("segmentation"):
+            pieces = segment_document(req.text, max_chars=SEGMENT_MAX_CHARS)
+    else:
+        pieces = [Piece(req.text, True)]  # same single call as /translate
+    sources = [p.text for p in pieces if p.translatable]
+    yield _ndjson("start", segments=len(sources), cached=False, glossary_version=glossary.fingerprint)
+
+    # Markup/whitespace between segments goes out as soon as everything before it has.
+    remaining = iter(pieces)
+    chunks: List[str] = []
+    translated: List[str] = []
+
+    def literals() -> List[str]:
+        out = []
+        for piece in remaining:
+            if piece.translatable:
+                break
+            out.append(piece.text)
+        return out
+
+    for text in literals():
+        chunks.append(text)
+        yield _ndjson("literal", text=text)
+    try:
+        async for i, dutch in iter_translate_batch_to_dutch(
+            sources, concurrency=SEGMENT_FANOUT, backend=req.backend, glossary=glossary
+        ):
+            if isinstance(dutch, HTTPException):
+                logger.error("Streaming translation failed at segment %d: %s", i, dutch.detail)
+                yield _ndjson("error", status_code=dutch.status_code, detail=dutch.detail)
+                return
+            chunks.append(dutch)
+            translated.append(dutch)
+            yield _ndjson("segment", index=i, dutch=dutch)
+            for text in literals():
+                chunks.append(text)
+                yield _ndjson("literal", text=text)
+    except HTTPException as exc:
+        logger.error("Streaming translation failed: %s", exc.detail)
+        yield _ndjson("error", status_code=exc.status_code, detail=exc.detail)
+        return
+
+    dutch_text = "".join(chunks)
+    logger.info("Streamed translation completed (%d segment(s))", len(sources))
+    segments = list(zip(sources, translated)) if long_input else None
+    terminology = _terminology_report(req.text, dutch_text, glossary, segments)
+    score = _scoring_job(req.text, dutch_text, segments, glossary, mode, key, terminology)
+
+    if deferred:
+        try:
+            job = _scoring_queue.submit(score, callback_url=req.callback_url)
+        except QueueFull:
+            yield _ndjson("error", status_code=503, detail="Confidence scoring queue is full")
+            return
+        yield _ndjson(
+            "confidence",
+            confidence=None,
+            confidence_job_id=job.id,
+            terminology=terminology.model_dump(),
+        )
+        return
+    yield _ndjson(
+        "confidence",
+        confidence=await score(),
+        confidence_job_id=None,
+        terminology=terminology.model_dump(),
+    )
+
+
+@app.post(
+    "/translate/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def translate_stream(req: TranslationRequest):
+    """Streaming /translate: one JSON object per line, in document order.
+
+    ``start`` (segment count, glossary version, cached), then ``segment``
+    (``index``, ``dutch``) for each translated segment and ``literal``
+    (``text``) for markup kept verbatim – concatenated, these form the Dutch
+    document – and finally ``confidence`` (scores or ``confidence_job_id``,
+    plus the terminology report).  Failures after the first line arrive as an
+    ``error`` event (``status_code``, ``detail``) that ends the stream.
+    """
+    logger.info("/translate/stream called (payload len=%d)", len(req.text))
+    glossary = await _glossaries.get(req.glossary_id)
+    get_backend(req.backend)  # unknown or unconfigured engine: fail before the 200 headers
+    mode = _scoring_mode(req.scoring_mode)
+    deferred = req.async_confidence or bool(req.callback_url)
+    _check_callback(req.callback_url)
+    if deferred and _scoring_queue.full():
+        raise _scoring_queue_full()
+    key = _tm_key(req.text, req.backend, glossary, mode) if TM_ENABLED else None
+    return StreamingResponse(
+        _translation_events(req, glossary, mode, key, deferred),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.get("/confidence/{job_id}", response_model=ConfidenceJobResponse)
+async def confidence_status(job_id: str):
+    job = _scoring_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown confidence job")
+    return ConfidenceJobResponse(**job.as_dict())
+
+
+@app.post("/similarity", response_model=SimilarityResponse)
+async def similarity(req: SimilarityRequest):
+    logger.info("/similarity called (%d pairs)", len(req.pairs))
+    try:
+        scores = await _similarity.score([(p.text_a, p.text_b) for p in req.pairs])
+    except ModelUnavailable as exc:
+        raise HTTPException(status_code=503, detail="Similarity model is unavailable") from exc
+    return SimilarityResponse(model=SIMILARITY_MODEL, scores=scores)
+
+
+@app.post("/roundtrip", response_model=RoundTripResponse)
+async def roundtrip(req: RoundTripRequest):
+    logger.info("/roundtrip called (%d texts)", len(req.texts))
+    glossary = await _glossaries.get(req.glossary_id)
+    sem = asyncio.Semaphore(ROUNDTRIP_CONCURRENCY)
+
+    async def run(i: int, text: str) -> RoundTripItem:
+        async with sem:
+            try:
+                dutch, english, score = await round_trip(text, req.backend, glossary)
+            except HTTPException as exc:
+                return RoundTripItem(index=i, english=text, error=exc.detail)
+        return RoundTripItem(
+            index=i, english=text, dutch=dutch, back_translation=english, similarity=score
+        )
+
+    results = await asyncio.gather(*(run(i, t) for i, t in enumerate(req.texts)))
+    return RoundTripResponse(model=SIMILARITY_MODEL, results=results)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    stats = _translation_memory.stats()
+    if _fuzzy_tm is not None:
+        stats["fuzzy"] = {**_fuzzy_tm.stats(), "threshold": FUZZY_TM_THRESHOLD, "mode": FUZZY_TM_MODE}
+    stats["coalescing"] = {
+        _translation_flight.name: _translation_flight.stats(),
+        _evaluation_flight.name: _evaluation_flight.stats(),
+    }
+    return stats
+
+
+@app.post("/translate/batch", response_model=BatchTranslationResponse)
+async def translate_batch(req: BatchTranslationRequest):
+    logger.info("/translate/batch called (%d texts)", len(req.texts))
+
+    glossary = await _glossaries.get(req.glossary_id)
+    # One batched embedding + index search for all short texts.
+    tag = _fuzzy_tag(req.backend, glossary)
+    short = [i for i, t in enumerate(req.texts) if len(t) <= SEGMENT_THRESHOLD_CHARS]
+    embeddings, found = await _fuzzy_lookup([req.texts[i] for i in short], tag)
+    matches: Dict[int, FuzzyMatch] = {i: m for i, m in zip(short, found) if m is not None}
+    served = {i: m.dutch for i, m in matches.items() if _fuzzy_reusable(m, req.texts[i])}
+
+    todo = [i for i in range(len(req.texts)) if i not in served]
+    translated = await translate_batch_to_dutch(
+        [req.texts[i] for i in todo], backend=req.backend, glossary=glossary
+    )
+    results: List[Union[str, HTTPException]] = [None] * len(req.texts)  # type: ignore[list-item]
+    for i, r in zip(todo, translated):
+        results[i] = r
+    for i, dutch in served.items():
+        results[i] = dutch
+
+    if embeddings is not None:
+        new = [
+            (row, i) for row, i in enumerate(short)
+            if i not in served and isinstance(results[i], str)
+            and (i not in matches or matches[i].source != req.texts[i])
+        ]
+        await _fuzzy_remember(
+            embeddings[[row for row, _ in new]],
+            [req.texts[i] for _, i in new],
+            [results[i] for _, i in new],
+            tag,
+        )
+
+    items = [
+        BatchTranslationItem(index=i, error=r.detail)
+        if isinstance(r, HTTPException)
+        else BatchTranslationItem(index=i, dutch=r, tm_match=_tm_match(matches.get(i), i in served))
+        for i, r in enumerate(results)
+    ]
+    if req.score:
+        done = [item for item in items if item.dutch is not None]
+        pairs = [(req.texts[item.index], item.dutch) for item in done]
+        for item, confidence in zip(done, await evaluate_many(pairs, glossary, req.scoring_mode)):
+            item.confidence = confidence
+    return BatchTranslationResponse(results=items)
+
+
+@app.get("/glossaries")
+async def list_glossaries():
+    return {
+        "available": _glossaries.available(),
+        "glossaries": _glossaries.describe(),
+        "cache": _glossaries.stats(),
+    }
+
+
+@app.post("/glossaries/{glossary_id}/reload")
+async def reload_glossary(glossary_id: str):
+    glossary = await _glossaries.reload(glossary_id)
+    return {"glossary_id": glossary_id, "version": glossary.fingerprint, "terms": len(glossary)}
 
 
 # ─── Dev entry point ────────────────────────────────────────────────────────
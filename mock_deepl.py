@@ -0,0 +1,74 @@
+# mock_deepl.py — local stand-in for DeepL's /v2/translate (benchmarks, load tests)
+
+"""
+Speaks enough of the DeepL API for the translation services: form-encoded
+POST /v2/translate with repeated ``text`` fields, answered with one
+translation per text.  The "translation" echoes the input (optionally with a
+prefix) so HTML and glossary terms survive untouched.  Latency and failures
+are configurable to mimic a real upstream without spending quota:
+
+    MOCK_DEEPL_LATENCY_MS=80 MOCK_DEEPL_ERROR_RATE=0.02 \\
+        uvicorn mock_deepl:app --port 8002
+    DEEPL_API_URL=http://127.0.0.1:8002/v2/translate DEEPL_API_KEY=mock uvicorn main:app
+"""
+
+import os
+import random
+import asyncio
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+MOCK_DEEPL_LATENCY_MS = float(os.getenv("MOCK_DEEPL_LATENCY_MS", "50"))
+MOCK_DEEPL_JITTER_MS = float(os.getenv("MOCK_DEEPL_JITTER_MS", "10"))
+MOCK_DEEPL_PER_CHAR_US = float(os.getenv("MOCK_DEEPL_PER_CHAR_US", "5"))
+MOCK_DEEPL_ERROR_RATE = float(os.getenv("MOCK_DEEPL_ERROR_RATE", "0"))
+MOCK_DEEPL_THROTTLE_RATE = float(os.getenv("MOCK_DEEPL_THROTTLE_RATE", "0"))
+MOCK_DEEPL_PREFIX = os.getenv("MOCK_DEEPL_PREFIX", "")
+
+app = FastAPI(title="Mock DeepL API")
+app.state.calls = 0
+app.state.characters = 0
+
+
+@app.post("/v2/translate")
+async def translate(request: Request):
+    form = parse_qs((await request.body()).decode("utf-8"), keep_blank_values=True)
+    texts = form.get("text", [])
+    source = form.get("source_lang", ["EN"])[0]
+    if not texts:
+        return JSONResponse({"message": "Parameter 'text' not specified."}, status_code=400)
+
+    chars = sum(map(len, texts))
+    app.state.calls += 1
+    app.state.characters += chars
+
+    delay = MOCK_DEEPL_LATENCY_MS + random.uniform(-1, 1) * MOCK_DEEPL_JITTER_MS
+    await asyncio.sleep(max(0.0, delay / 1000 + chars * MOCK_DEEPL_PER_CHAR_US / 1e6))
+
+    roll = random.random()
+    if roll < MOCK_DEEPL_THROTTLE_RATE:
+        return JSONResponse(
+            {"message": "Too many requests"}, status_code=429, headers={"Retry-After": "1"}
+        )
+    if roll < MOCK_DEEPL_THROTTLE_RATE + MOCK_DEEPL_ERROR_RATE:
+        return JSONResponse({"message": "Service unavailable"}, status_code=503)
+
+    return {
+        "translations": [
+            {"detected_source_language": source, "text": MOCK_DEEPL_PREFIX + t}
+            for t in texts
+        ]
+    }
+
+
+@app.get("/v2/usage")
+async def usage():
+    return {"calls": app.state.calls, "character_count": app.state.characters}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("mock_deepl:app", host="127.0.0.1", port=8002)
@@ -0,0 +1,110 @@
+# mock_openai.py — local stand-in for the OpenAI chat completions API (load tests)
+
+"""
+Answers POST /v1/chat/completions the way the confidence evaluator expects:
+a single scoring prompt gets one JSON object with every criterion and
+``overall``; a batched prompt (a JSON list of items with ids) gets
+``{"results": [...]}`` with one row per item.  Scores are random in
+[0.7, 1.0].  Latency and failures are configurable, like mock_deepl.py:
+
+    MOCK_OPENAI_LATENCY_MS=400 MOCK_OPENAI_ERROR_RATE=0.01 \\
+        uvicorn mock_openai:app --port 8003
+    OPENAI_BASE_URL=http://127.0.0.1:8003/v1 OPENAI_API_KEY=mock uvicorn main:app
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+MOCK_OPENAI_LATENCY_MS = float(os.getenv("MOCK_OPENAI_LATENCY_MS", "300"))
+MOCK_OPENAI_JITTER_MS = float(os.getenv("MOCK_OPENAI_JITTER_MS", "50"))
+# Generation dominates real evaluator latency: time per output token.
+MOCK_OPENAI_PER_TOKEN_MS = float(os.getenv("MOCK_OPENAI_PER_TOKEN_MS", "5"))
+MOCK_OPENAI_ERROR_RATE = float(os.getenv("MOCK_OPENAI_ERROR_RATE", "0"))
+MOCK_OPENAI_THROTTLE_RATE = float(os.getenv("MOCK_OPENAI_THROTTLE_RATE", "0"))
+
+FIELDS = ("accuracy", "fluency", "terminology_adherence", "consistency", "glossary_support")
+
+app = FastAPI(title="Mock OpenAI API")
+app.state.calls = 0
+app.state.prompt_tokens = 0
+
+
+def _scores() -> dict:
+    return {f: round(random.uniform(0.7, 1.0), 2) for f in FIELDS}
+
+
+def _answer(messages: list) -> str:
+    """Score JSON for the last user message (single or batched prompt)."""
+    try:
+        payload = json.loads(messages[-1]["content"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        payload = None
+    if isinstance(payload, list):
+        return json.dumps(
+            {"results": [{"id": item.get("id"), **_scores()} for item in payload if isinstance(item, dict)]}
+        )
+    scores = _scores()
+    return json.dumps({**scores, "overall": round(sum(scores.values()) / len(scores), 2)})
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages") or []
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4 + 1
+    app.state.calls += 1
+    app.state.prompt_tokens += prompt_tokens
+
+    content = _answer(messages)
+    completion_tokens = len(content) // 4 + 1
+    delay = MOCK_OPENAI_LATENCY_MS + random.uniform(-1, 1) * MOCK_OPENAI_JITTER_MS
+    await asyncio.sleep(max(0.0, (delay + completion_tokens * MOCK_OPENAI_PER_TOKEN_MS) / 1000))
+
+    roll = random.random()
+    if roll < MOCK_OPENAI_THROTTLE_RATE:
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            status_code=429,
+            headers={"Retry-After": "1"},
+        )
+    if roll < MOCK_OPENAI_THROTTLE_RATE + MOCK_OPENAI_ERROR_RATE:
+        return JSONResponse(
+            {"error": {"message": "The server had an error", "type": "server_error", "code": None}},
+            status_code=500,
+        )
+
+    return {
+        "id": f"chatcmpl-mock-{app.state.calls}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@app.get("/v1/usage")
+async def usage():
+    return {"calls": app.state.calls, "prompt_tokens": app.state.prompt_tokens}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("mock_openai:app", host="127.0.0.1", port=8003)
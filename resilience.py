@@ -0,0 +1,265 @@
+# resilience.py
+# Rate limiting, retry with backoff and circuit breaking for upstream calls
+
+import os
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+import telemetry
+
+logger = logging.getLogger("translation-app.resilience")
+
+T = TypeVar("T")
+
+# Upstream statuses worth retrying (DeepL uses 429 for rate limits, 5xx for outages)
+RETRYABLE_STATUS = frozenset((429, 500, 502, 503, 504, 529))
+
+
+# ─── Errors ─────────────────────────────────────────────────────────────────
+class RetryableError(Exception):
+    """Transient upstream failure; raised by the wrapped call to request a retry."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailable(Exception):
+    """Retries exhausted (or circuit open); carries a Retry-After hint for callers."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """The circuit breaker is open; the call was not attempted."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ─── Building blocks ────────────────────────────────────────────────────────
+class TokenBucket:
+    """Adaptive token bucket: halves its rate on throttling, recovers additively."""
+
+    def __init__(self, rate: float, burst: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.max_rate <= 0:  # rate limiting disabled
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_throttled(self, retry_after: Optional[float]) -> None:
+        if self.max_rate <= 0:
+            return
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def on_success(self) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class CircuitBreaker:
+    """closed → open after N consecutive failures → half-open probe after a cool-down."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def remaining_open(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            if self.remaining_open() > 0:
+                raise CircuitOpenError("Circuit open", retry_after=self.remaining_open())
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                raise CircuitOpenError("Circuit half-open; probe in flight", retry_after=1.0)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("Circuit opened after %d consecutive failure(s)", self._failures)
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class UpstreamGuard:
+    """Rate limit + concurrency cap + retries + circuit breaker for one backend."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 0.0,
+        burst: float = 1.0,
+        max_concurrency: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                telemetry.record_upstream(self.name, "circuit_open")
+                raise
+            await self.bucket.acquire()
+            async with self._sem, telemetry.upstream_in_flight(self.name):
+                try:
+                    result = await fn()
+                except RetryableError as exc:
+                    self.breaker.record_failure()
+                    if exc.status == 429:
+                        self.bucket.on_throttled(exc.retry_after)
+                    if attempt >= self.max_retries or self.breaker.state == "open":
+                        logger.error("%s failed after %d attempt(s): %s", self.name, attempt + 1, exc)
+                        raise UpstreamUnavailable(
+                            str(exc),
+                            status=exc.status,
+                            retry_after=exc.retry_after or self.breaker.remaining_open() or None,
+                        ) from exc
+                    delay = self._backoff(attempt, exc.retry_after)
+                    logger.warning(
+                        "%s transient failure (%s); retry %d/%d in %.2fs",
+                        self.name, exc, attempt + 1, self.max_retries, delay,
+                    )
+                except BaseException:
+                    # Not an upstream fault (bug, cancellation) – don't count it.
+                    self.breaker._probe_in_flight = False
+                    raise
+                else:
+                    self.breaker.record_success()
+                    self.bucket.on_success()
+                    return result
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+# ─── HTTP helper ────────────────────────────────────────────────────────────
+async def guarded_post(
+    guard: UpstreamGuard, client: httpx.AsyncClient, url: str, **kwargs
+) -> httpx.Response:
+    """POST through *guard*; retries network errors and RETRYABLE_STATUS."""
+
+    async def attempt() -> httpx.Response:
+        try:
+            response = await client.post(url, **kwargs)
+        except httpx.HTTPError as exc:
+            telemetry.record_upstream(guard.name, "network_error")
+            raise RetryableError(f"network error: {exc}") from exc
+        telemetry.record_upstream(guard.name, response.status_code)
+        if response.status_code in RETRYABLE_STATUS:
+            raise RetryableError(
+                f"HTTP {response.status_code}",
+                status=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        return response
+
+    return await guard.call(attempt)
+
+
+# ─── Per-backend registry ───────────────────────────────────────────────────
+_DEFAULTS = {
+    # name: (rate/s, burst, max_concurrency)
+    "DEEPL": (20.0, 40.0, 16),
+    "LLM": (10.0, 20.0, 8),
+}
+_guards: Dict[str, UpstreamGuard] = {}
+
+
+def get_guard(name: str) -> UpstreamGuard:
+    """Process-wide guard for *name*, configured from ``<NAME>_*`` env vars."""
+    name = name.upper()
+    if name not in _guards:
+        rate, burst, concurrency = _DEFAULTS.get(name, (0.0, 1.0, 16))
+
+        def env(key: str, default):
+            return type(default)(os.getenv(f"{name}_{key}", default))
+
+        _guards[name] = UpstreamGuard(
+            name,
+            rate=env("RATE_LIMIT", rate),
+            burst=env("BURST", burst),
+            max_concurrency=env("MAX_CONCURRENCY", concurrency),
+            max_retries=env("MAX_RETRIES", 3),
+            backoff_base=env("BACKOFF_BASE", 0.5),
+            backoff_max=env("BACKOFF_MAX", 20.0),
+            breaker_threshold=env("BREAKER_THRESHOLD", 5),
+            breaker_reset=env("BREAKER_RESET", 30.0),
+        )
+    return _guards[name]
@@ -0,0 +1,206 @@
+# scoring_jobs.py
+# Bounded background worker pool for confidence scoring
+
+import time
+import uuid
+import socket
+import asyncio
+import logging
+import ipaddress
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+import http_client
+
+logger = logging.getLogger("translation-app.scoring")
+
+
+class QueueFull(Exception):
+    """Raised when the scoring queue is at capacity."""
+
+
+class InvalidCallback(ValueError):
+    """Raised for a callback URL the server must not call."""
+
+
+def check_callback_url(url: str, allowed_hosts: Collection[str] = ()) -> str:
+    """Validate a client-supplied callback URL; returns its host.
+
+    Only http(s) is accepted.  With *allowed_hosts* the host must be one of
+    them; otherwise loopback, private, link-local and other non-public
+    address literals (and ``localhost``) are rejected.  Host names are
+    resolved and checked before each call, which then connects to the
+    checked address (:func:`resolve_public`).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise InvalidCallback("callback_url must be an http or https URL")
+    host = (parts.hostname or "").rstrip(".").lower()
+    if not host:
+        raise InvalidCallback("callback_url has no host")
+    if allowed_hosts:
+        if host not in allowed_hosts:
+            raise InvalidCallback(f"callback_url host {host!r} is not allowed")
+        return host
+    if host == "localhost" or host.endswith(".localhost"):
+        raise InvalidCallback("callback_url must not point to this server")
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return host
+    if not address.is_global:
+        raise InvalidCallback("callback_url must not point to a private or reserved address")
+    return host
+
+
+async def resolve_public(host: str, port: int) -> str:
+    """An address of *host* to connect to.
+
+    Raises :class:`InvalidCallback` if any address it resolves to is not public.
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addresses = [sockaddr[0].split("%")[0] for *_, sockaddr in infos]
+    for address in addresses:
+        if not ipaddress.ip_address(address).is_global:
+            raise InvalidCallback(f"callback_url host {host!r} resolves to {address}")
+    if not addresses:
+        raise InvalidCallback(f"callback_url host {host!r} does not resolve")
+    return addresses[0]
+
+
+class ScoringJob:
+    """State of one background scoring request."""
+
+    def __init__(self, work: Callable[[], Awaitable[Dict[str, Any]]], callback_url: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.status = "pending"  # pending → running → done | failed
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.callback_url = callback_url
+        self.created = time.time()
+        self._work = work
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "confidence": self.result,
+            "error": self.error,
+        }
+
+
+class ScoringQueue:
+    """Fixed number of workers (= max LLM calls in flight) over a bounded queue."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queued: int = 1_000,
+        max_jobs: int = 10_000,
+        callback_hosts: Collection[str] = (),
+    ):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.callback_hosts = frozenset(h.lower() for h in callback_hosts)
+        self._queue: "asyncio.Queue[ScoringJob]" = asyncio.Queue(maxsize=max_queued)
+        self._jobs: "OrderedDict[str, ScoringJob]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("Started %d scoring workers", self.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(
+        self,
+        work: Callable[[], Awaitable[Dict[str, Any]]],
+        callback_url: Optional[str] = None,
+    ) -> ScoringJob:
+        """Queue *work*; raises :class:`QueueFull` instead of blocking.
+
+        An unacceptable *callback_url* raises :class:`InvalidCallback`.
+        """
+        if callback_url:
+            check_callback_url(callback_url, self.callback_hosts)
+        job = ScoringJob(work, callback_url)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull("Scoring queue is full") from None
+        self._jobs[job.id] = job
+        self._prune()
+        return job
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def get(self, job_id: str) -> Optional[ScoringJob]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "tracked_jobs": len(self._jobs),
+        }
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs once more than max_jobs are tracked."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.status in ("done", "failed")][:excess]:
+            del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                job.result = await job._work()
+                job.status = "done"
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 – reported via the job handle
+                logger.exception("Scoring job %s failed", job.id)
+                job.status = "failed"
+                job.error = str(exc) or exc.__class__.__name__
+            finally:
+                job._work = None  # release captured texts
+                self._queue.task_done()
+            if job.callback_url:
+                await self._notify(job)
+
+    async def _notify(self, job: ScoringJob) -> None:
+        try:
+            host = check_callback_url(job.callback_url, self.callback_hosts)
+            url = httpx.URL(job.callback_url)
+            headers: Dict[str, str] = {}
+            extensions: Dict[str, Any] = {}
+            if not self.callback_hosts:
+                # Connect to the address just checked: resolving the name again
+                # could give another answer (DNS rebinding).
+                address = await resolve_public(host, url.port or (443 if url.scheme == "https" else 80))
+                headers["Host"] = url.netloc.decode("ascii")
+                if url.scheme == "https":
+                    extensions["sni_hostname"] = host  # and certificate check against the name
+                url = url.copy_with(host=address)
+            response = await http_client.get_client().post(
+                url,
+                json=job.as_dict(),
+                headers=headers,
+                extensions=extensions,
+                follow_redirects=False,
+            )
+            if response.status_code >= 400:
+                logger.warning("Callback for job %s returned %s", job.id, response.status_code)
+        except Exception as exc:  # noqa: BLE001 – callbacks are best-effort
+            logger.warning("Callback for job %s failed: %s", job.id, exc)
@@ -0,0 +1,161 @@
+# segmentation.py
+# HTML-safe sentence/paragraph segmentation and in-order reassembly
+
+"""
+A document is cut into *pieces*.  Translatable pieces hold sentences (packed up
+to ``max_chars``) together with any inline markup they contain; literal pieces
+hold everything that must come back verbatim – block-level tags, comments,
+``<script>``/``<style>`` bodies and the whitespace between segments.  Cuts are
+only made outside tags and outside open inline elements, so every translatable
+piece is well-formed for DeepL's ``tag_handling=html``.  Joining the pieces
+(with translated text substituted) restores the original layout.
+"""
+
+import re
+from typing import Callable, List, NamedTuple
+
+_TOKEN_RE = re.compile(r"<!--.*?-->|<[^>]*>", re.S)
+_TAG_NAME_RE = re.compile(r"<\s*(/?)\s*([a-zA-Z][\w:-]*)")
+# Sentence end, then whitespace, then something that can start a sentence.
+_SENTENCE_CUT_RE = re.compile(r"(?<=[.!?…])[\"'”’)\]]*(\s+)(?=[\"'“‘(\[]?[A-Z0-9À-Ý])")
+_PARAGRAPH_CUT_RE = re.compile(r"\s*\n\s*\n\s*")
+
+BLOCK_TAGS = frozenset(
+    """
+    address article aside blockquote body br caption col colgroup dd details
+    dialog div dl dt fieldset figcaption figure footer form h1 h2 h3 h4 h5 h6
+    head header hr html li main meta link nav ol p pre section summary table
+    tbody td tfoot th thead title tr ul
+    """.split()
+)
+RAW_TEXT_TAGS = frozenset(("script", "style"))
+VOID_TAGS = frozenset(("area", "br", "col", "hr", "img", "input", "link", "meta", "wbr"))
+
+
+class Piece(NamedTuple):
+    text: str
+    translatable: bool
+
+
+def _tag_info(tag: str):
+    """Return (name, is_closing, is_self_closing) for a tag token."""
+    m = _TAG_NAME_RE.match(tag)
+    if not m:
+        return None, False, False
+    name = m.group(2).lower()
+    return name, bool(m.group(1)), tag.rstrip().endswith("/>") or name in VOID_TAGS
+
+
+def _split_run(run: List[str], max_chars: int, out: List[Piece]) -> None:
+    """Cut one inline run at sentence/paragraph ends and pack it into pieces."""
+    text = "".join(run)
+    if not text.strip():
+        if text:
+            out.append(Piece(text, False))
+        return
+
+    # Collect cut spans (whitespace between units) outside open inline tags.
+    cuts = []
+    depth = 0
+    offset = 0
+    for token in run:
+        if token.startswith("<"):
+            name, closing, self_closing = _tag_info(token)
+            if name and not self_closing:
+                depth = max(0, depth - 1) if closing else depth + 1
+        elif depth == 0:
+            spans = {m.span() for m in _PARAGRAPH_CUT_RE.finditer(token) if m.group()}
+            spans |= {m.span(1) for m in _SENTENCE_CUT_RE.finditer(token)}
+            cuts.extend((offset + a, offset + b) for a, b in sorted(spans))
+        offset += len(token)
+
+    # Units with the separator that follows each of them.
+    units = []
+    start = 0
+    for a, b in sorted(cuts):
+        if a < start:
+            continue
+        units.append((text[start:a], text[a:b]))
+        start = b
+    units.append((text[start:], ""))
+
+    # Pack consecutive units up to max_chars; separators between packed units stay inside.
+    chunk = ""
+    pending_sep = ""
+    for unit, sep in units:
+        if chunk and len(chunk) + len(pending_sep) + len(unit) > max_chars:
+            _emit(chunk, out)
+            out.append(Piece(pending_sep, False))
+            chunk = unit
+        else:
+            chunk = chunk + pending_sep + unit if chunk else pending_sep + unit
+        pending_sep = sep
+    _emit(chunk, out)
+    if pending_sep:
+        out.append(Piece(pending_sep, False))
+
+
+def _emit(chunk: str, out: List[Piece]) -> None:
+    """Append *chunk* as a translatable piece, keeping its outer whitespace literal."""
+    stripped = chunk.strip()
+    if not stripped:
+        if chunk:
+            out.append(Piece(chunk, False))
+        return
+    lead = chunk[: len(chunk) - len(chunk.lstrip())]
+    trail = chunk[len(chunk.rstrip()):]
+    if lead:
+        out.append(Piece(lead, False))
+    out.append(Piece(stripped, True))
+    if trail:
+        out.append(Piece(trail, False))
+
+
+def segment_document(text: str, max_chars: int = 2_000) -> List[Piece]:
+    """Split *text* into literal and translatable pieces (see module docstring)."""
+    pieces: List[Piece] = []
+    run: List[str] = []
+    raw_until = None  # closing tag name while inside <script>/<style>
+    pos = 0
+    for m in _TOKEN_RE.finditer(text):
+        before, token = text[pos:m.start()], m.group()
+        pos = m.end()
+        if raw_until is not None:
+            pieces.append(Piece(before, False))
+            name, closing, _ = _tag_info(token)
+            pieces.append(Piece(token, False))
+            if closing and name == raw_until:
+                raw_until = None
+            continue
+        if before:
+            run.append(before)
+        name, closing, _ = _tag_info(token)
+        if token.startswith("<!--") or name is None or name in BLOCK_TAGS or name in RAW_TEXT_TAGS:
+            _split_run(run, max_chars, pieces)
+            run = []
+            pieces.append(Piece(token, False))
+            if name in RAW_TEXT_TAGS and not closing:
+                raw_until = name
+        else:
+            run.append(token)
+    tail = text[pos:]
+    if raw_until is not None:
+        pieces.append(Piece(tail, False))
+    else:
+        if tail:
+            run.append(tail)
+        _split_run(run, max_chars, pieces)
+    return [p for p in pieces if p.text]
+
+
+def reassemble(pieces: List[Piece], translate: Callable[[int], str]) -> str:
+    """Join *pieces* in order, replacing the i-th translatable piece with ``translate(i)``."""
+    out = []
+    n = 0
+    for piece in pieces:
+        if piece.translatable:
+            out.append(translate(n))
+            n += 1
+        else:
+            out.append(piece.text)
+    return "".join(out)
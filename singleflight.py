@@ -0,0 +1,66 @@
+# singleflight.py
+# Share one in-flight upstream call between concurrent callers with the same key
+
+"""
+When a campaign goes out, many clients ask for the same translation at the
+same moment.  ``SingleFlight.do(key, fn)`` runs ``fn()`` for the first
+caller only; everyone who arrives with the same key while it is running
+awaits the same task and gets the same result (or exception).  Nothing is
+kept once the call finishes – the translation memory does the caching.
+
+The shared call is shielded: one caller going away (a client disconnect)
+does not cancel it for the others.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+import telemetry
+
+logger = logging.getLogger("translation-app.singleflight")
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key; counts saved calls under the stage *name*."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, "asyncio.Future"] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.characters_saved = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], characters: int = 0) -> T:
+        """Result of ``fn()``, shared with concurrent callers of the same *key*.
+
+        *characters* is what the call bills upstream; it is counted as saved
+        for every caller that joins an existing call.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self.characters_saved += characters
+            telemetry.count_coalesced(self.name, characters)
+            logger.debug("%s: joined in-flight call", self.name)
+        else:
+            self.calls += 1
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._finished(key, t))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: "asyncio.Future") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "characters_saved": self.characters_saved,
+        }
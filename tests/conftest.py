@@ -0,0 +1,16 @@
+# tests/conftest.py
+# Offline defaults for the test suite: no DeepL/OpenAI calls, no model download
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Read by the modules at import time, so set before any test imports them.
+os.environ.setdefault("DEEPL_API_KEY", "test")
+os.environ.setdefault("DEEPL_RATE_LIMIT", "0")
+os.environ.setdefault("SIMILARITY_PRELOAD", "0")
+os.environ.setdefault("TM_ENABLED", "0")
+os.environ.setdefault("HTTP2_ENABLED", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
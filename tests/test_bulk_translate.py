@@ -0,0 +1,90 @@
+"""An interrupted bulk run resumes from its checkpoint without losing or repeating rows."""
+
+import sys
+import json
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+import http_client
+import bulk_translate
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-run (not caught as a row error)."""
+
+
+def _deepl(monkeypatch, crash_on=None):
+    """Mock DeepL that upper-cases its input; returns the texts it was sent."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts = parse_qs(request.content.decode())["text"]
+        if crash_on in texts:
+            raise Crash()
+        sent.extend(texts)
+        return httpx.Response(200, json={"translations": [{"text": t.upper()} for t in texts]})
+
+    monkeypatch.setattr(
+        http_client, "build_client", lambda transport=None: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    http_client.set_client(None)
+    return sent
+
+
+def _run(monkeypatch, tmp_path, *flags):
+    argv = [str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), "--no-score"]
+    monkeypatch.setattr(sys, "argv", ["bulk_translate.py", *argv, "--concurrency", "1", "--checkpoint-every", "3", *flags])
+    bulk_translate.cli()
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    rows = [{"text": f"segment {i}"} for i in range(10)]
+    (tmp_path / "in.jsonl").write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return [r["text"] for r in rows]
+
+
+def _dutch(output):
+    return [json.loads(line)["dutch"] for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def test_resume_continues_after_checkpoint(tmp_path, corpus, monkeypatch):
+    _deepl(monkeypatch, crash_on="segment 7")
+    with pytest.raises(Crash):
+        _run(monkeypatch, tmp_path)
+    output = tmp_path / "out.jsonl"
+    assert bulk_translate.load_checkpoint(str(output) + ".ckpt")[0] == 7
+    with open(output, "ab") as f:
+        f.write(b'{"english": "partial')  # torn write after the checkpoint
+
+    sent = _deepl(monkeypatch)
+    _run(monkeypatch, tmp_path, "--resume")
+
+    assert sent == corpus[7:]
+    assert _dutch(output) == [text.upper() for text in corpus]
+
+
+def test_resume_without_checkpoint_keeps_existing_output(tmp_path, corpus, monkeypatch):
+    sent = _deepl(monkeypatch)
+    output = tmp_path / "out.jsonl"
+    output.write_text("earlier results\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, tmp_path, "--resume")
+
+    assert output.read_text(encoding="utf-8") == "earlier results\n"
+    assert sent == []
+
+
+def test_fresh_run_refuses_existing_output(tmp_path, corpus, monkeypatch):
+    _deepl(monkeypatch)
+    output = tmp_path / "out.jsonl"
+    output.write_text("earlier results\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, tmp_path)
+    _run(monkeypatch, tmp_path, "--overwrite")
+
+    assert _dutch(output) == [text.upper() for text in corpus]
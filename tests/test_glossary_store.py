@@ -0,0 +1,40 @@
+"""Reloading a glossary swaps it only when its content changed."""
+
+import asyncio
+
+from glossary_store import GlossaryStore
+
+
+def _write(path, rows):
+    path.write_text("source,target\n" + "".join(f"{s},{t}\n" for s, t in rows), encoding="utf-8")
+
+
+def test_reload_keeps_unchanged_glossary(tmp_path):
+    _write(tmp_path / "acme.csv", [("placebo", "placebo"), ("study", "onderzoek")])
+    store = GlossaryStore(directory=str(tmp_path), reload_seconds=0)
+
+    async def scenario():
+        first = await store.get("acme")
+        again = await store.reload("acme")
+        (tmp_path / "acme.csv").touch()  # new mtime, same content
+        touched = await store.reload("acme")
+        return first, again, touched
+
+    first, again, touched = asyncio.run(scenario())
+    assert again is first and touched is first
+    assert store.stats()["reloads"] == 0
+
+
+def test_reload_swaps_changed_glossary(tmp_path):
+    _write(tmp_path / "acme.csv", [("study", "onderzoek")])
+    store = GlossaryStore(directory=str(tmp_path), reload_seconds=0)
+
+    async def scenario():
+        first = await store.get("acme")
+        _write(tmp_path / "acme.csv", [("study", "studie")])
+        return first, await store.reload("acme"), await store.get("acme")
+
+    first, reloaded, current = asyncio.run(scenario())
+    assert reloaded.fingerprint != first.fingerprint
+    assert current is reloaded
+    assert store.stats()["reloads"] == 1
@@ -0,0 +1,67 @@
+"""The pooled client keeps connections alive instead of opening one per call."""
+
+import asyncio
+
+import httpx
+
+import http_client
+from benchmarks.bench_connections import CountingServer
+from translation_backends import DeepLBackend
+
+
+async def _count(requests: int, concurrency: int, pooled: bool) -> CountingServer:
+    server = CountingServer()
+    url = await server.start()
+    client = http_client.build_client()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def post() -> None:
+        async with sem:
+            if pooled:
+                await client.post(url, data={"text": "hello"})
+            else:
+                async with httpx.AsyncClient() as fresh:
+                    await fresh.post(url, data={"text": "hello"})
+
+    try:
+        await asyncio.gather(*(post() for _ in range(requests)))
+    finally:
+        await client.aclose()
+        await server.stop()
+    return server
+
+
+def test_pooled_client_reuses_one_connection_sequentially():
+    server = asyncio.run(_count(requests=100, concurrency=1, pooled=True))
+    assert server.requests == 100
+    assert server.connections == 1
+
+
+def test_pooled_client_connections_bounded_by_concurrency():
+    server = asyncio.run(_count(requests=200, concurrency=10, pooled=True))
+    assert server.requests == 200
+    assert server.connections <= 10
+
+
+def test_per_request_client_opens_a_connection_per_call():
+    server = asyncio.run(_count(requests=20, concurrency=1, pooled=False))
+    assert server.connections == 20
+
+
+def test_deepl_backend_uses_the_shared_client():
+    async def run() -> CountingServer:
+        server = CountingServer()
+        backend = DeepLBackend("test", endpoint=await server.start())
+        http_client.set_client(None)
+        try:
+            for _ in range(30):
+                assert await backend.translate(["hello"], "EN", "NL") == ["ok"]
+            assert http_client.get_client() is http_client.get_client()
+        finally:
+            await http_client.close_client()
+            await server.stop()
+        return server
+
+    server = asyncio.run(run())
+    assert server.requests == 30
+    assert server.connections == 1
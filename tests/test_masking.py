@@ -0,0 +1,79 @@
+"""Glossary masking falls back to substitution whenever the placeholders are not returned intact."""
+
+import re
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+import http_client
+import main
+from glossary_matcher import CompiledGlossary, has_placeholders, unmask
+from translation_backends import DeepLBackend
+
+GLOSSARY = CompiledGlossary({"placebo": "placebo", "clinical study": "klinisch onderzoek"})
+
+
+def test_unmask_restores_every_placeholder():
+    masked, targets = GLOSSARY.mask("The clinical study used a placebo.")
+    assert masked == "The <g0/> used a <g1/>."
+    assert unmask("Het <g0/> gebruikte een <g1></g1>.", targets) == "Het klinisch onderzoek gebruikte een placebo."
+
+
+@pytest.mark.parametrize(
+    "returned",
+    [
+        "NL <g0>is hier</g0>.",  # tag pair wrapped around words: </g0> would leak
+        "NL is hier.",  # dropped
+        "NL <g0/> en <g0/>.",  # duplicated
+        "NL <g0/> <g1/>.",  # unknown id
+    ],
+)
+def test_unmask_rejects_mangled_placeholders(returned):
+    assert unmask(returned, ["Placebo"]) is None
+
+
+def test_source_with_placeholder_lookalikes_is_not_masked():
+    assert has_placeholders("see </g2> here")
+    assert not has_placeholders("<b>placebo</b>")
+
+
+def test_fallback_matches_substituted_translation(monkeypatch):
+    """An engine that wraps words in the placeholder tags gets the text again, substituted."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts = parse_qs(request.content.decode())["text"]
+        calls.append(texts)
+        out = [re.sub(r"<g(\d+)/>", r"<g\1>is hier</g\1>", t) for t in texts]  # otherwise echo
+        return httpx.Response(200, json={"translations": [{"text": t} for t in out]})
+
+    monkeypatch.setattr(main, "GLOSSARY_MASKING", True)
+    texts = ["The placebo arm.", "No terms here."]
+
+    async def scenario():
+        http_client.set_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        try:
+            engine = DeepLBackend("test", endpoint="https://deepl.test/v2/translate")
+            sent, targets = main._protect(texts, GLOSSARY, engine)
+            return await main._translate_protected(engine, texts, sent, targets, GLOSSARY)
+        finally:
+            await http_client.close_client()
+
+    restored = asyncio.run(scenario())
+
+    substituted = [main.apply_glossary(main.apply_glossary(t, GLOSSARY), GLOSSARY) for t in texts]
+    assert restored == substituted
+    assert calls == [["The <g0/> arm.", "No terms here."], [main.apply_glossary(texts[0], GLOSSARY)]]
+    assert not any("<g" in r or "</g" in r for r in restored)
+
+
+def test_tm_key_changes_with_glossary_handling(monkeypatch):
+    monkeypatch.setattr(main, "GLOSSARY_MASKING", True)
+    masked = main._tm_key("The placebo arm.", "deepl", GLOSSARY, "llm")
+    monkeypatch.setattr(main, "GLOSSARY_MASKING", False)
+    substituted = main._tm_key("The placebo arm.", "deepl", GLOSSARY, "llm")
+
+    assert masked != substituted
+    assert substituted == main._tm_key("The  placebo arm.", "deepl", GLOSSARY, "llm")  # same text, normalized
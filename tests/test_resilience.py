@@ -0,0 +1,114 @@
+"""The circuit breaker stops calling a failing upstream and probes it after a cool-down."""
+
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryableError,
+    UpstreamGuard,
+    UpstreamUnavailable,
+    guarded_post,
+)
+
+
+def _fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    _fail(breaker, 2)
+    assert breaker.state == "closed"
+    _fail(breaker, 1)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert 0 < info.value.retry_after <= 30.0
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    _fail(breaker, 2)
+    breaker.record_success()
+    _fail(breaker, 2)
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    _fail(breaker, 1)
+    time.sleep(0.02)
+
+    breaker.before_call()  # the probe
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # everyone else waits for it
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.01)
+    _fail(breaker, 5)
+    time.sleep(0.02)
+    _fail(breaker, 1)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_guard_stops_calling_once_open():
+    guard = UpstreamGuard("test", max_retries=10, backoff_base=0.0, breaker_threshold=3, breaker_reset=30.0)
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        raise RetryableError("HTTP 503", status=503)
+
+    async def scenario():
+        with pytest.raises(UpstreamUnavailable) as info:
+            await guard.call(flaky)
+        assert not isinstance(info.value, CircuitOpenError)
+        assert info.value.retry_after  # callers can send Retry-After
+        with pytest.raises(CircuitOpenError):
+            await guard.call(flaky)
+
+    asyncio.run(scenario())
+    assert len(calls) == 3  # gave up when the circuit opened, not after 10 retries
+
+
+def test_non_upstream_errors_do_not_trip_the_breaker():
+    guard = UpstreamGuard("test", breaker_threshold=1)
+
+    async def buggy():
+        raise KeyError("bug")
+
+    with pytest.raises(KeyError):
+        asyncio.run(guard.call(buggy))
+    assert guard.breaker.state == "closed"
+
+
+def test_guarded_post_retries_retryable_status():
+    statuses = iter([503, 429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), headers={"Retry-After": "0"})
+
+    async def scenario():
+        guard = UpstreamGuard("test", backoff_base=0.0, breaker_threshold=5)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            response = await guarded_post(guard, client, "https://upstream.test/")
+        return guard, response
+
+    guard, response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert guard.breaker.state == "closed"
@@ -0,0 +1,111 @@
+"""Callback URLs cannot be used to make the server call internal addresses."""
+
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+import http_client
+from scoring_jobs import InvalidCallback, ScoringQueue, check_callback_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "ftp://example.com/hook",
+        "http:///hook",
+        "http://localhost:8000/hook",
+        "http://api.localhost/hook",
+        "http://127.0.0.1/hook",
+        "http://10.0.0.5/hook",
+        "http://169.254.169.254/latest/meta-data",
+        "http://[::1]/hook",
+        "http://[fd00::1]/hook",
+    ],
+)
+def test_rejects_internal_callback_urls(url):
+    with pytest.raises(InvalidCallback):
+        check_callback_url(url)
+
+
+def test_accepts_public_callback_urls():
+    assert check_callback_url("https://Hooks.Example.com./done") == "hooks.example.com"
+    assert check_callback_url("http://93.184.216.34:8080/done") == "93.184.216.34"
+
+
+def test_allow_list_replaces_address_checks():
+    allowed = {"scoring.internal"}
+    assert check_callback_url("http://scoring.internal/done", allowed) == "scoring.internal"
+    with pytest.raises(InvalidCallback):
+        check_callback_url("https://example.com/done", allowed)
+
+
+def test_submit_rejects_internal_callback():
+    queue = ScoringQueue(workers=1)
+
+    async def work():
+        return {}
+
+    with pytest.raises(InvalidCallback):
+        queue.submit(work, callback_url="http://127.0.0.1:8000/admin")
+    assert queue.stats()["queued"] == 0
+
+
+def _resolve_to(monkeypatch, *answers):
+    """Make getaddrinfo return each of *answers* in turn (a rebinding DNS server)."""
+    calls = []
+
+    async def getaddrinfo(self, host, port, **kwargs):
+        address = answers[min(len(calls), len(answers) - 1)]
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+
+    monkeypatch.setattr(asyncio.base_events.BaseEventLoop, "getaddrinfo", getaddrinfo)
+    return calls
+
+
+async def _notify(url: str):
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(204)
+
+    http_client.set_client(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    try:
+        queue = ScoringQueue(workers=1)
+
+        async def work():
+            return {"score": 1.0}
+
+        job = queue.submit(work, callback_url=url)
+        await queue.start()
+        await queue._queue.join()
+        await asyncio.sleep(0.05)  # the worker posts the callback after task_done()
+        await queue.stop()
+        return job, sent
+    finally:
+        await http_client.close_client()
+
+
+def test_callback_connects_to_the_checked_address(monkeypatch):
+    calls = _resolve_to(monkeypatch, "93.184.216.34", "127.0.0.1")
+    job, sent = asyncio.run(_notify("https://hooks.example.com:8443/done?x=1"))
+
+    assert job.status == "done"
+    assert calls == ["hooks.example.com"]  # resolved once, not again by the client
+    [request] = sent
+    assert request.url.host == "93.184.216.34"
+    assert request.url.port == 8443
+    assert request.url.raw_path == b"/done?x=1"
+    assert request.headers["Host"] == "hooks.example.com:8443"
+    assert request.extensions["sni_hostname"] == "hooks.example.com"
+
+
+def test_callback_not_sent_when_host_resolves_privately(monkeypatch):
+    _resolve_to(monkeypatch, "10.1.2.3")
+    job, sent = asyncio.run(_notify("http://hooks.example.com/done"))
+
+    assert job.status == "done"
+    assert sent == []
@@ -0,0 +1,209 @@
+# translation_backends.py
+# Pluggable machine-translation backends shared by both services
+
+"""
+Backends translate a list of texts between two languages and advertise how
+much they accept per call, so callers can pack batches without knowing which
+engine is behind them.
+
+* ``deepl``  – DeepL REST API (``DEEPL_API_URL`` can point at ``mock_deepl.py``)
+* ``marian`` – local MarianMT (Helsinki-NLP opus-mt) on CPU, needs ``transformers``
+* ``auto``   – DeepL, failing over to MarianMT when DeepL is unavailable
+
+``TRANSLATION_BACKEND`` selects the default; requests may name another one.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+import http_client
+import telemetry
+from resilience import UpstreamGuard, UpstreamUnavailable, get_guard, guarded_post
+
+logger = logging.getLogger("translation-app.backends")
+
+load_dotenv()  # settings below are read at import time
+
+DEEPL_API_URL = os.getenv("DEEPL_API_URL", "https://api.deepl.com/v2/translate")
+# DeepL accepts up to 50 texts and 128 KiB of form data per /v2/translate call.
+DEEPL_MAX_TEXTS_PER_REQUEST = int(os.getenv("DEEPL_MAX_TEXTS_PER_REQUEST", "50"))
+DEEPL_MAX_REQUEST_BYTES = int(os.getenv("DEEPL_MAX_REQUEST_BYTES", str(120 * 1024)))
+
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "deepl").lower()
+MARIAN_MODELS = {
+    ("EN", "NL"): os.getenv("MARIAN_MODEL_EN_NL", "Helsinki-NLP/opus-mt-en-nl"),
+    ("NL", "EN"): os.getenv("MARIAN_MODEL_NL_EN", "Helsinki-NLP/opus-mt-nl-en"),
+}
+MARIAN_BATCH_SIZE = int(os.getenv("MARIAN_BATCH_SIZE", "16"))
+
+
+def upstream_http_error(exc: UpstreamUnavailable) -> HTTPException:
+    """Map an exhausted/short-circuited upstream call to a client-facing error."""
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after else None
+    if exc.status is None and not headers:
+        return HTTPException(
+            status_code=502, detail="Upstream translation service unavailable"
+        )
+    return HTTPException(
+        status_code=503,
+        detail="Translation service temporarily unavailable",
+        headers=headers,
+    )
+
+
+class TranslationBackend:
+    """Interface: translate *texts* in one call, results in input order."""
+
+    name = "base"
+    max_texts_per_request = 1
+    max_request_bytes = 1 << 30
+    keeps_markup = False  # inline tags come back in place (glossary placeholders)
+
+    async def translate(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        raise NotImplementedError
+
+
+class DeepLBackend(TranslationBackend):
+    """DeepL /v2/translate with HTML tag handling."""
+
+    name = "deepl"
+    max_texts_per_request = DEEPL_MAX_TEXTS_PER_REQUEST
+    max_request_bytes = DEEPL_MAX_REQUEST_BYTES
+    keeps_markup = True  # tag_handling=html
+
+    def __init__(self, api_key: str, endpoint: str = DEEPL_API_URL, guard: Optional[UpstreamGuard] = None):
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.guard = guard or get_guard("deepl")
+
+    async def translate(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        headers = {"Authorization": f"DeepL-Auth-Key {self.api_key}"}
+        data = {
+            "text": texts,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "tag_handling": "html",
+            "preserve_formatting": 1,
+        }
+
+        telemetry.count_characters(self.name, texts)
+        try:
+            with telemetry.stage("deepl", texts=len(texts)):
+                response = await guarded_post(
+                    self.guard, http_client.get_client(), self.endpoint, data=data, headers=headers
+                )
+        except UpstreamUnavailable as exc:
+            logger.error("DeepL unavailable: %s", exc)
+            raise upstream_http_error(exc) from exc
+
+        if response.status_code != 200:
+            logger.error("DeepL API error (%s): %s", response.status_code, response.text)
+            raise HTTPException(status_code=500, detail="Translation API error")
+
+        return [t["text"] for t in response.json()["translations"]]
+
+
+class MarianBackend(TranslationBackend):
+    """Local MarianMT models on CPU; loaded lazily, one per language pair."""
+
+    name = "marian"
+    max_texts_per_request = MARIAN_BATCH_SIZE
+
+    def __init__(self, models: Dict[tuple, str] = MARIAN_MODELS):
+        self.models = models
+        self._loaded: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, pair: tuple):
+        with self._lock:
+            if pair not in self._loaded:
+                try:
+                    from transformers import MarianMTModel, MarianTokenizer
+                except ImportError as exc:  # optional dependency
+                    raise HTTPException(
+                        status_code=501,
+                        detail="Local translation engine requires 'transformers'",
+                    ) from exc
+                name = self.models[pair]
+                logger.info("Loading MarianMT model %s …", name)
+                try:
+                    self._loaded[pair] = (
+                        MarianTokenizer.from_pretrained(name),
+                        MarianMTModel.from_pretrained(name).eval(),
+                    )
+                except ImportError as exc:  # tokenizer needs sentencepiece
+                    raise HTTPException(
+                        status_code=501,
+                        detail="Local translation engine requires 'sentencepiece'",
+                    ) from exc
+                except OSError as exc:  # model not cached and hub unreachable
+                    logger.error("Cannot load MarianMT model %s: %s", name, exc)
+                    raise HTTPException(
+                        status_code=503, detail="Local translation model unavailable"
+                    ) from exc
+        return self._loaded[pair]
+
+    def _translate_sync(self, texts: List[str], pair: tuple) -> List[str]:
+        import torch
+
+        tokenizer, model = self._load(pair)
+        batch = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+        with torch.no_grad():
+            generated = model.generate(**batch)
+        return tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+    async def translate(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        pair = (source_lang.upper(), target_lang.upper())
+        if pair not in self.models:
+            raise HTTPException(status_code=400, detail=f"No local model for {pair[0]}→{pair[1]}")
+        telemetry.count_characters(self.name, texts)
+        with telemetry.stage("marian", texts=len(texts)):
+            return await asyncio.to_thread(self._translate_sync, texts, pair)
+
+
+class FailoverBackend(TranslationBackend):
+    """Use *primary*; on an upstream outage (5xx) retry the call on *fallback*."""
+
+    def __init__(self, primary: TranslationBackend, fallback: TranslationBackend):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self.max_texts_per_request = min(primary.max_texts_per_request, fallback.max_texts_per_request)
+        self.max_request_bytes = min(primary.max_request_bytes, fallback.max_request_bytes)
+        self.keeps_markup = primary.keeps_markup and fallback.keeps_markup
+
+    async def translate(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        try:
+            return await self.primary.translate(texts, source_lang, target_lang)
+        except HTTPException as exc:
+            if exc.status_code < 500:
+                raise
+            logger.warning("%s failed (%s); failing over to %s", self.primary.name, exc.detail, self.fallback.name)
+            return await self.fallback.translate(texts, source_lang, target_lang)
+
+
+_backends: Dict[str, TranslationBackend] = {}
+
+
+def get_backend(name: Optional[str] = None) -> TranslationBackend:
+    """Return the (process-wide) backend called *name*, or the default one."""
+    name = (name or TRANSLATION_BACKEND).lower()
+    if name not in _backends:
+        if name == "deepl":
+            api_key = os.getenv("DEEPL_API_KEY") or os.getenv("DeepL_Api_Key")
+            if not api_key:
+                raise HTTPException(status_code=503, detail="DeepL backend is not configured")
+            _backends[name] = DeepLBackend(api_key)
+        elif name == "marian":
+            _backends[name] = MarianBackend()
+        elif name == "auto":
+            _backends[name] = FailoverBackend(get_backend("deepl"), get_backend("marian"))
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown translation backend '{name}'")
+    return _backends[name]
@@ -0,0 +1,153 @@
+# translation_memory.py
+# Exact-match translation memory: in-process LRU/TTL tier + optional SQLite tier
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("translation-app.tm")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys (NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(*parts: str) -> str:
+    """Stable hash of the key components."""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """Persistent key/value store; all calls are run in a worker thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reopen()
+        # A connection must not be used across fork() (preloaded gunicorn workers).
+        os.register_at_fork(after_in_child=self._reopen)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translation_memory ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _reopen(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value, created FROM translation_memory WHERE key = ?", (key,)
+            ).fetchone()
+
+    def put(self, key: str, value: str, created: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translation_memory (key, value, created)"
+                " VALUES (?, ?, ?)",
+                (key, value, created),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM translation_memory WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationMemory:
+    """Two-tier cache of JSON-serialisable values keyed by :func:`make_key`."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 86_400,
+        sqlite_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._disk = _SQLiteTier(sqlite_path) if sqlite_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created > self.ttl_seconds
+
+    def _remember(self, key: str, created: float, value: Dict[str, Any]) -> None:
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for *key*, or ``None`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            created, value = entry
+            if not self._expired(created):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+
+        if self._disk is not None:
+            row = await asyncio.to_thread(self._disk.get, key)
+            if row is not None:
+                raw, created = row
+                if not self._expired(created):
+                    value = json.loads(raw)
+                    self._remember(key, created, value)
+                    self.disk_hits += 1
+                    return value
+                await asyncio.to_thread(self._disk.delete, key)
+                self.expirations += 1
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store *value* in both tiers."""
+        created = time.time()
+        self._remember(key, created, value)
+        if self._disk is not None:
+            raw = json.dumps(value, ensure_ascii=False)
+            await asyncio.to_thread(self._disk.put, key, raw, created)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "sqlite": self._disk is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            logger.info("Closed translation-memory SQLite tier")